@@ -3,39 +3,111 @@
 __version__ = "0.1.4"
 
 __all__ = [
+    "BatchPool",
+    "HybrdResult",
+    "HybrjResult",
+    "LmderResult",
+    "LmdifResult",
+    "LmstrResult",
+    "LmstrStreamResult",
+    "MultistartResult",
+    "Profile",
+    "Workspace",
     "chkder",
+    "covar",
+    "covar1",
+    "dogleg",
     "dpmpar",
     "enorm",
+    "ext2in",
+    "fdjac1",
+    "fdjac2",
     "hybrd",
     "hybrd",
     "hybrd1",
+    "hybrd_batch",
     "hybrj",
     "hybrj",
     "hybrj1",
+    "hybrj_batch",
+    "in2ext",
+    "in2ext_grad",
     "lmder",
     "lmder",
     "lmder1",
+    "lmder_bounded",
+    "lmder_multistart",
     "lmdif",
     "lmdif1",
+    "lmdif_batch",
+    "lmdif_bounded",
+    "lmpar",
     "lmstr",
     "lmstr",
     "lmstr1",
+    "precompile",
+    "profile",
+    "qform",
+    "qrfac",
+    "qrsolv",
+    "r1mpyq",
+    "r1updt",
+    "random_starts",
+    "rwupdt",
     "sdpmpar",
+    "use_blas",
+    "workspace",
 ]
 
 from cminpack_numba.src import (
+    BatchPool,
+    HybrdResult,
+    HybrjResult,
+    LmderResult,
+    LmdifResult,
+    LmstrResult,
+    LmstrStreamResult,
+    MultistartResult,
+    Profile,
+    Workspace,
     chkder,
+    covar,
+    covar1,
+    dogleg,
     dpmpar,
     enorm,
+    ext2in,
+    fdjac1,
+    fdjac2,
     hybrd,
     hybrd1,
+    hybrd_batch,
     hybrj,
     hybrj1,
+    hybrj_batch,
+    in2ext,
+    in2ext_grad,
     lmder,
     lmder1,
+    lmder_bounded,
+    lmder_multistart,
     lmdif,
     lmdif1,
+    lmdif_batch,
+    lmdif_bounded,
+    lmpar,
     lmstr,
     lmstr1,
+    precompile,
+    profile,
+    qform,
+    qrfac,
+    qrsolv,
+    r1mpyq,
+    r1updt,
+    random_starts,
+    rwupdt,
     sdpmpar,
+    use_blas,
+    workspace,
 )
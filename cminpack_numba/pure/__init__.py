@@ -0,0 +1,50 @@
+"""Numba implementation of the MINPACK solvers taking njit functions.
+
+The solvers mirror [lmdif][cminpack_numba.lmdif], [lmder][cminpack_numba.lmder],
+[hybrd][cminpack_numba.hybrd] and [hybrj][cminpack_numba.hybrj], but take an njit
+function instead of the address of a cfunc. The function is compiled together with
+the solver, so that cheap residuals are inlined instead of being called through a
+function pointer.
+
+For expensive functions, `parallel=True` makes [lmdif][cminpack_numba.pure.lmdif] and
+[hybrd][cminpack_numba.pure.hybrd] evaluate the columns of the forward-difference
+jacobian in parallel, and a sparsity pattern makes [lmdif][cminpack_numba.pure.lmdif]
+perturb the columns sharing no row together, with one evaluation per group of columns.
+`fdjac2_parallel` and `fdjac2_sparse` can also compute the jacobian of an njit
+function passed to [lmder][cminpack_numba.lmder].
+
+[lmstr_stream][cminpack_numba.pure.lmstr_stream] fits data sets too large for memory,
+reading the observations chunk by chunk from a `numpy.memmap` or a generator.
+"""
+
+__all__ = [
+    "bandwidth",
+    "color_columns",
+    "enorm",
+    "fdjac1",
+    "fdjac1_parallel",
+    "fdjac2",
+    "fdjac2_parallel",
+    "fdjac2_sparse",
+    "hybrd",
+    "hybrj",
+    "lmder",
+    "lmdif",
+    "lmstr_stream",
+]
+
+from cminpack_numba.src.pure import (
+    bandwidth,
+    color_columns,
+    enorm,
+    fdjac1,
+    fdjac1_parallel,
+    fdjac2,
+    fdjac2_parallel,
+    fdjac2_sparse,
+    hybrd,
+    hybrj,
+    lmder,
+    lmdif,
+    lmstr_stream,
+)
@@ -1,39 +1,125 @@
 """A numba wrapper for the cminpack library."""
-# TODO(nin17): import functions for implementing bounds
 
 from ._chkder import chkder
+from ._covar import covar, covar1, covar1_, covar_
 from ._dpmpar import dpmpar, sdpmpar
 from ._enorm import enorm, enorm_
-from ._hybrd import hybrd, hybrd1, hybrd1_, hybrd_
-from ._hybrj import hybrj, hybrj1, hybrj1_, hybrj_
-from ._lmder import lmder, lmder1, lmder1_, lmder_
-from ._lmdif import lmdif, lmdif1, lmdif1_, lmdif_
+from ._hybrd import hybrd, hybrd1, hybrd1_, hybrd_, hybrd_batch
+from ._hybrj import hybrj, hybrj1, hybrj1_, hybrj_, hybrj_batch
+from ._internals import (
+    dogleg,
+    dogleg_,
+    fdjac1,
+    fdjac1_,
+    fdjac2,
+    fdjac2_,
+    lmpar,
+    lmpar_,
+    qform,
+    qform_,
+    qrfac,
+    qrfac_,
+    qrsolv,
+    qrsolv_,
+    r1mpyq,
+    r1mpyq_,
+    r1updt,
+    r1updt_,
+    rwupdt,
+    rwupdt_,
+)
+from ._lmder import lmder, lmder1, lmder1_, lmder_, lmder_bounded
+from ._lmdif import lmdif, lmdif1, lmdif1_, lmdif_, lmdif_batch, lmdif_bounded
 from ._lmstr import lmstr, lmstr1, lmstr1_, lmstr_
+from ._multistart import lmder_multistart, random_starts
+from ._pool import BatchPool
+from ._precompile import precompile
+from ._profile import Profile, profile
+from ._result import (
+    HybrdResult,
+    HybrjResult,
+    LmderResult,
+    LmdifResult,
+    LmstrResult,
+    LmstrStreamResult,
+    MultistartResult,
+)
+from ._workspace import Workspace, workspace
+from .bounds import ext2in, in2ext, in2ext_grad
+from .cminpack_ import use_blas
 
 __all__ = [
+    "BatchPool",
+    "HybrdResult",
+    "HybrjResult",
+    "LmderResult",
+    "LmdifResult",
+    "LmstrResult",
+    "LmstrStreamResult",
+    "MultistartResult",
+    "Profile",
+    "Workspace",
     "chkder",
+    "covar",
+    "covar1",
+    "covar1_",
+    "covar_",
+    "dogleg",
+    "dogleg_",
     "dpmpar",
     "enorm",
     "enorm_",
+    "ext2in",
+    "fdjac1",
+    "fdjac1_",
+    "fdjac2",
+    "fdjac2_",
     "hybrd",
     "hybrd1",
     "hybrd1_",
     "hybrd_",
+    "hybrd_batch",
     "hybrj",
     "hybrj1",
     "hybrj1_",
     "hybrj_",
+    "hybrj_batch",
+    "in2ext",
+    "in2ext_grad",
     "lmder",
     "lmder1",
     "lmder1_",
     "lmder_",
+    "lmder_bounded",
+    "lmder_multistart",
     "lmdif",
     "lmdif1",
     "lmdif1_",
     "lmdif_",
+    "lmdif_batch",
+    "lmdif_bounded",
+    "lmpar",
+    "lmpar_",
     "lmstr",
     "lmstr1",
     "lmstr1_",
     "lmstr_",
+    "precompile",
+    "profile",
+    "qform",
+    "qform_",
+    "qrfac",
+    "qrfac_",
+    "qrsolv",
+    "qrsolv_",
+    "r1mpyq",
+    "r1mpyq_",
+    "r1updt",
+    "r1updt_",
+    "random_starts",
+    "rwupdt",
+    "rwupdt_",
     "sdpmpar",
+    "use_blas",
+    "workspace",
 ]
@@ -0,0 +1,252 @@
+"""On-disk caching of the compiled functions of cminpack_numba.
+
+Numba only invalidates a cached function when its own source file changes. The
+functions of this package are also specialised by the overloads in the other modules
+and call into the cminpack shared libraries, so the locators defined here stamp the
+cache index with the contents of every source file of the package and of the loaded
+cminpack libraries. Any change to either invalidates the cache.
+
+The locators are only used by the functions decorated with the `njit` of this module,
+which gives their dispatchers a cache of their own: the caching of other numba
+functions is unchanged. It also keys the njit functions passed as `fcn` on their code
+rather than on their dispatcher, which differs in every process, so that the solvers
+compiled for them are found in the cache by later runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from copy import copy
+from functools import lru_cache
+from pathlib import Path
+from types import CodeType
+
+import numba
+from numba import types
+from numba.core import caching
+from numba.core.dispatcher import Dispatcher
+from numba.core.serialize import dumps
+
+_PACKAGE_DIR = Path(__file__).parent.parent.resolve()
+
+
+def _caching_class(name: str) -> type:
+    # the classes lost their leading underscore in numba 0.61
+    return getattr(caching, name, None) or getattr(caching, f"_{name}")
+
+
+@lru_cache(maxsize=None)
+def _hash_file(path: str, st_mtime: float, st_size: int) -> bytes:
+    # st_mtime and st_size are part of the key so that modified files are rehashed
+    with Path(path).open("rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def _stamp(paths: list[str]) -> tuple[tuple[str, bytes], ...]:
+    stamp = []
+    for path in paths:
+        st = os.stat(path)
+        stamp.append((Path(path).name, _hash_file(path, st.st_mtime, st.st_size)))
+    return tuple(stamp)
+
+
+@lru_cache(maxsize=None)
+def _package_stamp() -> tuple[tuple[str, bytes], ...]:
+    """Stamp of the python source files of the package, computed once per process."""
+    return _stamp(sorted(str(i) for i in _PACKAGE_DIR.rglob("*.py")))
+
+
+def _library_stamp() -> tuple[tuple[str, bytes], ...]:
+    """Stamp of the cminpack libraries, loading them if they are not loaded yet."""
+    from .cminpack_ import _has_cminpack, _load_cminpack
+
+    return _stamp([_load_cminpack(i) for i in ("", "s") if _has_cminpack(i)])
+
+
+class _LazyStamp:
+    """Source stamp evaluated when the cache index is read or written.
+
+    Numba gets the source stamp when a function is decorated, i.e. at import, but
+    stamping the libraries requires finding and loading them. This is deferred until
+    the cache is first used, which also ensures the libraries are loaded before any
+    cached code calling them is linked.
+    """
+
+    def __init__(self, source_stamp: object) -> None:
+        self._source_stamp = source_stamp
+
+    @property
+    def value(self) -> tuple:
+        return self._source_stamp, _package_stamp(), _library_stamp()
+
+    def __eq__(self, other: object) -> bool:
+        return self.value == other
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __reduce__(self) -> tuple:
+        return tuple, (self.value,)
+
+
+class _CminpackLocatorMixin:
+    """Locator for the functions defined in the cminpack_numba package."""
+
+    def get_source_stamp(self) -> _LazyStamp:
+        return _LazyStamp(super().get_source_stamp())
+
+
+class _UserProvidedCacheLocator(
+    _CminpackLocatorMixin,
+    _caching_class("UserProvidedCacheLocator"),
+):
+    pass
+
+
+class _InTreeCacheLocator(_CminpackLocatorMixin, _caching_class("InTreeCacheLocator")):
+    pass
+
+
+class _UserWideCacheLocator(
+    _CminpackLocatorMixin,
+    _caching_class("UserWideCacheLocator"),
+):
+    pass
+
+
+class _CacheImpl(_caching_class("CompileResultCacheImpl")):
+    """Cache implementation locating the cache with the locators of the package."""
+
+    _locator_classes = [
+        _UserProvidedCacheLocator,
+        _InTreeCacheLocator,
+        _UserWideCacheLocator,
+        *_caching_class("CompileResultCacheImpl")._locator_classes,
+    ]
+
+
+def _code_key(code: CodeType) -> bytes:
+    """Bytecode, names and constants of `code` and of the code objects nested in it."""
+    parts = [code.co_code, repr(code.co_names).encode()]
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            parts.append(_code_key(const))
+        else:
+            parts.append(repr(const).encode())
+    return b"\0".join(parts)
+
+
+def _global_names(code: CodeType) -> set[str]:
+    """Names of the globals used by `code` and by the code objects nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _global_names(const)
+    return names
+
+
+def _dispatcher_key(dispatcher: Dispatcher, seen: set | None = None) -> tuple | None:
+    """Key of an njit function in the cache index, the same in every process.
+
+    It covers the code, closure and source file of the function, the njit functions it
+    calls and the constants it reads from its globals. None if the function, or one it
+    calls, has no source file, whose changes could then not be detected.
+    """
+    seen = set() if seen is None else seen
+    seen.add(id(dispatcher))
+    py_func = dispatcher.py_func
+    source = Path(py_func.__code__.co_filename)
+    if not source.is_file():
+        return None
+    st = source.stat()
+    cvars = tuple(i.cell_contents for i in py_func.__closure__ or ())
+    referenced = []
+    for name in sorted(_global_names(py_func.__code__)):
+        value = py_func.__globals__.get(name)
+        if isinstance(value, Dispatcher):
+            if id(value) in seen:
+                continue
+            key = _dispatcher_key(value, seen)
+            if key is None:
+                return None
+            referenced.append((name, key))
+        elif isinstance(value, (bool, int, float, complex, str, bytes)):
+            referenced.append((name, repr(value)))
+    return (
+        py_func.__module__,
+        py_func.__qualname__,
+        hashlib.sha256(_code_key(py_func.__code__)).hexdigest(),
+        hashlib.sha256(dumps(cvars)).hexdigest(),
+        (st.st_mtime, st.st_size),
+        tuple(referenced),
+    )
+
+
+def _dispatcher_keys(sig: object) -> tuple | None:
+    """`sig` with its njit functions replaced by their keys, None if one has none."""
+    keys = []
+    for i in sig:
+        key = _dispatcher_key(i.dispatcher) if isinstance(i, types.Dispatcher) else i
+        if key is None:
+            return None
+        keys.append(key)
+    return tuple(keys)
+
+
+def _has_dispatcher(sig: object) -> bool:
+    return isinstance(sig, tuple) and any(isinstance(i, types.Dispatcher) for i in sig)
+
+
+class _FunctionCache(caching.FunctionCache):
+    """Cache of a function of the package.
+
+    The specialisations for njit functions whose changes cannot be detected, e.g.
+    defined with `python -c` or in a notebook, are not cached.
+    """
+
+    _impl_class = _CacheImpl
+
+    def _index_key(self, sig: tuple, codegen: object) -> tuple:
+        if _has_dispatcher(sig):
+            sig = _dispatcher_keys(sig)
+        return super()._index_key(sig, codegen)
+
+    def load_overload(self, sig: tuple, target_context: object) -> object:
+        if _has_dispatcher(sig) and _dispatcher_keys(sig) is None:
+            return None
+        cres = super().load_overload(sig, target_context)
+        if cres is not None and _has_dispatcher(sig):
+            # type the njit functions by their dispatchers in this process
+            fndesc = copy(cres.fndesc)
+            fndesc.argtypes = sig
+            signature = cres.signature.replace(args=sig)
+            cres = cres._replace(signature=signature, fndesc=fndesc)
+        return cres
+
+    def save_overload(self, sig: tuple, data: object) -> None:
+        if _has_dispatcher(sig) and _dispatcher_keys(sig) is None:
+            return
+        super().save_overload(sig, data)
+
+
+def njit(*args: object, cache: bool = False, **kwargs: object) -> callable:
+    """Same as `numba.njit`, caching with the locators of the package if cache=True.
+
+    Returns
+    -------
+    callable
+        The decorator, or the dispatcher if called on a function
+
+    """
+    decorator = numba.njit(*args, **kwargs)
+    if not cache:
+        return decorator
+
+    def wrapper(func: callable) -> Dispatcher:
+        dispatcher = decorator(func)
+        if isinstance(dispatcher, Dispatcher):  # not with NUMBA_DISABLE_JIT
+            dispatcher._cache = _FunctionCache(dispatcher.py_func)  # noqa: SLF001
+        return dispatcher
+
+    return wrapper
@@ -1,7 +1,8 @@
 """Numba overload for chkder function."""
 
-from numba import extending, njit
+from numba import extending
 
+from ._caching import njit
 from .cminpack_ import Cminpack
 from .utils import _check_dtype
 
@@ -32,6 +33,6 @@ def _chkder_overload(m, n, x, fvec, fjac, ldfjac, xp, fvecp, mode, err):
     return impl
 
 
-@njit
+@njit(cache=True)
 def chkder(m, n, x, fvec, fjac, ldfjac, xp, fvecp, mode, err):
     return _chkder(m, n, x, fvec, fjac, ldfjac, xp, fvecp, mode, err)
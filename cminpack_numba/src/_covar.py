@@ -0,0 +1,254 @@
+"""Wrappers of the `covar` and `covar1` functions."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from numba import extending, types
+from numpy import empty, int32
+
+from ._caching import njit
+from ._enorm import _enorm
+from .cminpack_ import Cminpack
+from .utils import _check_dtype
+
+if TYPE_CHECKING:
+    from numpy import floating
+    from numpy.typing import NDArray
+
+# --------------------------------------- covar -------------------------------------- #
+
+
+def _covar(n, r, ldr, ipvt, tol, wa):
+    raise NotImplementedError
+
+
+@extending.overload(_covar)
+def _covar_overload(n, r, ldr, ipvt, tol, wa):
+    _check_dtype((wa,), r.dtype)
+    covar_external = Cminpack.covar(r.dtype)
+
+    def impl(n, r, ldr, ipvt, tol, wa):
+        covar_external(n, r.ctypes, ldr, ipvt.ctypes, tol, wa.ctypes)
+        return r
+
+    return impl
+
+
+@njit(cache=True)
+def covar_(
+    n: int32,
+    r: NDArray[floating],
+    ldr: int32,
+    ipvt: NDArray[int32],
+    tol: floating,
+    wa: NDArray[floating],
+) -> NDArray[floating]:
+    """Covariance matrix from the QR factorization returned by lmdif, lmder or lmstr.
+
+    Overwrites the upper triangle of `r`, stored column-major with leading dimension
+    ldr, by the n by n matrix inverse(transpose(J) * J), where J is the jacobian at
+    the solution.
+
+    Parameters
+    ----------
+    n : int32
+        order of r
+    r : NDArray[floating]
+        ldr * n array holding the upper triangular matrix R in its first n rows
+    ldr : int32
+        leading dimension of r
+    ipvt : NDArray[int32]
+        permutation matrix of the QR factorization
+    tol : floating
+        columns with |R[k, k]| <= tol * |R[0, 0]| are treated as linearly dependent
+        and their rows and columns of the covariance matrix are set to zero
+    wa : NDArray[floating]
+        work array of length n
+
+    Returns
+    -------
+    NDArray[floating]
+        r
+
+    """
+    return _covar(n, r, ldr, ipvt, tol, wa)
+
+
+# -------------------------------------- covar1 -------------------------------------- #
+
+
+def _covar1(m, n, fsumsq, r, ldr, ipvt, tol, wa):
+    raise NotImplementedError
+
+
+@extending.overload(_covar1)
+def _covar1_overload(m, n, fsumsq, r, ldr, ipvt, tol, wa):
+    _check_dtype((wa,), r.dtype)
+    covar1_external = Cminpack.covar1(r.dtype)
+
+    def impl(m, n, fsumsq, r, ldr, ipvt, tol, wa):
+        info = covar1_external(m, n, fsumsq, r.ctypes, ldr, ipvt.ctypes, tol, wa.ctypes)
+        return r, info
+
+    return impl
+
+
+@njit(cache=True)
+def covar1_(
+    m: int32,
+    n: int32,
+    fsumsq: floating,
+    r: NDArray[floating],
+    ldr: int32,
+    ipvt: NDArray[int32],
+    tol: floating,
+    wa: NDArray[floating],
+) -> tuple[NDArray[floating], int32]:
+    """`covar_` scaled by the residual variance fsumsq / (m - rank).
+
+    Parameters
+    ----------
+    m : int32
+        number of residuals
+    n : int32
+        number of variables
+    fsumsq : floating
+        sum of the squared residuals at the solution
+    r : NDArray[floating]
+        see `covar_`
+    ldr : int32
+        leading dimension of r
+    ipvt : NDArray[int32]
+        permutation matrix of the QR factorization
+    tol : floating
+        see `covar_`
+    wa : NDArray[floating]
+        work array of length n
+
+    Returns
+    -------
+    tuple[NDArray[floating], int32]
+        r and info: 0 if the jacobian has full rank, otherwise its rank
+
+    """
+    return _covar1(m, n, fsumsq, r, ldr, ipvt, tol, wa)
+
+
+# ------------------------------------ high level ------------------------------------ #
+
+
+def _covar_r(fjac, n, out):
+    raise NotImplementedError
+
+
+@extending.overload(_covar_r)
+def _covar_r_overload(fjac, n, out):
+    """Copy of R, the first n rows of the column-major fjac, as an n by n array."""
+    if isinstance(out, types.Array):
+        _check_dtype((out,), fjac.dtype)
+
+    def impl(fjac, n, out):
+        _r = fjac.reshape(fjac.shape[::-1])
+        r = empty((n, n), dtype=fjac.dtype) if out is None else out
+        for j in range(n):
+            for i in range(n):
+                r[j, i] = _r[j, i]
+        return r
+
+    return impl
+
+
+@njit(cache=True)
+def covar(
+    fjac: NDArray[floating],
+    ipvt: NDArray[int32],
+    tol: floating | None = None,
+    out: NDArray[floating] | None = None,
+) -> NDArray[floating]:
+    """Covariance matrix inverse(transpose(J) * J) from the fjac and ipvt of a fit.
+
+    As for `scipy.optimize.leastsq`, the matrix is not scaled by the residual
+    variance: see `covar1`.
+
+    Parameters
+    ----------
+    fjac : NDArray[floating]
+        fjac returned by lmdif, lmder or lmstr
+    ipvt : NDArray[int32]
+        ipvt returned by lmdif, lmder or lmstr
+    tol : floating | None, optional
+        columns with |R[k, k]| <= tol * |R[0, 0]| are treated as linearly dependent
+        and their rows and columns are set to zero, by default 1.49012e-8
+    out : NDArray[floating] | None, optional
+        n by n array for the result, by default None
+
+    Returns
+    -------
+    NDArray[floating]
+        n by n covariance matrix
+
+    """
+    n = int32(ipvt.size)
+    r = _covar_r(fjac, n, out)
+    tol = tol or 1.49012e-8
+    wa = empty(n, dtype=fjac.dtype)
+    return _covar(n, r, n, ipvt, tol, wa)
+
+
+@njit(cache=True)
+def covar1(
+    fvec: NDArray[floating],
+    fjac: NDArray[floating],
+    ipvt: NDArray[int32],
+    tol: floating | None = None,
+    out: NDArray[floating] | None = None,
+) -> tuple[NDArray[floating], int32]:
+    """`covar` scaled by the residual variance sum(fvec ** 2) / (m - rank).
+
+    Parameters
+    ----------
+    fvec : NDArray[floating]
+        fvec returned by lmdif, lmder or lmstr
+    fjac : NDArray[floating]
+        fjac returned by lmdif, lmder or lmstr
+    ipvt : NDArray[int32]
+        ipvt returned by lmdif, lmder or lmstr
+    tol : floating | None, optional
+        see `covar`, by default 1.49012e-8
+    out : NDArray[floating] | None, optional
+        n by n array for the result, by default None
+
+    Returns
+    -------
+    tuple[NDArray[floating], int32]
+        n by n covariance matrix and info: 0 if the jacobian has full rank,
+        otherwise its rank
+
+    """
+    m = int32(fvec.size)
+    n = int32(ipvt.size)
+    r = _covar_r(fjac, n, out)
+    tol = tol or 1.49012e-8
+    fsumsq = _enorm(m, fvec) ** 2
+    wa = empty(n, dtype=fjac.dtype)
+    return _covar1(m, n, fsumsq, r, n, ipvt, tol, wa)
+
+
+def _covariance(fvec, fjac, ipvt, out):
+    raise NotImplementedError
+
+
+@extending.overload(_covariance)
+def _covariance_overload(fvec, fjac, ipvt, out):
+    """Fill `out` with the output of `covar1`, if it is not None.
+
+    Used by the `covariance` argument of the lmdif, lmder and lmstr wrappers.
+    """
+    if isinstance(out, (types.NoneType, types.Omitted)):
+        return lambda fvec, fjac, ipvt, out: None
+
+    def impl(fvec, fjac, ipvt, out):
+        covar1(fvec, fjac, ipvt, None, out)
+
+    return impl
@@ -1,8 +1,9 @@
 """Wrappers of the `dpmpar` and `sdpmpar` functions."""
 
-from numba import extending, njit, types
+from numba import extending, types
 from numpy import float32, float64, int32
 
+from ._caching import njit
 from .cminpack_ import Cminpack
 
 # -------------------------------------- dpmpar -------------------------------------- #
@@ -36,7 +37,7 @@ def _sdpmpar_overload(i):
     return impl
 
 
-@njit
+@njit(cache=True)
 def dpmpar(i: int32) -> float64:
     """Double precision machine parameters.
 
@@ -56,7 +57,7 @@ def dpmpar(i: int32) -> float64:
     return _dpmpar(i)
 
 
-@njit
+@njit(cache=True)
 def sdpmpar(i: int32) -> float32:
     """Single precision machine parameters.
 
@@ -1,9 +1,10 @@
 """Wrapper of the `enorm` function."""
 
-from numba import extending, njit
+from numba import extending
 from numpy import floating, int32
 from numpy.typing import NDArray
 
+from ._caching import njit
 from .cminpack_ import Cminpack
 
 # --------------------------------------- enorm -------------------------------------- #
@@ -26,7 +27,7 @@ def _enorm_overload(n, x):
     return impl
 
 
-@njit
+@njit(cache=True)
 def enorm_(n: int32, x: NDArray[floating]) -> float:
     """Euclidean norm of the n-vector x.
 
@@ -46,7 +47,7 @@ def enorm_(n: int32, x: NDArray[floating]) -> float:
     return _enorm(n, x)
 
 
-@njit
+@njit(cache=True)
 def enorm(x: NDArray[floating]) -> float:
     """Euclidean norm of the n-vector x.
 
@@ -4,16 +4,25 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from numba import extending, njit, types
+from numba import extending, prange, types
 from numpy import empty, finfo, floating, int32, ones
 
+from ._caching import njit
+from ._profile import _start, _stop
+from ._result import HybrdResult, _output
+from ._trace import _trace
+from ._trampoline import _udata_context, trampoline
+from ._workspace import _hybrd_buffers
 from .cminpack_ import Cminpack
-from .utils import _check_dtype, ptr_from_val, ptr_int32, val_from_ptr
+from .utils import _NCHUNKS, _check_dtype, _row, ptr_from_val, ptr_int32, val_from_ptr
 
 if TYPE_CHECKING:
     from numpy import int64
     from numpy.typing import NDArray
 
+    from ._profile import Profile
+    from ._workspace import Workspace
+
 # -------------------------------------- hybrd1 -------------------------------------- #
 
 
@@ -33,6 +42,23 @@ def _hybrd1(
 @extending.overload(_hybrd1)
 def _hybrd1_overload(fcn, n, x, fvec, tol, wa, lwa, udata):
     _check_dtype((fvec, wa), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("hybrd", fcn, x.dtype, udata)
+
+        def dispatcher_impl(fcn, n, x, fvec, tol, wa, lwa, udata):
+            return _hybrd1(
+                address(),
+                n,
+                x,
+                fvec,
+                tol,
+                wa,
+                lwa,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
     hybrd1_external = Cminpack.hybrd1(x.dtype)
 
     @extending.register_jitable
@@ -75,7 +101,7 @@ def _hybrd1_overload(fcn, n, x, fvec, tol, wa, lwa, udata):
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def hybrd1_(
     fcn: int,
     n: int,
@@ -117,7 +143,7 @@ def hybrd1_(
     return _hybrd1(fcn, n, x, fvec, tol, wa, lwa, udata)
 
 
-@njit
+@njit(cache=True, nogil=True)
 def hybrd1(
     fcn: int,
     x: NDArray[floating],
@@ -220,6 +246,64 @@ def _hybrd_overload(
     udata,
 ):
     _check_dtype((fvec, fjac, qtf, wa1, wa2, wa3, wa4), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("hybrd", fcn, x.dtype, udata)
+
+        def dispatcher_impl(
+            fcn,
+            n,
+            x,
+            fvec,
+            xtol,
+            maxfev,
+            ml,
+            mu,
+            epsfcn,
+            diag,
+            mode,
+            factor,
+            nprint,
+            nfev,
+            fjac,
+            ldfjac,
+            r,
+            lr,
+            qtf,
+            wa1,
+            wa2,
+            wa3,
+            wa4,
+            udata,
+        ):
+            return _hybrd(
+                address(),
+                n,
+                x,
+                fvec,
+                xtol,
+                maxfev,
+                ml,
+                mu,
+                epsfcn,
+                diag,
+                mode,
+                factor,
+                nprint,
+                nfev,
+                fjac,
+                ldfjac,
+                r,
+                lr,
+                qtf,
+                wa1,
+                wa2,
+                wa3,
+                wa4,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
     hybrd_external = Cminpack.hybrd(x.dtype)
 
     @extending.register_jitable
@@ -386,7 +470,7 @@ def _hybrd_overload(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def hybrd_(
     fcn: int64,
     n: int32,
@@ -510,7 +594,7 @@ def hybrd_(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def hybrd(
     fcn: int64,
     x: NDArray[floating],
@@ -524,15 +608,11 @@ def hybrd(
     factor: floating | None = None,
     nprint: int32 | None = None,
     udata: NDArray | None = None,
-) -> tuple[
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[floating],
-    int,
-    int,
-]:
+    workspace: Workspace | None = None,
+    full_output: bool | None = None,
+    trace: NDArray[floating] | None = None,
+    profile: Profile | None = None,
+) -> HybrdResult:
     # TODO(nin17): docstring.
     """.
 
@@ -547,9 +627,11 @@ def hybrd(
     maxfev : int32 | None, optional
         _description_, by default None
     ml : int32 | None, optional
-        _description_, by default None
+        number of subdiagonals of a banded jacobian, which is then approximated with
+        groups of ml + mu + 1 columns perturbed together, see
+        [bandwidth][cminpack_numba.pure.bandwidth], by default n (dense)
     mu : int32 | None, optional
-        _description_, by default None
+        number of superdiagonals of a banded jacobian, by default n (dense)
     epsfcn : floating | None, optional
         _description_, by default None
     diag : NDArray[floating] | None, optional
@@ -562,23 +644,31 @@ def hybrd(
         _description_, by default None
     udata : NDArray | None, optional
         _description_, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    full_output : bool | None, optional
+        if False, fjac, r and qtf are empty in the result, which then does not keep
+        the solver's buffers alive, by default True
+    trace : NDArray[floating] | None, optional
+        (k, 3) C contiguous array whose rows are set to ||fvec||, the norm of the step
+        from the previous row and the number of calls to fcn with iflag != 0 at the
+        start of the 1st, (nprint + 1)-th, (2 * nprint + 1)-th... iterations and at
+        termination, and to nan after that, by default None
+    profile : Profile | None, optional
+        profile to add the calls to fcn and the time spent in the solve to, by
+        default None
 
     Returns
     -------
-    tuple[ NDArray[floating], NDArray[floating], NDArray[floating], NDArray[floating],
-           NDArray[floating], int, int, ]
-        _description_
+    HybrdResult
+        x, fvec, fjac, r, qtf, nfev and info
 
     """
     n = int32(x.size)
-    fvec = empty(n, dtype=x.dtype)
-    nfevptr = ptr_from_val(int32(0))
-    fjac = empty((n, n), dtype=x.dtype)
+    x, fvec, fjac, r, qtf, wa, diag = _hybrd_buffers(workspace, n, x, diag)
     ldfjac = n
     lr = (n * (n + 1)) // 2
-    r = empty(lr, dtype=x.dtype)
-    qtf = empty(n, dtype=x.dtype)
-    wa = empty(4 * n, dtype=x.dtype)
+    nfevptr = ptr_from_val(int32(0))
     wa1 = wa[:n]
     wa2 = wa[n : 2 * n]
     wa3 = wa[2 * n : 3 * n]
@@ -586,18 +676,20 @@ def hybrd(
 
     xtol = xtol or 1.49012e-8
     maxfev = maxfev or 200 * (n + 1)
-    ml = ml or n
-    mu = mu or n
+    # not `ml or n`: 0 sub- or superdiagonals is a valid bandwidth
+    ml = n if ml is None else ml
+    mu = n if mu is None else mu
     epsfcn = epsfcn or finfo(x.dtype).eps
-    diag = ones(n, dtype=x.dtype) if diag is None else diag
     mode = mode or 1
     factor = factor or 100.0
     nprint = nprint or 0
+    fcn, udata, nprint = _trace("hybrd", fcn, x, nprint, udata, trace, profile)
+    start = _start(profile)
 
-    return _hybrd(
+    x, fvec, fjac, r, qtf, nfev, info = _hybrd(
         fcn,
         n,
-        x.copy(),
+        x,
         fvec,
         xtol,
         maxfev,
@@ -620,3 +712,130 @@ def hybrd(
         wa4,
         udata,
     )
+    _stop(profile, start)
+    return HybrdResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        _output(r, full_output),
+        _output(qtf, full_output),
+        nfev,
+        info,
+    )
+
+
+# ------------------------------------ hybrd_batch ----------------------------------- #
+
+
+@njit(parallel=True, cache=True, nogil=True)
+def hybrd_batch(
+    fcn: int64,
+    x: NDArray[floating],
+    xtol: floating | None = None,
+    maxfev: int32 | None = None,
+    ml: int32 | None = None,
+    mu: int32 | None = None,
+    epsfcn: floating | None = None,
+    diag: NDArray[floating] | None = None,
+    mode: int32 | None = None,
+    factor: floating | None = None,
+    nprint: int32 | None = None,
+    udata: NDArray | None = None,
+) -> tuple[NDArray[floating], NDArray[floating], NDArray[int32], NDArray[int32]]:
+    """Solve k independent systems of nonlinear equations in parallel with `hybrd`.
+
+    The systems are split into chunks run in parallel, and each chunk allocates
+    its workspace once and reuses it for every system in the chunk.
+
+    Parameters
+    ----------
+    fcn : int64 | Dispatcher
+        address of the cfunc, or njit function, computing the functions, shared by
+        all the systems
+    x : NDArray[floating]
+        (k, n) array of starting points
+    xtol : floating | None, optional
+        see [hybrd][cminpack_numba.hybrd], by default None
+    maxfev : int32 | None, optional
+        see [hybrd][cminpack_numba.hybrd], by default None
+    ml : int32 | None, optional
+        see [hybrd][cminpack_numba.hybrd], by default None
+    mu : int32 | None, optional
+        see [hybrd][cminpack_numba.hybrd], by default None
+    epsfcn : floating | None, optional
+        see [hybrd][cminpack_numba.hybrd], by default None
+    diag : NDArray[floating] | None, optional
+        (k, n) array of scaling factors, by default None
+    mode : int32 | None, optional
+        see [hybrd][cminpack_numba.hybrd], by default None
+    factor : floating | None, optional
+        see [hybrd][cminpack_numba.hybrd], by default None
+    nprint : int32 | None, optional
+        see [hybrd][cminpack_numba.hybrd], by default None
+    udata : NDArray | None, optional
+        array whose i-th row is passed as udata to the i-th system, by default None
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[floating], NDArray[int32], NDArray[int32]]
+        (k, n) solutions, (k, n) function values, number of function evaluations and
+        info of each system
+
+    """
+    k, n = x.shape
+    n = int32(n)
+    # `a or b` on optional floats miscompiles the prange loop below
+    xtol = 1.49012e-8 if xtol is None else xtol
+    maxfev = 200 * (n + 1) if maxfev is None else maxfev
+    ml = n if ml is None else ml
+    mu = n if mu is None else mu
+    epsfcn = finfo(x.dtype).eps if epsfcn is None else epsfcn
+    mode = 1 if mode is None else mode
+    factor = 100.0 if factor is None else factor
+    nprint = 0 if nprint is None else nprint
+
+    xs = x.copy()
+    fvecs = empty((k, n), dtype=x.dtype)
+    diags = ones((k, n), dtype=x.dtype) if diag is None else diag.copy()
+    nfevs = empty(k, dtype=int32)
+    infos = empty(k, dtype=int32)
+    lr = (n * (n + 1)) // 2
+
+    nchunks = min(k, _NCHUNKS)
+    for c in prange(nchunks):
+        fjac = empty((n, n), dtype=x.dtype)
+        r = empty(lr, dtype=x.dtype)
+        qtf = empty(n, dtype=x.dtype)
+        wa = empty(4 * n, dtype=x.dtype)
+        for i in range(c * k // nchunks, (c + 1) * k // nchunks):
+            nfevptr = ptr_from_val(int32(0))
+            info = _hybrd(
+                fcn,
+                n,
+                xs[i],
+                fvecs[i],
+                xtol,
+                maxfev,
+                ml,
+                mu,
+                epsfcn,
+                diags[i],
+                mode,
+                factor,
+                nprint,
+                nfevptr,
+                fjac,
+                n,
+                r,
+                lr,
+                qtf,
+                wa[:n],
+                wa[n : 2 * n],
+                wa[2 * n : 3 * n],
+                wa[3 * n :],
+                _row(udata, i),
+            )[-1]
+            nfevs[i] = val_from_ptr(nfevptr)
+            infos[i] = info
+
+    return xs, fvecs, nfevs, infos
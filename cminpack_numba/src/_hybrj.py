@@ -4,16 +4,25 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from numba import extending, njit, types
+from numba import extending, prange, types
 from numpy import empty, floating, int32, ones
 
+from ._caching import njit
+from ._profile import _start, _stop
+from ._result import HybrjResult, _output
+from ._trace import _trace
+from ._trampoline import _udata_context, trampoline
+from ._workspace import _hybrd_buffers
 from .cminpack_ import Cminpack
-from .utils import _check_dtype, ptr_from_val, ptr_int32, val_from_ptr
+from .utils import _NCHUNKS, _check_dtype, _row, ptr_from_val, ptr_int32, val_from_ptr
 
 if TYPE_CHECKING:
     from numpy import int64
     from numpy.typing import NDArray
 
+    from ._profile import Profile
+    from ._workspace import Workspace
+
 # -------------------------------------- hybrj1 -------------------------------------- #
 
 
@@ -24,6 +33,25 @@ def _hybrj1(fcn, n, x, fvec, fjac, ldfjac, tol, wa, lwa, udata):
 @extending.overload(_hybrj1)
 def _hybrj1_overload(fcn, n, x, fvec, fjac, ldfjac, tol, wa, lwa, udata):
     _check_dtype((fvec, fjac, wa), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("hybrj", fcn, x.dtype, udata)
+
+        def dispatcher_impl(fcn, n, x, fvec, fjac, ldfjac, tol, wa, lwa, udata):
+            return _hybrj1(
+                address(),
+                n,
+                x,
+                fvec,
+                fjac,
+                ldfjac,
+                tol,
+                wa,
+                lwa,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
     hybrj1_external = Cminpack.hybrj1(x.dtype)
 
     @extending.register_jitable
@@ -72,7 +100,7 @@ def _hybrj1_overload(fcn, n, x, fvec, fjac, ldfjac, tol, wa, lwa, udata):
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def hybrj1_(
     fcn: int64,
     n: int32,
@@ -120,7 +148,7 @@ def hybrj1_(
     return _hybrj1(fcn, n, x, fvec, fjac, ldfjac, tol, wa, lwa, udata)
 
 
-@njit
+@njit(cache=True, nogil=True)
 def hybrj1(
     fcn: int64,
     x: NDArray[floating],
@@ -212,6 +240,60 @@ def _hybrj_overload(
     udata,
 ):
     _check_dtype((fvec, fjac, qtf, wa1, wa2, wa3, wa4), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("hybrj", fcn, x.dtype, udata)
+
+        def dispatcher_impl(
+            fcn,
+            n,
+            x,
+            fvec,
+            fjac,
+            ldfjac,
+            xtol,
+            maxfev,
+            diag,
+            mode,
+            factor,
+            nprint,
+            nfev,
+            njev,
+            r,
+            lr,
+            qtf,
+            wa1,
+            wa2,
+            wa3,
+            wa4,
+            udata,
+        ):
+            return _hybrj(
+                address(),
+                n,
+                x,
+                fvec,
+                fjac,
+                ldfjac,
+                xtol,
+                maxfev,
+                diag,
+                mode,
+                factor,
+                nprint,
+                nfev,
+                njev,
+                r,
+                lr,
+                qtf,
+                wa1,
+                wa2,
+                wa3,
+                wa4,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
     hybrd_external = Cminpack.hybrj(x.dtype)
 
     @extending.register_jitable
@@ -368,7 +450,7 @@ def _hybrj_overload(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def hybrj_(
     fcn: int64,
     n: int32,
@@ -485,7 +567,7 @@ def hybrj_(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def hybrj(
     fcn: int64,
     x: NDArray[floating],
@@ -496,16 +578,11 @@ def hybrj(
     factor: floating | None = None,
     nprint: int32 | None = None,
     udata: NDArray | None = None,
-) -> tuple[
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[floating],
-    int,
-    int,
-    int,
-]:
+    workspace: Workspace | None = None,
+    full_output: bool | None = None,
+    trace: NDArray[floating] | None = None,
+    profile: Profile | None = None,
+) -> HybrjResult:
     # TODO(nin17): docstring
     """.
 
@@ -529,24 +606,32 @@ def hybrj(
         _description_, by default None
     udata : NDArray | None, optional
         _description_, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    full_output : bool | None, optional
+        if False, fjac, r and qtf are empty in the result, which then does not keep
+        the solver's buffers alive, by default True
+    trace : NDArray[floating] | None, optional
+        (k, 3) C contiguous array whose rows are set to ||fvec||, the norm of the step
+        from the previous row and the number of calls to fcn with iflag != 0 at the
+        start of the 1st, (nprint + 1)-th, (2 * nprint + 1)-th... iterations and at
+        termination, and to nan after that, by default None
+    profile : Profile | None, optional
+        profile to add the calls to fcn and the time spent in the solve to, by
+        default None
 
     Returns
     -------
-    tuple[ NDArray[floating], NDArray[floating], NDArray[floating], NDArray[floating],
-           NDArray[floating], int, int, int, ]
-        _description_
+    HybrjResult
+        x, fvec, fjac, r, qtf, nfev, njev and info
 
     """
     n = int32(x.size)
-    fvec = empty(n, dtype=x.dtype)
-    nfevptr = ptr_from_val(int32(0))
-    njevptr = ptr_from_val(int32(0))
-    fjac = empty((n, n), dtype=x.dtype)
+    x, fvec, fjac, r, qtf, wa, diag = _hybrd_buffers(workspace, n, x, diag)
     ldfjac = n
     lr = (n * (n + 1)) // 2
-    r = empty(lr, dtype=x.dtype)
-    qtf = empty(n, dtype=x.dtype)
-    wa = empty(4 * n, dtype=x.dtype)
+    nfevptr = ptr_from_val(int32(0))
+    njevptr = ptr_from_val(int32(0))
     wa1 = wa[:n]
     wa2 = wa[n : 2 * n]
     wa3 = wa[2 * n : 3 * n]
@@ -554,15 +639,16 @@ def hybrj(
 
     xtol = xtol or 1.49012e-8
     maxfev = maxfev or 200 * (n + 1)
-    diag = ones(n, dtype=x.dtype) if diag is None else diag
     mode = mode or 1
     factor = factor or 100.0
     nprint = nprint or 0
+    fcn, udata, nprint = _trace("hybrj", fcn, x, nprint, udata, trace, profile)
+    start = _start(profile)
 
-    return _hybrj(
+    x, fvec, fjac, r, qtf, nfev, njev, info = _hybrj(
         fcn,
         n,
-        x.copy(),
+        x,
         fvec,
         fjac,
         ldfjac,
@@ -583,3 +669,127 @@ def hybrj(
         wa4,
         udata,
     )
+    _stop(profile, start)
+    return HybrjResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        _output(r, full_output),
+        _output(qtf, full_output),
+        nfev,
+        njev,
+        info,
+    )
+
+
+# ------------------------------------ hybrj_batch ----------------------------------- #
+
+
+@njit(parallel=True, cache=True, nogil=True)
+def hybrj_batch(
+    fcn: int64,
+    x: NDArray[floating],
+    xtol: floating | None = None,
+    maxfev: int32 | None = None,
+    diag: NDArray[floating] | None = None,
+    mode: int32 | None = None,
+    factor: floating | None = None,
+    nprint: int32 | None = None,
+    udata: NDArray | None = None,
+) -> tuple[
+    NDArray[floating],
+    NDArray[floating],
+    NDArray[int32],
+    NDArray[int32],
+    NDArray[int32],
+]:
+    """Solve k independent systems of nonlinear equations in parallel with `hybrj`.
+
+    The systems are split into chunks run in parallel, and each chunk allocates
+    its workspace once and reuses it for every system in the chunk.
+
+    Parameters
+    ----------
+    fcn : int64 | Dispatcher
+        address of the cfunc, or njit function, computing the functions and the
+        jacobian, shared by all the systems
+    x : NDArray[floating]
+        (k, n) array of starting points
+    xtol : floating | None, optional
+        see [hybrj][cminpack_numba.hybrj], by default None
+    maxfev : int32 | None, optional
+        see [hybrj][cminpack_numba.hybrj], by default None
+    diag : NDArray[floating] | None, optional
+        (k, n) array of scaling factors, by default None
+    mode : int32 | None, optional
+        see [hybrj][cminpack_numba.hybrj], by default None
+    factor : floating | None, optional
+        see [hybrj][cminpack_numba.hybrj], by default None
+    nprint : int32 | None, optional
+        see [hybrj][cminpack_numba.hybrj], by default None
+    udata : NDArray | None, optional
+        array whose i-th row is passed as udata to the i-th system, by default None
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[floating], NDArray[int32], NDArray[int32],
+          NDArray[int32]]
+        (k, n) solutions, (k, n) function values, number of function evaluations,
+        number of jacobian evaluations and info of each system
+
+    """
+    k, n = x.shape
+    n = int32(n)
+    # `a or b` on optional floats miscompiles the prange loop below
+    xtol = 1.49012e-8 if xtol is None else xtol
+    maxfev = 200 * (n + 1) if maxfev is None else maxfev
+    mode = 1 if mode is None else mode
+    factor = 100.0 if factor is None else factor
+    nprint = 0 if nprint is None else nprint
+
+    xs = x.copy()
+    fvecs = empty((k, n), dtype=x.dtype)
+    diags = ones((k, n), dtype=x.dtype) if diag is None else diag.copy()
+    nfevs = empty(k, dtype=int32)
+    njevs = empty(k, dtype=int32)
+    infos = empty(k, dtype=int32)
+    lr = (n * (n + 1)) // 2
+
+    nchunks = min(k, _NCHUNKS)
+    for c in prange(nchunks):
+        fjac = empty((n, n), dtype=x.dtype)
+        r = empty(lr, dtype=x.dtype)
+        qtf = empty(n, dtype=x.dtype)
+        wa = empty(4 * n, dtype=x.dtype)
+        for i in range(c * k // nchunks, (c + 1) * k // nchunks):
+            nfevptr = ptr_from_val(int32(0))
+            njevptr = ptr_from_val(int32(0))
+            info = _hybrj(
+                fcn,
+                n,
+                xs[i],
+                fvecs[i],
+                fjac,
+                n,
+                xtol,
+                maxfev,
+                diags[i],
+                mode,
+                factor,
+                nprint,
+                nfevptr,
+                njevptr,
+                r,
+                lr,
+                qtf,
+                wa[:n],
+                wa[n : 2 * n],
+                wa[2 * n : 3 * n],
+                wa[3 * n :],
+                _row(udata, i),
+            )[-1]
+            nfevs[i] = val_from_ptr(nfevptr)
+            njevs[i] = val_from_ptr(njevptr)
+            infos[i] = info
+
+    return xs, fvecs, nfevs, njevs, infos
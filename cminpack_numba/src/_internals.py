@@ -0,0 +1,1212 @@
+"""Wrappers of the internal MINPACK subroutines used by the drivers.
+
+The building blocks of lmdif, lmder, lmstr, hybrd and hybrj: forward-difference
+jacobians (fdjac1, fdjac2), QR factorization and its updates (qrfac, qform, r1updt,
+r1mpyq, rwupdt) and the trust-region steps (qrsolv, lmpar, dogleg), for composing
+solvers without leaving nopython mode.
+
+As in MINPACK, the matrices are stored column-major with a leading dimension and are
+updated in place. The low-level functions, suffixed with an underscore, take the
+same arguments as the C functions, with pointers to scalars created with
+[ptr_from_val][cminpack_numba.utils.ptr_from_val]. The high-level functions take
+2-D column-major arrays, e.g. from `numpy.asfortranarray` or returned by `qrfac`,
+infer the dimensions and allocate the outputs and work arrays.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from numba import extending, types
+from numpy import empty, finfo, int32
+
+from ._caching import njit
+from ._trampoline import _udata_context, trampoline
+from .cminpack_ import Cminpack
+from .utils import _check_dtype, ptr_from_val, val_from_ptr
+
+if TYPE_CHECKING:
+    from numpy import floating, int64
+    from numpy.typing import NDArray
+
+
+@njit(cache=True)
+def _leading_dimension(a: NDArray[floating]) -> int32:
+    """Leading dimension of the column-major 2-D array `a`."""
+    if a.shape[0] > 1 and a.strides[0] != a.itemsize:
+        msg = "2-D arrays must be column-major, e.g. created by numpy.asfortranarray"
+        raise ValueError(msg)
+    if a.shape[1] > 1:
+        return int32(a.strides[1] // a.itemsize)
+    return int32(max(a.shape[0], 1))
+
+
+# -------------------------------------- fdjac2 -------------------------------------- #
+
+
+def _fdjac2(fcn, m, n, x, fvec, fjac, ldfjac, epsfcn, wa, udata):
+    raise NotImplementedError
+
+
+@extending.overload(_fdjac2)
+def _fdjac2_overload(fcn, m, n, x, fvec, fjac, ldfjac, epsfcn, wa, udata):
+    _check_dtype((fvec, fjac, wa), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("lmdif", fcn, x.dtype, udata)
+
+        def dispatcher_impl(fcn, m, n, x, fvec, fjac, ldfjac, epsfcn, wa, udata):
+            return _fdjac2(
+                address(),
+                m,
+                n,
+                x,
+                fvec,
+                fjac,
+                ldfjac,
+                epsfcn,
+                wa,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
+    fdjac2_external = Cminpack.fdjac2(x.dtype)
+
+    @extending.register_jitable
+    def impl(fcn, m, n, x, fvec, fjac, ldfjac, epsfcn, wa, udata):
+        info = fdjac2_external(
+            fcn,
+            udata,
+            m,
+            n,
+            x.ctypes,
+            fvec.ctypes,
+            fjac.ctypes,
+            ldfjac,
+            epsfcn,
+            wa.ctypes,
+        )
+        return fjac, info
+
+    if isinstance(udata, types.Array):
+        return lambda fcn, m, n, x, fvec, fjac, ldfjac, epsfcn, wa, udata: impl(
+            fcn,
+            m,
+            n,
+            x,
+            fvec,
+            fjac,
+            ldfjac,
+            epsfcn,
+            wa,
+            udata.ctypes,
+        )
+    if udata is not types.none:
+        return impl
+    return lambda fcn, m, n, x, fvec, fjac, ldfjac, epsfcn, wa, udata: impl(
+        fcn,
+        m,
+        n,
+        x,
+        fvec,
+        fjac,
+        ldfjac,
+        epsfcn,
+        wa,
+        0,
+    )
+
+
+@njit(cache=True)
+def fdjac2_(
+    fcn: int64,
+    m: int32,
+    n: int32,
+    x: NDArray[floating],
+    fvec: NDArray[floating],
+    fjac: NDArray[floating],
+    ldfjac: int32,
+    epsfcn: floating,
+    wa: NDArray[floating],
+    udata: NDArray | None = None,
+) -> tuple[NDArray[floating], int32]:
+    """Forward-difference approximation to the m by n jacobian of lmdif's `fcn`.
+
+    Parameters
+    ----------
+    fcn : int64 | Dispatcher
+        address of the cfunc, or njit function, computing the residuals, as for
+        [lmdif][cminpack_numba.lmdif]
+    m : int32
+        number of residuals
+    n : int32
+        number of variables
+    x : NDArray[floating]
+        (n,) point at which the jacobian is evaluated, restored on exit
+    fvec : NDArray[floating]
+        (m,) residuals at x
+    fjac : NDArray[floating]
+        ldfjac * n column-major output array
+    ldfjac : int32
+        leading dimension of fjac, at least m
+    epsfcn : floating
+        relative errors in the residuals
+    wa : NDArray[floating]
+        work array of length m
+    udata : NDArray | None, optional
+        passed on to fcn, by default None
+
+    Returns
+    -------
+    tuple[NDArray[floating], int32]
+        fjac and info: negative if fcn requested termination, otherwise 0
+
+    """
+    return _fdjac2(fcn, m, n, x, fvec, fjac, ldfjac, epsfcn, wa, udata)
+
+
+@njit(cache=True)
+def fdjac2(
+    fcn: int64,
+    x: NDArray[floating],
+    fvec: NDArray[floating],
+    epsfcn: floating | None = None,
+    udata: NDArray | None = None,
+) -> tuple[NDArray[floating], int32]:
+    """Forward-difference approximation to the jacobian of lmdif's `fcn`.
+
+    Parameters
+    ----------
+    fcn : int64 | Dispatcher
+        address of the cfunc, or njit function, computing the residuals, as for
+        [lmdif][cminpack_numba.lmdif]
+    x : NDArray[floating]
+        (n,) point at which the jacobian is evaluated
+    fvec : NDArray[floating]
+        (m,) residuals at x
+    epsfcn : floating | None, optional
+        relative errors in the residuals, by default the machine precision
+    udata : NDArray | None, optional
+        passed on to fcn, by default None
+
+    Returns
+    -------
+    tuple[NDArray[floating], int32]
+        (m, n) column-major jacobian and info: negative if fcn requested
+        termination, otherwise 0
+
+    """
+    m = int32(fvec.size)
+    n = int32(x.size)
+    fjac = empty((n, m), dtype=x.dtype).T
+    wa = empty(m, dtype=x.dtype)
+    epsfcn = epsfcn or finfo(x.dtype).eps
+    return _fdjac2(fcn, m, n, x, fvec, fjac, m, epsfcn, wa, udata)
+
+
+# -------------------------------------- fdjac1 -------------------------------------- #
+
+
+def _fdjac1(fcn, n, x, fvec, fjac, ldfjac, ml, mu, epsfcn, wa1, wa2, udata):
+    raise NotImplementedError
+
+
+@extending.overload(_fdjac1)
+def _fdjac1_overload(fcn, n, x, fvec, fjac, ldfjac, ml, mu, epsfcn, wa1, wa2, udata):
+    _check_dtype((fvec, fjac, wa1, wa2), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("hybrd", fcn, x.dtype, udata)
+
+        def dispatcher_impl(
+            fcn,
+            n,
+            x,
+            fvec,
+            fjac,
+            ldfjac,
+            ml,
+            mu,
+            epsfcn,
+            wa1,
+            wa2,
+            udata,
+        ):
+            return _fdjac1(
+                address(),
+                n,
+                x,
+                fvec,
+                fjac,
+                ldfjac,
+                ml,
+                mu,
+                epsfcn,
+                wa1,
+                wa2,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
+    fdjac1_external = Cminpack.fdjac1(x.dtype)
+
+    @extending.register_jitable
+    def impl(fcn, n, x, fvec, fjac, ldfjac, ml, mu, epsfcn, wa1, wa2, udata):
+        info = fdjac1_external(
+            fcn,
+            udata,
+            n,
+            x.ctypes,
+            fvec.ctypes,
+            fjac.ctypes,
+            ldfjac,
+            ml,
+            mu,
+            epsfcn,
+            wa1.ctypes,
+            wa2.ctypes,
+        )
+        return fjac, info
+
+    if isinstance(udata, types.Array):
+        return lambda fcn, n, x, fvec, fjac, ldfjac, ml, mu, epsfcn, wa1, wa2, udata: (
+            impl(fcn, n, x, fvec, fjac, ldfjac, ml, mu, epsfcn, wa1, wa2, udata.ctypes)
+        )
+    if udata is not types.none:
+        return impl
+    return lambda fcn, n, x, fvec, fjac, ldfjac, ml, mu, epsfcn, wa1, wa2, udata: impl(
+        fcn, n, x, fvec, fjac, ldfjac, ml, mu, epsfcn, wa1, wa2, 0
+    )
+
+
+@njit(cache=True)
+def fdjac1_(
+    fcn: int64,
+    n: int32,
+    x: NDArray[floating],
+    fvec: NDArray[floating],
+    fjac: NDArray[floating],
+    ldfjac: int32,
+    ml: int32,
+    mu: int32,
+    epsfcn: floating,
+    wa1: NDArray[floating],
+    wa2: NDArray[floating],
+    udata: NDArray | None = None,
+) -> tuple[NDArray[floating], int32]:
+    """Forward-difference approximation to the n by n jacobian of hybrd's `fcn`.
+
+    Parameters
+    ----------
+    fcn : int64 | Dispatcher
+        address of the cfunc, or njit function, computing the functions, as for
+        [hybrd][cminpack_numba.hybrd]
+    n : int32
+        number of functions and variables
+    x : NDArray[floating]
+        (n,) point at which the jacobian is evaluated, restored on exit
+    fvec : NDArray[floating]
+        (n,) functions at x
+    fjac : NDArray[floating]
+        ldfjac * n column-major output array
+    ldfjac : int32
+        leading dimension of fjac, at least n
+    ml : int32
+        number of subdiagonals of a banded jacobian, n - 1 if it is not banded
+    mu : int32
+        number of superdiagonals of a banded jacobian, n - 1 if it is not banded
+    epsfcn : floating
+        relative errors in the functions
+    wa1 : NDArray[floating]
+        work array of length n
+    wa2 : NDArray[floating]
+        work array of length n
+    udata : NDArray | None, optional
+        passed on to fcn, by default None
+
+    Returns
+    -------
+    tuple[NDArray[floating], int32]
+        fjac and info: negative if fcn requested termination, otherwise 0
+
+    """
+    return _fdjac1(fcn, n, x, fvec, fjac, ldfjac, ml, mu, epsfcn, wa1, wa2, udata)
+
+
+@njit(cache=True)
+def fdjac1(
+    fcn: int64,
+    x: NDArray[floating],
+    fvec: NDArray[floating],
+    ml: int32 | None = None,
+    mu: int32 | None = None,
+    epsfcn: floating | None = None,
+    udata: NDArray | None = None,
+) -> tuple[NDArray[floating], int32]:
+    """Forward-difference approximation to the jacobian of hybrd's `fcn`.
+
+    Parameters
+    ----------
+    fcn : int64 | Dispatcher
+        address of the cfunc, or njit function, computing the functions, as for
+        [hybrd][cminpack_numba.hybrd]
+    x : NDArray[floating]
+        (n,) point at which the jacobian is evaluated
+    fvec : NDArray[floating]
+        (n,) functions at x
+    ml : int32 | None, optional
+        number of subdiagonals of a banded jacobian, by default n
+    mu : int32 | None, optional
+        number of superdiagonals of a banded jacobian, by default n
+    epsfcn : floating | None, optional
+        relative errors in the functions, by default the machine precision
+    udata : NDArray | None, optional
+        passed on to fcn, by default None
+
+    Returns
+    -------
+    tuple[NDArray[floating], int32]
+        (n, n) column-major jacobian, with zeros outside the band, and info:
+        negative if fcn requested termination, otherwise 0
+
+    """
+    n = int32(x.size)
+    fjac = empty((n, n), dtype=x.dtype).T
+    wa1 = empty(n, dtype=x.dtype)
+    wa2 = empty(n, dtype=x.dtype)
+    ml = n if ml is None else ml
+    mu = n if mu is None else mu
+    epsfcn = epsfcn or finfo(x.dtype).eps
+    return _fdjac1(fcn, n, x, fvec, fjac, n, ml, mu, epsfcn, wa1, wa2, udata)
+
+
+# -------------------------------------- qrfac --------------------------------------- #
+
+
+def _qrfac(m, n, a, lda, pivot, ipvt, lipvt, rdiag, acnorm, wa):
+    raise NotImplementedError
+
+
+@extending.overload(_qrfac)
+def _qrfac_overload(m, n, a, lda, pivot, ipvt, lipvt, rdiag, acnorm, wa):
+    _check_dtype((rdiag, acnorm, wa), a.dtype)
+    qrfac_external = Cminpack.qrfac(a.dtype)
+
+    def impl(m, n, a, lda, pivot, ipvt, lipvt, rdiag, acnorm, wa):
+        qrfac_external(
+            m,
+            n,
+            a.ctypes,
+            lda,
+            int32(pivot),
+            ipvt.ctypes,
+            lipvt,
+            rdiag.ctypes,
+            acnorm.ctypes,
+            wa.ctypes,
+        )
+        return a, ipvt, rdiag, acnorm
+
+    return impl
+
+
+@njit(cache=True)
+def qrfac_(
+    m: int32,
+    n: int32,
+    a: NDArray[floating],
+    lda: int32,
+    pivot: bool,
+    ipvt: NDArray[int32],
+    lipvt: int32,
+    rdiag: NDArray[floating],
+    acnorm: NDArray[floating],
+    wa: NDArray[floating],
+) -> tuple[NDArray[floating], NDArray[int32], NDArray[floating], NDArray[floating]]:
+    """QR factorization, with optional column pivoting, of the m by n matrix a.
+
+    Parameters
+    ----------
+    m : int32
+        number of rows of a
+    n : int32
+        number of columns of a
+    a : NDArray[floating]
+        lda * n column-major matrix, overwritten by R in its upper triangle and
+        the Householder vectors of Q below it
+    lda : int32
+        leading dimension of a, at least m
+    pivot : bool
+        whether to pivot the columns
+    ipvt : NDArray[int32]
+        (lipvt,) output permutation: column j of P is column ipvt[j] (1-based) of
+        the identity
+    lipvt : int32
+        length of ipvt, n if pivot, otherwise at least 1
+    rdiag : NDArray[floating]
+        (n,) output diagonal of R
+    acnorm : NDArray[floating]
+        (n,) output norms of the columns of a
+    wa : NDArray[floating]
+        work array of length n, or 1 if not pivot
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[int32], NDArray[floating], NDArray[floating]]
+        a, ipvt, rdiag and acnorm
+
+    """
+    return _qrfac(m, n, a, lda, pivot, ipvt, lipvt, rdiag, acnorm, wa)
+
+
+@njit(cache=True)
+def qrfac(
+    a: NDArray[floating],
+    pivot: bool | None = None,
+) -> tuple[NDArray[floating], NDArray[int32], NDArray[floating], NDArray[floating]]:
+    """QR factorization, with column pivoting, of the column-major matrix a.
+
+    Parameters
+    ----------
+    a : NDArray[floating]
+        (m, n) column-major matrix, overwritten by R in its upper triangle and the
+        Householder vectors of Q below it
+    pivot : bool | None, optional
+        whether to pivot the columns, by default True
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[int32], NDArray[floating], NDArray[floating]]
+        a, the permutation ipvt (1-based), the diagonal of R and the norms of the
+        columns of a
+
+    """
+    m = int32(a.shape[0])
+    n = int32(a.shape[1])
+    lda = _leading_dimension(a)
+    pivot = True if pivot is None else pivot
+    ipvt = empty(n, dtype=int32)
+    rdiag = empty(n, dtype=a.dtype)
+    acnorm = empty(n, dtype=a.dtype)
+    wa = empty(n, dtype=a.dtype)
+    return _qrfac(m, n, a, lda, pivot, ipvt, n, rdiag, acnorm, wa)
+
+
+# -------------------------------------- qform --------------------------------------- #
+
+
+def _qform(m, n, q, ldq, wa):
+    raise NotImplementedError
+
+
+@extending.overload(_qform)
+def _qform_overload(m, n, q, ldq, wa):
+    _check_dtype((wa,), q.dtype)
+    qform_external = Cminpack.qform(q.dtype)
+
+    def impl(m, n, q, ldq, wa):
+        qform_external(m, n, q.ctypes, ldq, wa.ctypes)
+        return q
+
+    return impl
+
+
+@njit(cache=True)
+def qform_(
+    m: int32,
+    n: int32,
+    q: NDArray[floating],
+    ldq: int32,
+    wa: NDArray[floating],
+) -> NDArray[floating]:
+    """Accumulate the orthogonal matrix Q of the unpivoted QR factorization of qrfac.
+
+    Parameters
+    ----------
+    m : int32
+        number of rows of q
+    n : int32
+        number of columns of the factorized matrix
+    q : NDArray[floating]
+        ldq * m column-major matrix, whose first min(m, n) columns hold the
+        Householder vectors of qrfac, overwritten by the m by m matrix Q
+    ldq : int32
+        leading dimension of q, at least m
+    wa : NDArray[floating]
+        work array of length m
+
+    Returns
+    -------
+    NDArray[floating]
+        q
+
+    """
+    return _qform(m, n, q, ldq, wa)
+
+
+@njit(cache=True)
+def qform(q: NDArray[floating], n: int32) -> NDArray[floating]:
+    """Accumulate the orthogonal matrix Q of the unpivoted QR factorization of qrfac.
+
+    Parameters
+    ----------
+    q : NDArray[floating]
+        (m, m) column-major matrix, whose first min(m, n) columns hold the
+        Householder vectors of qrfac, overwritten by Q
+    n : int32
+        number of columns of the factorized matrix
+
+    Returns
+    -------
+    NDArray[floating]
+        q
+
+    """
+    m = int32(q.shape[0])
+    wa = empty(m, dtype=q.dtype)
+    return _qform(m, n, q, _leading_dimension(q), wa)
+
+
+# -------------------------------------- qrsolv -------------------------------------- #
+
+
+def _qrsolv(n, r, ldr, ipvt, diag, qtb, x, sdiag, wa):
+    raise NotImplementedError
+
+
+@extending.overload(_qrsolv)
+def _qrsolv_overload(n, r, ldr, ipvt, diag, qtb, x, sdiag, wa):
+    _check_dtype((diag, qtb, x, sdiag, wa), r.dtype)
+    qrsolv_external = Cminpack.qrsolv(r.dtype)
+
+    def impl(n, r, ldr, ipvt, diag, qtb, x, sdiag, wa):
+        qrsolv_external(
+            n,
+            r.ctypes,
+            ldr,
+            ipvt.ctypes,
+            diag.ctypes,
+            qtb.ctypes,
+            x.ctypes,
+            sdiag.ctypes,
+            wa.ctypes,
+        )
+        return x, sdiag
+
+    return impl
+
+
+@njit(cache=True)
+def qrsolv_(
+    n: int32,
+    r: NDArray[floating],
+    ldr: int32,
+    ipvt: NDArray[int32],
+    diag: NDArray[floating],
+    qtb: NDArray[floating],
+    x: NDArray[floating],
+    sdiag: NDArray[floating],
+    wa: NDArray[floating],
+) -> tuple[NDArray[floating], NDArray[floating]]:
+    """Least squares solution of a x = b, d x = 0 from the QR factorization of a.
+
+    Parameters
+    ----------
+    n : int32
+        order of r
+    r : NDArray[floating]
+        ldr * n column-major upper triangular matrix R of qrfac, whose strict
+        lower triangle is overwritten
+    ldr : int32
+        leading dimension of r, at least n
+    ipvt : NDArray[int32]
+        (n,) permutation of qrfac
+    diag : NDArray[floating]
+        (n,) diagonal of the matrix d
+    qtb : NDArray[floating]
+        (n,) first n elements of transpose(Q) * b
+    x : NDArray[floating]
+        (n,) output solution
+    sdiag : NDArray[floating]
+        (n,) output diagonal of the upper triangular matrix S with
+        transpose(P) * (transpose(a) * a + d * d) * P = transpose(S) * S
+    wa : NDArray[floating]
+        work array of length n
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[floating]]
+        x and sdiag
+
+    """
+    return _qrsolv(n, r, ldr, ipvt, diag, qtb, x, sdiag, wa)
+
+
+@njit(cache=True)
+def qrsolv(
+    r: NDArray[floating],
+    ipvt: NDArray[int32],
+    diag: NDArray[floating],
+    qtb: NDArray[floating],
+) -> tuple[NDArray[floating], NDArray[floating]]:
+    """Least squares solution of a x = b, d x = 0 from the QR factorization of a.
+
+    Parameters
+    ----------
+    r : NDArray[floating]
+        (n, n) column-major upper triangular matrix R of qrfac, e.g. the first n
+        rows of a, whose strict lower triangle is overwritten
+    ipvt : NDArray[int32]
+        (n,) permutation of qrfac
+    diag : NDArray[floating]
+        (n,) diagonal of the matrix d
+    qtb : NDArray[floating]
+        (n,) first n elements of transpose(Q) * b
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[floating]]
+        the solution x and the diagonal of S, see `qrsolv_`
+
+    """
+    n = int32(r.shape[1])
+    x = empty(n, dtype=r.dtype)
+    sdiag = empty(n, dtype=r.dtype)
+    wa = empty(n, dtype=r.dtype)
+    return _qrsolv(n, r, _leading_dimension(r), ipvt, diag, qtb, x, sdiag, wa)
+
+
+# -------------------------------------- lmpar --------------------------------------- #
+
+
+def _lmpar(n, r, ldr, ipvt, diag, qtb, delta, par, x, sdiag, wa1, wa2):
+    raise NotImplementedError
+
+
+@extending.overload(_lmpar)
+def _lmpar_overload(n, r, ldr, ipvt, diag, qtb, delta, par, x, sdiag, wa1, wa2):
+    _check_dtype((diag, qtb, x, sdiag, wa1, wa2), r.dtype)
+    lmpar_external = Cminpack.lmpar(r.dtype)
+
+    def impl(n, r, ldr, ipvt, diag, qtb, delta, par, x, sdiag, wa1, wa2):
+        lmpar_external(
+            n,
+            r.ctypes,
+            ldr,
+            ipvt.ctypes,
+            diag.ctypes,
+            qtb.ctypes,
+            delta,
+            par,
+            x.ctypes,
+            sdiag.ctypes,
+            wa1.ctypes,
+            wa2.ctypes,
+        )
+        return val_from_ptr(par), x, sdiag
+
+    return impl
+
+
+@njit(cache=True)
+def lmpar_(
+    n: int32,
+    r: NDArray[floating],
+    ldr: int32,
+    ipvt: NDArray[int32],
+    diag: NDArray[floating],
+    qtb: NDArray[floating],
+    delta: floating,
+    par: types.CPointer,
+    x: NDArray[floating],
+    sdiag: NDArray[floating],
+    wa1: NDArray[floating],
+    wa2: NDArray[floating],
+) -> tuple[floating, NDArray[floating], NDArray[floating]]:
+    """Levenberg-Marquardt parameter of the trust region step of lmdif and lmder.
+
+    Parameters
+    ----------
+    n : int32
+        order of r
+    r : NDArray[floating]
+        ldr * n column-major upper triangular matrix R of qrfac, whose strict
+        lower triangle is overwritten
+    ldr : int32
+        leading dimension of r, at least n
+    ipvt : NDArray[int32]
+        (n,) permutation of qrfac
+    diag : NDArray[floating]
+        (n,) scaling factors of the variables
+    qtb : NDArray[floating]
+        (n,) first n elements of transpose(Q) * b
+    delta : floating
+        radius of the trust region
+    par : types.CPointer
+        pointer to the initial estimate of the parameter, overwritten by the
+        parameter
+    x : NDArray[floating]
+        (n,) output step
+    sdiag : NDArray[floating]
+        (n,) output diagonal of S, see `qrsolv_`
+    wa1 : NDArray[floating]
+        work array of length n
+    wa2 : NDArray[floating]
+        work array of length n
+
+    Returns
+    -------
+    tuple[floating, NDArray[floating], NDArray[floating]]
+        the parameter, x and sdiag
+
+    """
+    return _lmpar(n, r, ldr, ipvt, diag, qtb, delta, par, x, sdiag, wa1, wa2)
+
+
+@njit(cache=True)
+def lmpar(
+    r: NDArray[floating],
+    ipvt: NDArray[int32],
+    diag: NDArray[floating],
+    qtb: NDArray[floating],
+    delta: floating,
+    par: floating | None = None,
+) -> tuple[floating, NDArray[floating], NDArray[floating]]:
+    """Levenberg-Marquardt parameter of the trust region step of lmdif and lmder.
+
+    Parameters
+    ----------
+    r : NDArray[floating]
+        (n, n) column-major upper triangular matrix R of qrfac, whose strict lower
+        triangle is overwritten
+    ipvt : NDArray[int32]
+        (n,) permutation of qrfac
+    diag : NDArray[floating]
+        (n,) scaling factors of the variables
+    qtb : NDArray[floating]
+        (n,) first n elements of transpose(Q) * b
+    delta : floating
+        radius of the trust region
+    par : floating | None, optional
+        initial estimate of the parameter, by default 0
+
+    Returns
+    -------
+    tuple[floating, NDArray[floating], NDArray[floating]]
+        the parameter, the step x and the diagonal of S, see `qrsolv_`
+
+    """
+    n = int32(r.shape[1])
+    x = empty(n, dtype=r.dtype)
+    sdiag = empty(n, dtype=r.dtype)
+    wa1 = empty(n, dtype=r.dtype)
+    wa2 = empty(n, dtype=r.dtype)
+    # par as a scalar of r's dtype
+    _par = empty(1, dtype=r.dtype)
+    _par[0] = 0.0 if par is None else par
+    parptr = ptr_from_val(_par[0])
+    ldr = _leading_dimension(r)
+    return _lmpar(n, r, ldr, ipvt, diag, qtb, delta, parptr, x, sdiag, wa1, wa2)
+
+
+# -------------------------------------- dogleg -------------------------------------- #
+
+
+def _dogleg(n, r, lr, diag, qtb, delta, x, wa1, wa2):
+    raise NotImplementedError
+
+
+@extending.overload(_dogleg)
+def _dogleg_overload(n, r, lr, diag, qtb, delta, x, wa1, wa2):
+    _check_dtype((diag, qtb, x, wa1, wa2), r.dtype)
+    dogleg_external = Cminpack.dogleg(r.dtype)
+
+    def impl(n, r, lr, diag, qtb, delta, x, wa1, wa2):
+        dogleg_external(
+            n,
+            r.ctypes,
+            lr,
+            diag.ctypes,
+            qtb.ctypes,
+            delta,
+            x.ctypes,
+            wa1.ctypes,
+            wa2.ctypes,
+        )
+        return x
+
+    return impl
+
+
+@njit(cache=True)
+def dogleg_(
+    n: int32,
+    r: NDArray[floating],
+    lr: int32,
+    diag: NDArray[floating],
+    qtb: NDArray[floating],
+    delta: floating,
+    x: NDArray[floating],
+    wa1: NDArray[floating],
+    wa2: NDArray[floating],
+) -> NDArray[floating]:
+    """Dogleg step of the trust region step of hybrd and hybrj.
+
+    Parameters
+    ----------
+    n : int32
+        order of R
+    r : NDArray[floating]
+        (lr,) upper triangular matrix R packed by rows, as r of hybrd
+    lr : int32
+        length of r, at least n * (n + 1) / 2
+    diag : NDArray[floating]
+        (n,) scaling factors of the variables
+    qtb : NDArray[floating]
+        (n,) first n elements of transpose(Q) * b
+    delta : floating
+        radius of the trust region
+    x : NDArray[floating]
+        (n,) output step
+    wa1 : NDArray[floating]
+        work array of length n
+    wa2 : NDArray[floating]
+        work array of length n
+
+    Returns
+    -------
+    NDArray[floating]
+        x
+
+    """
+    return _dogleg(n, r, lr, diag, qtb, delta, x, wa1, wa2)
+
+
+@njit(cache=True)
+def dogleg(
+    r: NDArray[floating],
+    diag: NDArray[floating],
+    qtb: NDArray[floating],
+    delta: floating,
+) -> NDArray[floating]:
+    """Dogleg step of the trust region step of hybrd and hybrj.
+
+    Parameters
+    ----------
+    r : NDArray[floating]
+        (n * (n + 1) / 2,) upper triangular matrix R packed by rows, as r of hybrd
+    diag : NDArray[floating]
+        (n,) scaling factors of the variables
+    qtb : NDArray[floating]
+        (n,) first n elements of transpose(Q) * b
+    delta : floating
+        radius of the trust region
+
+    Returns
+    -------
+    NDArray[floating]
+        the step x
+
+    """
+    n = int32(diag.size)
+    x = empty(n, dtype=r.dtype)
+    wa1 = empty(n, dtype=r.dtype)
+    wa2 = empty(n, dtype=r.dtype)
+    return _dogleg(n, r, int32(r.size), diag, qtb, delta, x, wa1, wa2)
+
+
+# -------------------------------------- r1updt -------------------------------------- #
+
+
+def _r1updt(m, n, s, ls, u, v, w, sing):
+    raise NotImplementedError
+
+
+@extending.overload(_r1updt)
+def _r1updt_overload(m, n, s, ls, u, v, w, sing):
+    _check_dtype((u, v, w), s.dtype)
+    r1updt_external = Cminpack.r1updt(s.dtype)
+
+    def impl(m, n, s, ls, u, v, w, sing):
+        r1updt_external(m, n, s.ctypes, ls, u.ctypes, v.ctypes, w.ctypes, sing)
+        return s, v, w, bool(val_from_ptr(sing))
+
+    return impl
+
+
+@njit(cache=True)
+def r1updt_(
+    m: int32,
+    n: int32,
+    s: NDArray[floating],
+    ls: int32,
+    u: NDArray[floating],
+    v: NDArray[floating],
+    w: NDArray[floating],
+    sing: types.CPointer,
+) -> tuple[NDArray[floating], NDArray[floating], NDArray[floating], bool]:
+    """Update the lower trapezoidal S of S * Q = A to that of A + u * transpose(v).
+
+    Parameters
+    ----------
+    m : int32
+        number of rows of S
+    n : int32
+        number of columns of S, at most m
+    s : NDArray[floating]
+        (ls,) lower trapezoidal matrix S packed by columns, overwritten by the
+        updated matrix
+    ls : int32
+        length of s, at least n * (2 * m - n + 1) / 2
+    u : NDArray[floating]
+        (m,) vector u
+    v : NDArray[floating]
+        (n,) vector v, overwritten by the information on the rotations of Q
+    w : NDArray[floating]
+        (m,) output information on the rotations of Q
+    sing : types.CPointer
+        pointer to an int32, set to whether the updated S is singular
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[floating], NDArray[floating], bool]
+        s, v, w and whether the updated S is singular
+
+    """
+    return _r1updt(m, n, s, ls, u, v, w, sing)
+
+
+@njit(cache=True)
+def r1updt(
+    s: NDArray[floating],
+    u: NDArray[floating],
+    v: NDArray[floating],
+) -> tuple[NDArray[floating], NDArray[floating], NDArray[floating], bool]:
+    """Update the lower trapezoidal S of S * Q = A to that of A + u * transpose(v).
+
+    Parameters
+    ----------
+    s : NDArray[floating]
+        (n * (2 * m - n + 1) / 2,) lower trapezoidal matrix S packed by columns,
+        overwritten by the updated matrix
+    u : NDArray[floating]
+        (m,) vector u
+    v : NDArray[floating]
+        (n,) vector v, overwritten by the information on the rotations of Q
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[floating], NDArray[floating], bool]
+        s, v, w and whether the updated S is singular, see `r1updt_`
+
+    """
+    m = int32(u.size)
+    n = int32(v.size)
+    w = empty(m, dtype=s.dtype)
+    sing = ptr_from_val(int32(0))
+    return _r1updt(m, n, s, int32(s.size), u, v, w, sing)
+
+
+# -------------------------------------- r1mpyq -------------------------------------- #
+
+
+def _r1mpyq(m, n, a, lda, v, w):
+    raise NotImplementedError
+
+
+@extending.overload(_r1mpyq)
+def _r1mpyq_overload(m, n, a, lda, v, w):
+    _check_dtype((v, w), a.dtype)
+    r1mpyq_external = Cminpack.r1mpyq(a.dtype)
+
+    def impl(m, n, a, lda, v, w):
+        r1mpyq_external(m, n, a.ctypes, lda, v.ctypes, w.ctypes)
+        return a
+
+    return impl
+
+
+@njit(cache=True)
+def r1mpyq_(
+    m: int32,
+    n: int32,
+    a: NDArray[floating],
+    lda: int32,
+    v: NDArray[floating],
+    w: NDArray[floating],
+) -> NDArray[floating]:
+    """Multiply the m by n matrix a by the orthogonal matrix Q of `r1updt_`.
+
+    Parameters
+    ----------
+    m : int32
+        number of rows of a
+    n : int32
+        number of columns of a
+    a : NDArray[floating]
+        lda * n column-major matrix, overwritten by a * Q
+    lda : int32
+        leading dimension of a, at least m
+    v : NDArray[floating]
+        (n,) v of r1updt
+    w : NDArray[floating]
+        (n,) w of r1updt
+
+    Returns
+    -------
+    NDArray[floating]
+        a
+
+    """
+    return _r1mpyq(m, n, a, lda, v, w)
+
+
+@njit(cache=True)
+def r1mpyq(
+    a: NDArray[floating],
+    v: NDArray[floating],
+    w: NDArray[floating],
+) -> NDArray[floating]:
+    """Multiply the column-major matrix a by the orthogonal matrix Q of `r1updt`.
+
+    Parameters
+    ----------
+    a : NDArray[floating]
+        (m, n) column-major matrix, overwritten by a * Q
+    v : NDArray[floating]
+        (n,) v of r1updt
+    w : NDArray[floating]
+        (n,) w of r1updt
+
+    Returns
+    -------
+    NDArray[floating]
+        a
+
+    """
+    m = int32(a.shape[0])
+    n = int32(a.shape[1])
+    return _r1mpyq(m, n, a, _leading_dimension(a), v, w)
+
+
+# -------------------------------------- rwupdt -------------------------------------- #
+
+
+def _rwupdt(n, r, ldr, w, b, alpha, cos, sin):
+    raise NotImplementedError
+
+
+@extending.overload(_rwupdt)
+def _rwupdt_overload(n, r, ldr, w, b, alpha, cos, sin):
+    _check_dtype((w, b, cos, sin), r.dtype)
+    rwupdt_external = Cminpack.rwupdt(r.dtype)
+
+    def impl(n, r, ldr, w, b, alpha, cos, sin):
+        rwupdt_external(
+            n,
+            r.ctypes,
+            ldr,
+            w.ctypes,
+            b.ctypes,
+            alpha,
+            cos.ctypes,
+            sin.ctypes,
+        )
+        return r, b, val_from_ptr(alpha), cos, sin
+
+    return impl
+
+
+@njit(cache=True)
+def rwupdt_(
+    n: int32,
+    r: NDArray[floating],
+    ldr: int32,
+    w: NDArray[floating],
+    b: NDArray[floating],
+    alpha: types.CPointer,
+    cos: NDArray[floating],
+    sin: NDArray[floating],
+) -> tuple[
+    NDArray[floating],
+    NDArray[floating],
+    floating,
+    NDArray[floating],
+    NDArray[floating],
+]:
+    """Update the upper triangular R of the QR factorization when a row is added.
+
+    Used by lmstr to factorize the jacobian one row at a time.
+
+    Parameters
+    ----------
+    n : int32
+        order of r
+    r : NDArray[floating]
+        ldr * n column-major upper triangular matrix R, overwritten by the updated
+        matrix
+    ldr : int32
+        leading dimension of r, at least n
+    w : NDArray[floating]
+        (n,) row added to the factorized matrix
+    b : NDArray[floating]
+        (n,) vector b, overwritten by transpose(Q) * b
+    alpha : types.CPointer
+        pointer to the element of the right hand side of the added row, overwritten
+        by its update
+    cos : NDArray[floating]
+        (n,) output cosines of the Givens rotations
+    sin : NDArray[floating]
+        (n,) output sines of the Givens rotations
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[floating], floating, NDArray[floating],
+    NDArray[floating]]
+        r, b, alpha, cos and sin
+
+    """
+    return _rwupdt(n, r, ldr, w, b, alpha, cos, sin)
+
+
+@njit(cache=True)
+def rwupdt(
+    r: NDArray[floating],
+    w: NDArray[floating],
+    b: NDArray[floating],
+    alpha: floating,
+) -> tuple[
+    NDArray[floating],
+    NDArray[floating],
+    floating,
+    NDArray[floating],
+    NDArray[floating],
+]:
+    """Update the upper triangular R of the QR factorization when a row is added.
+
+    Parameters
+    ----------
+    r : NDArray[floating]
+        (n, n) column-major upper triangular matrix R, overwritten by the updated
+        matrix
+    w : NDArray[floating]
+        (n,) row added to the factorized matrix
+    b : NDArray[floating]
+        (n,) vector b, overwritten by transpose(Q) * b
+    alpha : floating
+        element of the right hand side of the added row
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[floating], floating, NDArray[floating],
+    NDArray[floating]]
+        r, b, the updated alpha and the cosines and sines of the Givens rotations
+
+    """
+    n = int32(r.shape[1])
+    cos = empty(n, dtype=r.dtype)
+    sin = empty(n, dtype=r.dtype)
+    _alpha = empty(1, dtype=r.dtype)
+    _alpha[0] = alpha
+    alphaptr = ptr_from_val(_alpha[0])
+    return _rwupdt(n, r, _leading_dimension(r), w, b, alphaptr, cos, sin)
@@ -4,9 +4,17 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from numba import extending, njit, types
-from numpy import empty, floating, int32, ones
-
+from numba import extending, types
+from numpy import empty, floating, int32
+
+from ._caching import njit
+from ._covar import _covariance
+from ._profile import _start, _stop
+from ._result import LmderResult, _output
+from ._trace import _trace, _wrap
+from ._trampoline import _udata_context, trampoline
+from ._workspace import _lm_buffers
+from .bounds import _to_external, ext2in
 from .cminpack_ import Cminpack
 from .utils import _check_dtype, ptr_from_val, ptr_int32, val_from_ptr
 
@@ -14,6 +22,9 @@ if TYPE_CHECKING:
     from numpy import int64
     from numpy.typing import NDArray
 
+    from ._profile import Profile
+    from ._workspace import Workspace
+
 # -------------------------------------- lmder1 -------------------------------------- #
 
 
@@ -37,6 +48,40 @@ def _lmder1_overload(
     udata,
 ):
     _check_dtype((fvec, fjac, wa), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("lmder", fcn, x.dtype, udata)
+
+        def dispatcher_impl(
+            fcn,
+            m,
+            n,
+            x,
+            fvec,
+            fjac,
+            ldfjac,
+            tol,
+            ipvt,
+            wa,
+            lwa,
+            udata,
+        ):
+            return _lmder1(
+                address(),
+                m,
+                n,
+                x,
+                fvec,
+                fjac,
+                ldfjac,
+                tol,
+                ipvt,
+                wa,
+                lwa,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
     lmder1_external = Cminpack.lmder1(x.dtype)
 
     @extending.register_jitable
@@ -90,7 +135,7 @@ def _lmder1_overload(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmder1_(
     fcn: int64,
     m: int32,
@@ -150,7 +195,7 @@ def lmder1_(
     return _lmder1(fcn, m, n, x, fvec, fjac, ldfjac, tol, ipvt, wa, lwa, udata)
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmder1(
     fcn: int64,
     m: int32,
@@ -269,6 +314,64 @@ def _lmder_overload(
     udata,
 ):
     _check_dtype((fvec, fjac, qtf, wa1, wa2, wa3, wa4), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("lmder", fcn, x.dtype, udata)
+
+        def dispatcher_impl(
+            fcn,
+            m,
+            n,
+            x,
+            fvec,
+            fjac,
+            ldfjac,
+            ftol,
+            xtol,
+            gtol,
+            maxfev,
+            diag,
+            mode,
+            factor,
+            nprint,
+            nfev,
+            njev,
+            ipvt,
+            qtf,
+            wa1,
+            wa2,
+            wa3,
+            wa4,
+            udata,
+        ):
+            return _lmder(
+                address(),
+                m,
+                n,
+                x,
+                fvec,
+                fjac,
+                ldfjac,
+                ftol,
+                xtol,
+                gtol,
+                maxfev,
+                diag,
+                mode,
+                factor,
+                nprint,
+                nfev,
+                njev,
+                ipvt,
+                qtf,
+                wa1,
+                wa2,
+                wa3,
+                wa4,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
     lmder_external = Cminpack.lmder(x.dtype)
 
     @extending.register_jitable
@@ -435,7 +538,7 @@ def _lmder_overload(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmder_(
     fcn: int64,
     m: int32,
@@ -560,7 +663,7 @@ def lmder_(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmder(
     fcn: int64,
     m: int32,
@@ -574,16 +677,12 @@ def lmder(
     factor: floating | None = None,
     nprint: int32 | None = None,
     udata: NDArray | None = None,
-) -> tuple[
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[int32],
-    NDArray[floating],
-    int,
-    int,
-    int,
-]:
+    workspace: Workspace | None = None,
+    full_output: bool | None = None,
+    covariance: NDArray[floating] | None = None,
+    trace: NDArray[floating] | None = None,
+    profile: Profile | None = None,
+) -> LmderResult:
     # TODO(nin17): docstring
     """.
 
@@ -613,23 +712,37 @@ def lmder(
         _description_, by default None
     udata : NDArray | None, optional
         _description_, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    full_output : bool | None, optional
+        if False, fjac and qtf are empty in the result, which then does not keep
+        the solver's buffers alive, by default True
+    covariance : NDArray[floating] | None, optional
+        n by n array filled with the covariance matrix of the solution, see
+        [covar1][cminpack_numba.covar1], by default None
+    trace : NDArray[floating] | None, optional
+        (k, 3) C contiguous array whose rows are set to ||fvec||, the norm of the step
+        from the previous row and the number of calls to fcn with iflag != 0 at the
+        start of the 1st, (nprint + 1)-th, (2 * nprint + 1)-th... iterations and at
+        termination, and to nan after that. cminpack does not expose the
+        levenberg-marquardt parameter lambda, which only the trace of
+        [lmder][cminpack_numba.pure.lmder] of the pure engine records, by default
+        None
+    profile : Profile | None, optional
+        profile to add the calls to fcn and the time spent in the solve to, by
+        default None
 
     Returns
     -------
-    tuple[ NDArray[floating], NDArray[floating], NDArray[floating], NDArray[int32],
-           NDArray[floating], int, int, int]
-        _description_
+    LmderResult
+        x, fvec, fjac, ipvt, qtf, nfev, njev and info
 
     """
     n = int32(x.size)
-    fvec = empty(m, dtype=x.dtype)
-    fjac = empty((m, n), dtype=x.dtype)
+    x, fvec, fjac, ipvt, qtf, wa, diag = _lm_buffers(workspace, m, n, x, diag)
     ldfjac = m
     nfevptr = ptr_from_val(int32(0))
     njevptr = ptr_from_val(int32(0))
-    ipvt = empty(n, dtype=int32)
-    qtf = empty(n, dtype=x.dtype)
-    wa = empty(3 * n + m, dtype=x.dtype)
     wa1 = wa[:n]
     wa2 = wa[n : 2 * n]
     wa3 = wa[2 * n : 3 * n]
@@ -641,14 +754,15 @@ def lmder(
     mode = mode or 1
     factor = factor or 100.0
     nprint = nprint or 0
-    diag = ones(n, dtype=x.dtype) if diag is None else diag
+    fcn, udata, nprint = _trace("lmder", fcn, x, nprint, udata, trace, profile)
+    start = _start(profile)
     maxfev = maxfev or 200 * (n + 1)
 
-    return _lmder(
+    x, fvec, fjac, ipvt, qtf, nfev, njev, info = _lmder(
         fcn,
         m,
         n,
-        x.copy(),
+        x,
         fvec,
         fjac,
         ldfjac,
@@ -670,3 +784,170 @@ def lmder(
         wa4,
         udata,
     )
+    _stop(profile, start)
+    _covariance(fvec, fjac, ipvt, covariance)
+    return LmderResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        ipvt,
+        _output(qtf, full_output),
+        nfev,
+        njev,
+        info,
+    )
+
+# ----------------------------------- lmder_bounded ---------------------------------- #
+
+
+@njit(cache=True, nogil=True)
+def lmder_bounded(
+    fcn: int64,
+    m: int32,
+    x: NDArray[floating],
+    lower: NDArray[floating],
+    upper: NDArray[floating],
+    ftol: floating | None = None,
+    xtol: floating | None = None,
+    gtol: floating | None = None,
+    maxfev: int32 | None = None,
+    diag: NDArray[floating] | None = None,
+    mode: int32 | None = None,
+    factor: floating | None = None,
+    nprint: int32 | None = None,
+    udata: NDArray | None = None,
+    workspace: Workspace | None = None,
+    full_output: bool | None = None,
+    covariance: NDArray[floating] | None = None,
+    trace: NDArray[floating] | None = None,
+    profile: Profile | None = None,
+) -> LmderResult:
+    """[lmder][cminpack_numba.lmder] with bounds on the parameters.
+
+    The solver works with the unbounded internal parameters of
+    [bounds][cminpack_numba.src.bounds], and fcn is called with the external ones,
+    which are always within the bounds. The jacobian computed by fcn, with respect
+    to the external parameters, is scaled in place to that with respect to the
+    internal ones.
+
+    Parameters
+    ----------
+    fcn : int64
+        as for lmder, called with the external parameters
+    m : int32
+        number of functions
+    x : NDArray[floating]
+        initial estimate of the solution, within the bounds
+    lower : NDArray[floating]
+        lower bounds of the parameters, -inf if missing
+    upper : NDArray[floating]
+        upper bounds of the parameters, inf if missing
+    ftol : floating | None, optional
+        as for lmder, by default None
+    xtol : floating | None, optional
+        as for lmder, relative to the internal parameters, by default None
+    gtol : floating | None, optional
+        as for lmder, by default None
+    maxfev : int32 | None, optional
+        as for lmder, by default None
+    diag : NDArray[floating] | None, optional
+        as for lmder, scaling the internal parameters, by default None
+    mode : int32 | None, optional
+        as for lmder, by default None
+    factor : floating | None, optional
+        as for lmder, by default None
+    nprint : int32 | None, optional
+        as for lmder, by default None
+    udata : NDArray | None, optional
+        as for lmder, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    full_output : bool | None, optional
+        as for lmder, by default True
+    covariance : NDArray[floating] | None, optional
+        n by n array filled with the covariance matrix of the external parameters,
+        by default None
+    trace : NDArray[floating] | None, optional
+        as for lmder, the steps being those of the external parameters, by default
+        None
+    profile : Profile | None, optional
+        as for lmder, by default None
+
+    Returns
+    -------
+    LmderResult
+        as for lmder, with x the external parameters and fjac holding the R of the
+        jacobian with respect to them
+
+    """
+    n = int32(x.size)
+    x, fvec, fjac, ipvt, qtf, wa, diag = _lm_buffers(workspace, m, n, x, diag)
+    ldfjac = m
+    nfevptr = ptr_from_val(int32(0))
+    njevptr = ptr_from_val(int32(0))
+    wa1 = wa[:n]
+    wa2 = wa[n : 2 * n]
+    wa3 = wa[2 * n : 3 * n]
+    wa4 = wa[3 * n :]
+
+    ftol = ftol or 1.49012e-8
+    xtol = xtol or 1.49012e-8
+    gtol = gtol or 0.0
+    mode = mode or 1
+    factor = factor or 100.0
+    nprint = nprint or 0
+    fcn, udata, nprint = _wrap(
+        "lmder",
+        fcn,
+        x,
+        nprint,
+        udata,
+        trace,
+        profile,
+        lower,
+        upper,
+    )
+    ext2in(x, lower, upper, x)
+    start = _start(profile)
+    maxfev = maxfev or 200 * (n + 1)
+
+    x, fvec, fjac, ipvt, qtf, nfev, njev, info = _lmder(
+        fcn,
+        m,
+        n,
+        x,
+        fvec,
+        fjac,
+        ldfjac,
+        ftol,
+        xtol,
+        gtol,
+        maxfev,
+        diag,
+        mode,
+        factor,
+        nprint,
+        nfevptr,
+        njevptr,
+        ipvt,
+        qtf,
+        wa1,
+        wa2,
+        wa3,
+        wa4,
+        udata,
+    )
+    _stop(profile, start)
+    _to_external(x, fjac, ipvt, lower, upper, wa1)
+    _covariance(fvec, fjac, ipvt, covariance)
+    return LmderResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        ipvt,
+        _output(qtf, full_output),
+        nfev,
+        njev,
+        info,
+    )
+
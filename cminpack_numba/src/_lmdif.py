@@ -4,16 +4,27 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from numba import extending, njit, types
+from numba import extending, prange, types
 from numpy import empty, finfo, floating, int32, ones
 
+from ._caching import njit
+from ._covar import _covariance
+from ._profile import _start, _stop
+from ._result import LmdifResult, _output
+from ._trace import _trace, _wrap
+from ._trampoline import _udata_context, trampoline
+from ._workspace import _lm_buffers
+from .bounds import _to_external, ext2in
 from .cminpack_ import Cminpack
-from .utils import _check_dtype, ptr_from_val, ptr_int32, val_from_ptr
+from .utils import _NCHUNKS, _check_dtype, _row, ptr_from_val, ptr_int32, val_from_ptr
 
 if TYPE_CHECKING:
     from numpy import int64
     from numpy.typing import NDArray
 
+    from ._profile import Profile
+    from ._workspace import Workspace
+
 # -------------------------------------- lmdif1 -------------------------------------- #
 
 
@@ -24,6 +35,25 @@ def _lmdif1(fcn, m, n, x, fvec, tol, iwa, wa, lwa, udata):
 @extending.overload(_lmdif1)
 def _lmdif1_overload(fcn, m, n, x, fvec, tol, iwa, wa, lwa, udata):
     _check_dtype((fvec, wa), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("lmdif", fcn, x.dtype, udata)
+
+        def dispatcher_impl(fcn, m, n, x, fvec, tol, iwa, wa, lwa, udata):
+            return _lmdif1(
+                address(),
+                m,
+                n,
+                x,
+                fvec,
+                tol,
+                iwa,
+                wa,
+                lwa,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
     lmdif1_external = Cminpack.lmdif1(x.dtype)
 
     @extending.register_jitable
@@ -72,7 +102,7 @@ def _lmdif1_overload(fcn, m, n, x, fvec, tol, iwa, wa, lwa, udata):
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmdif1_(
     fcn: int64,
     m: int32,
@@ -120,7 +150,7 @@ def lmdif1_(
     return _lmdif1(fcn, m, n, x, fvec, tol, iwa, wa, lwa, udata)
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmdif1(
     fcn: int64,
     m: int32,
@@ -219,6 +249,64 @@ def _lmdif_overload(
     udata,
 ):
     _check_dtype((fvec, fjac, qtf, wa1, wa2, wa3, wa4), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("lmdif", fcn, x.dtype, udata)
+
+        def dispatcher_impl(
+            fcn,
+            m,
+            n,
+            x,
+            fvec,
+            ftol,
+            xtol,
+            gtol,
+            maxfev,
+            epsfcn,
+            diag,
+            mode,
+            factor,
+            nprint,
+            nfev,
+            fjac,
+            ldfjac,
+            ipvt,
+            qtf,
+            wa1,
+            wa2,
+            wa3,
+            wa4,
+            udata,
+        ):
+            return _lmdif(
+                address(),
+                m,
+                n,
+                x,
+                fvec,
+                ftol,
+                xtol,
+                gtol,
+                maxfev,
+                epsfcn,
+                diag,
+                mode,
+                factor,
+                nprint,
+                nfev,
+                fjac,
+                ldfjac,
+                ipvt,
+                qtf,
+                wa1,
+                wa2,
+                wa3,
+                wa4,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
     lmdif_external = Cminpack.lmdif(x.dtype)
 
     @extending.register_jitable
@@ -385,7 +473,7 @@ def _lmdif_overload(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmdif_(
     fcn: int64,
     m: int32,
@@ -509,7 +597,7 @@ def lmdif_(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmdif(
     fcn: int64,
     m: int32,
@@ -524,15 +612,12 @@ def lmdif(
     factor: floating | None = None,
     nprint: int32 | None = None,
     udata: NDArray | None = None,
-) -> tuple[
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[int32],
-    NDArray[floating],
-    int,
-    int,
-]:
+    workspace: Workspace | None = None,
+    full_output: bool | None = None,
+    covariance: NDArray[floating] | None = None,
+    trace: NDArray[floating] | None = None,
+    profile: Profile | None = None,
+) -> LmdifResult:
     # TODO(nin17): docstring
     """.
 
@@ -564,22 +649,177 @@ def lmdif(
         _description_, by default None
     udata : NDArray | None, optional
         _description_, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    full_output : bool | None, optional
+        if False, fjac and qtf are empty in the result, which then does not keep
+        the solver's buffers alive, by default True
+    covariance : NDArray[floating] | None, optional
+        n by n array filled with the covariance matrix of the solution, see
+        [covar1][cminpack_numba.covar1], by default None
+    trace : NDArray[floating] | None, optional
+        (k, 3) C contiguous array whose rows are set to ||fvec||, the norm of the step
+        from the previous row and the number of calls to fcn with iflag != 0 at the
+        start of the 1st, (nprint + 1)-th, (2 * nprint + 1)-th... iterations and at
+        termination, and to nan after that. cminpack does not expose the
+        levenberg-marquardt parameter lambda, which only the trace of
+        [lmdif][cminpack_numba.pure.lmdif] of the pure engine records, by default
+        None
+    profile : Profile | None, optional
+        profile to add the calls to fcn and the time spent in the solve to, by
+        default None
 
     Returns
     -------
-    tuple[ NDArray[floating], NDArray[floating], NDArray[floating], NDArray[int32],
-           NDArray[floating], int, int]
-        _description_
+    LmdifResult
+        x, fvec, fjac, ipvt, qtf, nfev and info
 
     """
     n = int32(x.size)
-    fvec = empty(m, dtype=x.dtype)
-    fjac = empty((m, n), dtype=x.dtype)
+    x, fvec, fjac, ipvt, qtf, wa, diag = _lm_buffers(workspace, m, n, x, diag)
+    ldfjac = m
     nfevptr = ptr_from_val(int32(0))
+    wa1 = wa[:n]
+    wa2 = wa[n : 2 * n]
+    wa3 = wa[2 * n : 3 * n]
+    wa4 = wa[3 * n :]
+    ftol = ftol or 1.49012e-8
+    xtol = xtol or 1.49012e-8
+    gtol = gtol or 0.0
+    mode = mode or 1
+    factor = factor or 100.0
+    nprint = nprint or 0
+    epsfcn = epsfcn or finfo(x.dtype).eps
+    maxfev = maxfev or 200 * (n + 1)
+    fcn, udata, nprint = _trace("lmdif", fcn, x, nprint, udata, trace, profile)
+    start = _start(profile)
+    x, fvec, fjac, ipvt, qtf, nfev, info = _lmdif(
+        fcn,
+        m,
+        n,
+        x,
+        fvec,
+        ftol,
+        xtol,
+        gtol,
+        maxfev,
+        epsfcn,
+        diag,
+        mode,
+        factor,
+        nprint,
+        nfevptr,
+        fjac,
+        ldfjac,
+        ipvt,
+        qtf,
+        wa1,
+        wa2,
+        wa3,
+        wa4,
+        udata,
+    )
+    _stop(profile, start)
+    _covariance(fvec, fjac, ipvt, covariance)
+    return LmdifResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        ipvt,
+        _output(qtf, full_output),
+        nfev,
+        info,
+    )
+
+
+# ----------------------------------- lmdif_bounded ---------------------------------- #
+
+
+@njit(cache=True, nogil=True)
+def lmdif_bounded(
+    fcn: int64,
+    m: int32,
+    x: NDArray[floating],
+    lower: NDArray[floating],
+    upper: NDArray[floating],
+    ftol: floating | None = None,
+    xtol: floating | None = None,
+    gtol: floating | None = None,
+    maxfev: int32 | None = None,
+    epsfcn: floating | None = None,
+    diag: NDArray[floating] | None = None,
+    mode: int32 | None = None,
+    factor: floating | None = None,
+    nprint: int32 | None = None,
+    udata: NDArray | None = None,
+    workspace: Workspace | None = None,
+    full_output: bool | None = None,
+    covariance: NDArray[floating] | None = None,
+    trace: NDArray[floating] | None = None,
+    profile: Profile | None = None,
+) -> LmdifResult:
+    """[lmdif][cminpack_numba.lmdif] with bounds on the parameters.
+
+    The solver works with the unbounded internal parameters of
+    [bounds][cminpack_numba.src.bounds], and fcn is called with the external ones,
+    which are always within the bounds.
+
+    Parameters
+    ----------
+    fcn : int64
+        as for lmdif, called with the external parameters
+    m : int32
+        number of functions
+    x : NDArray[floating]
+        initial estimate of the solution, within the bounds
+    lower : NDArray[floating]
+        lower bounds of the parameters, -inf if missing
+    upper : NDArray[floating]
+        upper bounds of the parameters, inf if missing
+    ftol : floating | None, optional
+        as for lmdif, by default None
+    xtol : floating | None, optional
+        as for lmdif, relative to the internal parameters, by default None
+    gtol : floating | None, optional
+        as for lmdif, by default None
+    maxfev : int32 | None, optional
+        as for lmdif, by default None
+    epsfcn : floating | None, optional
+        as for lmdif, by default None
+    diag : NDArray[floating] | None, optional
+        as for lmdif, scaling the internal parameters, by default None
+    mode : int32 | None, optional
+        as for lmdif, by default None
+    factor : floating | None, optional
+        as for lmdif, by default None
+    nprint : int32 | None, optional
+        as for lmdif, by default None
+    udata : NDArray | None, optional
+        as for lmdif, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    full_output : bool | None, optional
+        as for lmdif, by default True
+    covariance : NDArray[floating] | None, optional
+        n by n array filled with the covariance matrix of the external parameters,
+        by default None
+    trace : NDArray[floating] | None, optional
+        as for lmdif, the steps being those of the external parameters, by default
+        None
+    profile : Profile | None, optional
+        as for lmdif, by default None
+
+    Returns
+    -------
+    LmdifResult
+        as for lmdif, with x the external parameters and fjac holding the R of the
+        jacobian with respect to them
+
+    """
+    n = int32(x.size)
+    x, fvec, fjac, ipvt, qtf, wa, diag = _lm_buffers(workspace, m, n, x, diag)
     ldfjac = m
-    ipvt = empty(n, dtype=int32)
-    qtf = empty(n, dtype=x.dtype)
-    wa = empty(3 * n + m, dtype=x.dtype)
+    nfevptr = ptr_from_val(int32(0))
     wa1 = wa[:n]
     wa2 = wa[n : 2 * n]
     wa3 = wa[2 * n : 3 * n]
@@ -590,14 +830,26 @@ def lmdif(
     mode = mode or 1
     factor = factor or 100.0
     nprint = nprint or 0
-    diag = ones(n, dtype=x.dtype) if diag is None else diag
     epsfcn = epsfcn or finfo(x.dtype).eps
     maxfev = maxfev or 200 * (n + 1)
-    return _lmdif(
+    fcn, udata, nprint = _wrap(
+        "lmdif",
+        fcn,
+        x,
+        nprint,
+        udata,
+        trace,
+        profile,
+        lower,
+        upper,
+    )
+    ext2in(x, lower, upper, x)
+    start = _start(profile)
+    x, fvec, fjac, ipvt, qtf, nfev, info = _lmdif(
         fcn,
         m,
         n,
-        x.copy(),
+        x,
         fvec,
         ftol,
         xtol,
@@ -619,3 +871,140 @@ def lmdif(
         wa4,
         udata,
     )
+    _stop(profile, start)
+    _to_external(x, fjac, ipvt, lower, upper, wa1)
+    _covariance(fvec, fjac, ipvt, covariance)
+    return LmdifResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        ipvt,
+        _output(qtf, full_output),
+        nfev,
+        info,
+    )
+
+
+# ------------------------------------ lmdif_batch ----------------------------------- #
+
+
+@njit(parallel=True, cache=True, nogil=True)
+def lmdif_batch(
+    fcn: int64,
+    m: int32,
+    x: NDArray[floating],
+    ftol: floating | None = None,
+    xtol: floating | None = None,
+    gtol: floating | None = None,
+    maxfev: int32 | None = None,
+    epsfcn: floating | None = None,
+    diag: NDArray[floating] | None = None,
+    mode: int32 | None = None,
+    factor: floating | None = None,
+    nprint: int32 | None = None,
+    udata: NDArray | None = None,
+    covariance: NDArray[floating] | None = None,
+) -> tuple[NDArray[floating], NDArray[floating], NDArray[int32], NDArray[int32]]:
+    """Solve k independent least squares problems in parallel with `lmdif`.
+
+    The problems are split into chunks run in parallel, and each chunk allocates
+    its workspace once and reuses it for every problem in the chunk.
+
+    Parameters
+    ----------
+    fcn : int64 | Dispatcher
+        address of the cfunc, or njit function, computing the residuals, shared by
+        all the problems
+    m : int32
+        number of residuals of each problem
+    x : NDArray[floating]
+        (k, n) array of starting points
+    ftol : floating | None, optional
+        see [lmdif][cminpack_numba.lmdif], by default None
+    xtol : floating | None, optional
+        see [lmdif][cminpack_numba.lmdif], by default None
+    gtol : floating | None, optional
+        see [lmdif][cminpack_numba.lmdif], by default None
+    maxfev : int32 | None, optional
+        see [lmdif][cminpack_numba.lmdif], by default None
+    epsfcn : floating | None, optional
+        see [lmdif][cminpack_numba.lmdif], by default None
+    diag : NDArray[floating] | None, optional
+        (k, n) array of scaling factors, by default None
+    mode : int32 | None, optional
+        see [lmdif][cminpack_numba.lmdif], by default None
+    factor : floating | None, optional
+        see [lmdif][cminpack_numba.lmdif], by default None
+    nprint : int32 | None, optional
+        see [lmdif][cminpack_numba.lmdif], by default None
+    udata : NDArray | None, optional
+        array whose i-th row is passed as udata to the i-th problem, by default None
+    covariance : NDArray[floating] | None, optional
+        (k, n, n) array whose i-th matrix is filled with the covariance matrix of the
+        solution of the i-th problem, see [covar1][cminpack_numba.covar1], by default
+        None
+
+    Returns
+    -------
+    tuple[NDArray[floating], NDArray[floating], NDArray[int32], NDArray[int32]]
+        (k, n) solutions, (k, m) residuals, number of function evaluations and info
+        of each problem
+
+    """
+    k, n = x.shape
+    n = int32(n)
+    # `a or b` on optional floats miscompiles the prange loop below
+    ftol = 1.49012e-8 if ftol is None else ftol
+    xtol = 1.49012e-8 if xtol is None else xtol
+    gtol = 0.0 if gtol is None else gtol
+    mode = 1 if mode is None else mode
+    factor = 100.0 if factor is None else factor
+    nprint = 0 if nprint is None else nprint
+    epsfcn = finfo(x.dtype).eps if epsfcn is None else epsfcn
+    maxfev = 200 * (n + 1) if maxfev is None else maxfev
+
+    xs = x.copy()
+    fvecs = empty((k, m), dtype=x.dtype)
+    diags = ones((k, n), dtype=x.dtype) if diag is None else diag.copy()
+    nfevs = empty(k, dtype=int32)
+    infos = empty(k, dtype=int32)
+
+    nchunks = min(k, _NCHUNKS)
+    for c in prange(nchunks):
+        fjac = empty((m, n), dtype=x.dtype)
+        ipvt = empty(n, dtype=int32)
+        qtf = empty(n, dtype=x.dtype)
+        wa = empty(3 * n + m, dtype=x.dtype)
+        for i in range(c * k // nchunks, (c + 1) * k // nchunks):
+            nfevptr = ptr_from_val(int32(0))
+            info = _lmdif(
+                fcn,
+                m,
+                n,
+                xs[i],
+                fvecs[i],
+                ftol,
+                xtol,
+                gtol,
+                maxfev,
+                epsfcn,
+                diags[i],
+                mode,
+                factor,
+                nprint,
+                nfevptr,
+                fjac,
+                m,
+                ipvt,
+                qtf,
+                wa[:n],
+                wa[n : 2 * n],
+                wa[2 * n : 3 * n],
+                wa[3 * n :],
+                _row(udata, i),
+            )[-1]
+            nfevs[i] = val_from_ptr(nfevptr)
+            infos[i] = info
+            _covariance(fvecs[i], fjac, ipvt, _row(covariance, i))
+
+    return xs, fvecs, nfevs, infos
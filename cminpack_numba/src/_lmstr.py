@@ -4,9 +4,16 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from numba import extending, njit, types
-from numpy import empty, floating, int32, ones
-
+from numba import extending, types
+from numpy import empty, floating, int32
+
+from ._caching import njit
+from ._covar import _covariance
+from ._profile import _start, _stop
+from ._result import LmstrResult, _output
+from ._trace import _trace
+from ._trampoline import _udata_context, trampoline
+from ._workspace import _lm_buffers
 from .cminpack_ import Cminpack
 from .utils import _check_dtype, ptr_from_val, ptr_int32, val_from_ptr
 
@@ -14,6 +21,9 @@ if TYPE_CHECKING:
     from numpy import int64
     from numpy.typing import NDArray
 
+    from ._profile import Profile
+    from ._workspace import Workspace
+
 # -------------------------------------- lmstr1 -------------------------------------- #
 
 
@@ -24,6 +34,40 @@ def _lmstr1(fcn, m, n, x, fvec, fjac, ldfjac, tol, ipvt, wa, lwa, udata):
 @extending.overload(_lmstr1)
 def _lmstr1_overload(fcn, m, n, x, fvec, fjac, ldfjac, tol, ipvt, wa, lwa, udata):
     _check_dtype((fvec, fjac, wa), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("lmstr", fcn, x.dtype, udata)
+
+        def dispatcher_impl(
+            fcn,
+            m,
+            n,
+            x,
+            fvec,
+            fjac,
+            ldfjac,
+            tol,
+            ipvt,
+            wa,
+            lwa,
+            udata,
+        ):
+            return _lmstr1(
+                address(),
+                m,
+                n,
+                x,
+                fvec,
+                fjac,
+                ldfjac,
+                tol,
+                ipvt,
+                wa,
+                lwa,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
     lmstr1_external = Cminpack.lmstr1(x.dtype)
 
     @extending.register_jitable
@@ -79,7 +123,7 @@ def _lmstr1_overload(fcn, m, n, x, fvec, fjac, ldfjac, tol, ipvt, wa, lwa, udata
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmstr1_(
     fcn: int64,
     m: int32,
@@ -139,7 +183,7 @@ def lmstr1_(
     return _lmstr1(fcn, m, n, x, fvec, fjac, ldfjac, tol, ipvt, wa, lwa, udata)
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmstr1(
     fcn: int64,
     m: int32,
@@ -249,6 +293,64 @@ def _lmstr_overload(
     udata,
 ):
     _check_dtype((fvec, fjac, qtf, wa1, wa2, wa3, wa4), x.dtype)
+    if isinstance(fcn, types.Dispatcher):
+        address = trampoline("lmstr", fcn, x.dtype, udata)
+
+        def dispatcher_impl(
+            fcn,
+            m,
+            n,
+            x,
+            fvec,
+            fjac,
+            ldfjac,
+            ftol,
+            xtol,
+            gtol,
+            maxfev,
+            diag,
+            mode,
+            factor,
+            nprint,
+            nfev,
+            njev,
+            ipvt,
+            qtf,
+            wa1,
+            wa2,
+            wa3,
+            wa4,
+            udata,
+        ):
+            return _lmstr(
+                address(),
+                m,
+                n,
+                x,
+                fvec,
+                fjac,
+                ldfjac,
+                ftol,
+                xtol,
+                gtol,
+                maxfev,
+                diag,
+                mode,
+                factor,
+                nprint,
+                nfev,
+                njev,
+                ipvt,
+                qtf,
+                wa1,
+                wa2,
+                wa3,
+                wa4,
+                _udata_context(udata),
+            )
+
+        return dispatcher_impl
+
     lmstr_external = Cminpack.lmstr(x.dtype)
 
     @extending.register_jitable
@@ -417,7 +519,7 @@ def _lmstr_overload(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmstr_(
     fcn: int64,
     m: int32,
@@ -542,7 +644,7 @@ def lmstr_(
     )
 
 
-@njit
+@njit(cache=True, nogil=True)
 def lmstr(
     fcn: int64,
     m: int32,
@@ -556,16 +658,12 @@ def lmstr(
     factor: floating | None = None,
     nprint: int32 | None = None,
     udata: NDArray | None = None,
-) -> tuple[
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[floating],
-    NDArray[int32],
-    NDArray[floating],
-    int,
-    int,
-    int,
-]:
+    workspace: Workspace | None = None,
+    full_output: bool | None = None,
+    covariance: NDArray[floating] | None = None,
+    trace: NDArray[floating] | None = None,
+    profile: Profile | None = None,
+) -> LmstrResult:
     # TODO(nin17): docstring
     """.
 
@@ -595,23 +693,34 @@ def lmstr(
         _description_, by default None
     udata : NDArray | None, optional
         _description_, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    full_output : bool | None, optional
+        if False, fjac and qtf are empty in the result, which then does not keep
+        the solver's buffers alive, by default True
+    covariance : NDArray[floating] | None, optional
+        n by n array filled with the covariance matrix of the solution, see
+        [covar1][cminpack_numba.covar1], by default None
+    trace : NDArray[floating] | None, optional
+        (k, 3) C contiguous array whose rows are set to ||fvec||, the norm of the step
+        from the previous row and the number of calls to fcn with iflag != 0 at the
+        start of the 1st, (nprint + 1)-th, (2 * nprint + 1)-th... iterations and at
+        termination, and to nan after that, by default None
+    profile : Profile | None, optional
+        profile to add the calls to fcn and the time spent in the solve to, by
+        default None
 
     Returns
     -------
-    tuple[ NDArray[floating], NDArray[floating], NDArray[floating], NDArray[int32],
-    NDArray[floating], int, int, int, ]
-        _description_
+    LmstrResult
+        x, fvec, fjac, ipvt, qtf, nfev, njev and info
 
     """
     n = int32(x.size)
-    fvec = empty(m, dtype=x.dtype)
-    fjac = empty((m, n), dtype=x.dtype)
+    x, fvec, fjac, ipvt, qtf, wa, diag = _lm_buffers(workspace, m, n, x, diag)
     ldfjac = m
     nfevptr = ptr_from_val(int32(0))
     njevptr = ptr_from_val(int32(0))
-    ipvt = empty(n, dtype=int32)
-    qtf = empty(n, dtype=x.dtype)
-    wa = empty(3 * n + m, dtype=x.dtype)
     wa1 = wa[:n]
     wa2 = wa[n : 2 * n]
     wa3 = wa[2 * n : 3 * n]
@@ -622,14 +731,15 @@ def lmstr(
     mode = mode or 1
     factor = factor or 100.0
     nprint = nprint or 0
-    diag = ones(n, dtype=x.dtype) if diag is None else diag
+    fcn, udata, nprint = _trace("lmstr", fcn, x, nprint, udata, trace, profile)
+    start = _start(profile)
     maxfev = maxfev or 200 * (n + 1)
 
-    return _lmstr(
+    x, fvec, fjac, ipvt, qtf, nfev, njev, info = _lmstr(
         fcn,
         m,
         n,
-        x.copy(),
+        x,
         fvec,
         fjac,
         ldfjac,
@@ -651,3 +761,15 @@ def lmstr(
         wa4,
         udata,
     )
+    _stop(profile, start)
+    _covariance(fvec, fjac, ipvt, covariance)
+    return LmstrResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        ipvt,
+        _output(qtf, full_output),
+        nfev,
+        njev,
+        info,
+    )
@@ -0,0 +1,264 @@
+"""Multi-start driver of `lmder`, for problems with many local minima."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from numba import prange
+from numpy import argsort, empty, full, inf, int32, int64, ones, random, zeros
+
+from ._caching import njit
+from ._enorm import _enorm
+from ._lmder import _lmder
+from ._result import MultistartResult
+from .utils import _NCHUNKS, ptr_from_val, val_from_ptr
+
+if TYPE_CHECKING:
+    from numpy import floating
+    from numpy.typing import NDArray
+
+__all__ = ["lmder_multistart", "random_starts"]
+
+
+@njit(cache=True)
+def random_starts(
+    lower: NDArray[floating],
+    upper: NDArray[floating],
+    nstarts: int,
+    seed: int | None = None,
+) -> NDArray[floating]:
+    """Starting points drawn uniformly from the box between lower and upper.
+
+    Parameters
+    ----------
+    lower : NDArray[floating]
+        lower bounds of the parameters, which must be finite
+    upper : NDArray[floating]
+        upper bounds of the parameters, which must be finite
+    nstarts : int
+        number of starting points
+    seed : int | None, optional
+        seed of the random number generator, by default None
+
+    Returns
+    -------
+    NDArray[floating]
+        (nstarts, n) array of starting points
+
+    """
+    if seed is not None:
+        random.seed(seed)
+    n = lower.size
+    starts = empty((nstarts, n), dtype=lower.dtype)
+    for i in range(nstarts):
+        for j in range(n):
+            starts[i, j] = random.uniform(lower[j], upper[j])
+    return starts
+
+
+@njit(cache=True)
+def _keep(
+    count,
+    xs,
+    fnorms,
+    nfevs,
+    njevs,
+    infos,
+    starts,
+    x,
+    fnorm,
+    nfev,
+    njev,
+    info,
+    start,
+):
+    """Insert a solution into the k best of a chunk, returning how many are kept.
+
+    The solutions are sorted by fnorm, those of equal fnorm by start, as the starts
+    of a chunk are run in order.
+    """
+    k = fnorms.size
+    if count == k and fnorm >= fnorms[k - 1]:
+        return count
+    p = min(count, k - 1)
+    while p > 0 and fnorms[p - 1] > fnorm:
+        xs[p] = xs[p - 1]
+        fnorms[p] = fnorms[p - 1]
+        nfevs[p] = nfevs[p - 1]
+        njevs[p] = njevs[p - 1]
+        infos[p] = infos[p - 1]
+        starts[p] = starts[p - 1]
+        p -= 1
+    xs[p] = x
+    fnorms[p] = fnorm
+    nfevs[p] = nfev
+    njevs[p] = njev
+    infos[p] = info
+    starts[p] = start
+    return min(count + 1, k)
+
+
+@njit(parallel=True, cache=True, nogil=True)
+def lmder_multistart(
+    fcn: int64,
+    m: int32,
+    x: NDArray[floating],
+    k: int | None = None,
+    target: floating | None = None,
+    ftol: floating | None = None,
+    xtol: floating | None = None,
+    gtol: floating | None = None,
+    maxfev: int32 | None = None,
+    factor: floating | None = None,
+    udata: NDArray | None = None,
+) -> MultistartResult:
+    """Solve a least squares problem with `lmder` from many starting points.
+
+    The starting points are split into chunks run in parallel, each allocating its
+    workspace once, and the GIL is released. Each chunk keeps only its k best
+    solutions, which are merged at the end, so the memory used does not grow with the
+    number of starts.
+    Once a solution with ||fvec|| <= target is found, the starts that have not been
+    run yet are skipped, so which solutions are returned then depends on the
+    scheduling of the chunks.
+
+    Parameters
+    ----------
+    fcn : int64 | Dispatcher
+        address of the cfunc, or njit function, computing the residuals and the
+        jacobian, see [lmder][cminpack_numba.lmder]
+    m : int32
+        number of residuals
+    x : NDArray[floating]
+        (s, n) array of starting points, see
+        [random_starts][cminpack_numba.random_starts]
+    k : int | None, optional
+        number of solutions to return, by default 1
+    target : floating | None, optional
+        ||fvec|| at which to stop starting new solves, by default None
+    ftol : floating | None, optional
+        see [lmder][cminpack_numba.lmder], by default None
+    xtol : floating | None, optional
+        see [lmder][cminpack_numba.lmder], by default None
+    gtol : floating | None, optional
+        see [lmder][cminpack_numba.lmder], by default None
+    maxfev : int32 | None, optional
+        see [lmder][cminpack_numba.lmder], by default None
+    factor : floating | None, optional
+        see [lmder][cminpack_numba.lmder], by default None
+    udata : NDArray | None, optional
+        passed to fcn for every start, by default None
+
+    Returns
+    -------
+    MultistartResult
+        the k solutions with the smallest ||fvec||, sorted by it, with their
+        ||fvec||, nfev, njev, info and index of their start. Skipped starts have an
+        ||fvec|| of inf and nfev of 0
+
+    """
+    s, n = x.shape
+    n = int32(n)
+    # `a or b` on optional floats miscompiles the prange loop below
+    k = 1 if k is None else min(k, s)
+    target = -inf if target is None else target
+    ftol = 1.49012e-8 if ftol is None else ftol
+    xtol = 1.49012e-8 if xtol is None else xtol
+    gtol = 0.0 if gtol is None else gtol
+    factor = 100.0 if factor is None else factor
+    maxfev = 200 * (n + 1) if maxfev is None else maxfev
+
+    # the k best solutions of each chunk, merged once the chunks are done
+    nchunks = min(s, _NCHUNKS)
+    counts = zeros(nchunks, dtype=int32)
+    xs = empty((nchunks, k, n), dtype=x.dtype)
+    fnorms = full((nchunks, k), inf, dtype=x.dtype)
+    nfevs = zeros((nchunks, k), dtype=int32)
+    njevs = zeros((nchunks, k), dtype=int32)
+    infos = zeros((nchunks, k), dtype=int32)
+    starts = zeros((nchunks, k), dtype=int64)
+    done = zeros(1, dtype=int32)
+
+    for c in prange(nchunks):
+        xc = empty(n, dtype=x.dtype)
+        fvec = empty(m, dtype=x.dtype)
+        fjac = empty((m, n), dtype=x.dtype)
+        diag = ones(n, dtype=x.dtype)
+        ipvt = empty(n, dtype=int32)
+        qtf = empty(n, dtype=x.dtype)
+        wa = empty(3 * n + m, dtype=x.dtype)
+        count = 0
+        for i in range(c * s // nchunks, (c + 1) * s // nchunks):
+            # a slice assignment checks its shape against the int32 n, which
+            # does not compile in the prange loop
+            for j in range(n):
+                xc[j] = x[i, j]
+            fnorm = inf
+            info = nfev = njev = int32(0)
+            if not done[0]:
+                nfevptr = ptr_from_val(int32(0))
+                njevptr = ptr_from_val(int32(0))
+                info = _lmder(
+                    fcn,
+                    m,
+                    n,
+                    xc,
+                    fvec,
+                    fjac,
+                    m,
+                    ftol,
+                    xtol,
+                    gtol,
+                    maxfev,
+                    diag,
+                    1,
+                    factor,
+                    0,
+                    nfevptr,
+                    njevptr,
+                    ipvt,
+                    qtf,
+                    wa[:n],
+                    wa[n : 2 * n],
+                    wa[2 * n : 3 * n],
+                    wa[3 * n :],
+                    udata,
+                )[-1]
+                nfev = val_from_ptr(nfevptr)
+                njev = val_from_ptr(njevptr)
+                fnorm = _enorm(m, fvec)
+                if fnorm <= target:
+                    done[0] = 1
+            count = _keep(
+                count,
+                xs[c],
+                fnorms[c],
+                nfevs[c],
+                njevs[c],
+                infos[c],
+                starts[c],
+                xc,
+                fnorm,
+                nfev,
+                njev,
+                info,
+                i,
+            )
+        counts[c] = count
+
+    # in the order of the starts, so that the stable sort breaks ties by start
+    kept = empty(counts.sum(), dtype=int64)
+    j = 0
+    for chunk in range(nchunks):
+        for l in range(counts[chunk]):
+            kept[j] = chunk * k + l
+            j += 1
+    best = kept[argsort(fnorms.ravel()[kept], kind="mergesort")[:k]]
+    return MultistartResult(
+        xs.reshape((nchunks * k, x.shape[1]))[best],
+        fnorms.ravel()[best],
+        nfevs.ravel()[best],
+        njevs.ravel()[best],
+        infos.ravel()[best],
+        starts.ravel()[best],
+    )
@@ -0,0 +1,362 @@
+"""Process pool solving batches of problems whose cfunc is not thread-safe."""
+
+from __future__ import annotations
+
+import importlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from multiprocessing import get_context, shared_memory
+from typing import TYPE_CHECKING
+
+from numpy import asarray, empty, float64, int32, ndarray, prod
+
+from ._caching import njit
+from ._lmder import lmder
+from ._lmdif import lmdif
+from ._workspace import workspace
+from .utils import _row
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+
+    from numba.core.ccallback import CFunc
+    from numpy import floating
+    from numpy.typing import ArrayLike, DTypeLike, NDArray
+
+__all__ = ["BatchPool"]
+
+
+@njit(cache=True, nogil=True)
+def _lmdif_rows(fcn, m, x, fvec, nfev, info, udata, ftol, xtol, gtol, maxfev, epsfcn):
+    ws = workspace(m, x.shape[1], x.dtype)
+    for i in range(x.shape[0]):
+        result = lmdif(
+            fcn,
+            m,
+            x[i],
+            ftol,
+            xtol,
+            gtol,
+            maxfev,
+            epsfcn,
+            udata=_row(udata, i),
+            workspace=ws,
+        )
+        x[i] = result.x
+        fvec[i] = result.fvec
+        nfev[i] = result.nfev
+        info[i] = result.info
+
+
+@njit(cache=True, nogil=True)
+def _lmder_rows(fcn, m, x, fvec, nfev, info, udata, ftol, xtol, gtol, maxfev, epsfcn):
+    ws = workspace(m, x.shape[1], x.dtype)
+    for i in range(x.shape[0]):
+        result = lmder(
+            fcn,
+            m,
+            x[i],
+            ftol,
+            xtol,
+            gtol,
+            maxfev,
+            udata=_row(udata, i),
+            workspace=ws,
+        )
+        x[i] = result.x
+        fvec[i] = result.fvec
+        nfev[i] = result.nfev
+        info[i] = result.info
+
+
+_KERNELS = {"lmdif": _lmdif_rows, "lmder": _lmder_rows}
+
+# State of a worker process: the solver loop, the address of fcn and the shared
+# memory of the pool, which stays attached between batches
+_WORKER: dict = {}
+
+
+def _address(reference: str) -> int:
+    """Address of the cfunc `module:qualname`, imported in this process."""
+    module, _, name = reference.partition(":")
+    obj = importlib.import_module(module)
+    for attr in name.split("."):
+        obj = getattr(obj, attr)
+    return obj.address
+
+
+def _initializer(kind: str, reference: str) -> None:
+    _WORKER["kernel"] = _KERNELS[kind]
+    _WORKER["fcn"] = _address(reference)
+    _WORKER["blocks"] = {}
+
+
+def _attach(name: str, persistent: bool) -> shared_memory.SharedMemory:
+    """Shared memory `name`, kept attached if it belongs to the pool."""
+    blocks = _WORKER["blocks"]
+    if name in blocks:
+        return blocks[name]
+    block = shared_memory.SharedMemory(name=name)
+    if persistent:
+        blocks[name] = block
+    return block
+
+
+def _solve_rows(start: int, stop: int, specs: tuple, options: tuple) -> None:
+    """Solve the problems start:stop of the batch whose arrays are in `specs`."""
+    blocks = [None if spec is None else _attach(*spec[:2]) for spec in specs]
+    arrays = [
+        None if spec is None else ndarray(spec[3], spec[4], block.buf, spec[2])
+        for spec, block in zip(specs, blocks)
+    ]
+    x, fvec, nfev, info, udata = arrays
+    _WORKER["kernel"](
+        _WORKER["fcn"],
+        fvec.shape[1],
+        x[start:stop],
+        fvec[start:stop],
+        nfev[start:stop],
+        info[start:stop],
+        None if udata is None else udata[start:stop],
+        *options,
+    )
+    # the views must be released before the temporary memory is closed
+    del x, fvec, nfev, info, udata, arrays
+    for spec, block in zip(specs, blocks):
+        if spec is not None and not spec[1]:
+            block.close()
+
+
+class BatchPool:
+    """Process pool solving batches of independent problems with `lmdif` or `lmder`.
+
+    For residual functions that are not thread-safe, which rules out
+    [lmdif_batch][cminpack_numba.lmdif_batch] and threads, the problems are instead
+    split between worker processes. The starting points, udata and results are
+    placed in `multiprocessing.shared_memory` instead of being pickled, and the
+    workers are kept alive between batches. Each worker imports the module defining
+    the cfunc and passes its address to the solver, as with
+    [lmdif][cminpack_numba.lmdif].
+
+    The solver loop is compiled in the parent process, and cached on disk, before
+    the workers are started, so that they load it instead of compiling it. A udata
+    allocated with [array][cminpack_numba.BatchPool.array] is read in place by the
+    workers, so a large udata can be filled once and reused by many batches; other
+    arrays are copied into temporary shared memory for each batch.
+
+    Parameters
+    ----------
+    fcn : CFunc | str
+        cfunc computing the residuals (and the jacobian for `lmder`), defined at the
+        top level of an importable module, or its `"module:qualname"`
+    kind : str, optional
+        "lmdif" or "lmder", by default "lmdif"
+    max_workers : int | None, optional
+        number of worker processes, by default the number of CPUs
+    mp_context : BaseContext | None, optional
+        multiprocessing context of the workers, by default "spawn", as forking a
+        process whose numba threading layer has started, e.g. by
+        [lmdif_batch][cminpack_numba.lmdif_batch], can deadlock
+
+    """
+
+    def __init__(
+        self,
+        fcn: CFunc | str,
+        kind: str = "lmdif",
+        max_workers: int | None = None,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        if kind not in _KERNELS:
+            msg = f"kind must be one of {tuple(_KERNELS)}, not {kind!r}"
+            raise ValueError(msg)
+        if not isinstance(fcn, str):
+            fcn = f"{fcn._pyfunc.__module__}:{fcn._pyfunc.__qualname__}"  # noqa: SLF001
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._blocks: dict[str, tuple[shared_memory.SharedMemory, int]] = {}
+        self._executor = ProcessPoolExecutor(
+            self.max_workers,
+            mp_context or get_context("spawn"),
+            initializer=_initializer,
+            initargs=(kind, fcn),
+        )
+
+    def array(
+        self,
+        shape: int | tuple[int, ...],
+        dtype: DTypeLike = float64,
+    ) -> NDArray:
+        """Allocate an array in shared memory, read in place by the workers.
+
+        Parameters
+        ----------
+        shape : int | tuple[int, ...]
+            shape of the array
+        dtype : DTypeLike, optional
+            dtype of the array, by default float64
+
+        Returns
+        -------
+        NDArray
+            the array, which must not be used after the pool is closed
+
+        """
+        block, arr = _allocate(shape, dtype)
+        self._blocks[block.name] = block, arr.__array_interface__["data"][0]
+        return arr
+
+    def _shared(self, arr: NDArray) -> tuple[str, bool, int, tuple, str] | None:
+        """Name, persistence, offset, shape and dtype of `arr` in the pool's memory."""
+        if not arr.flags.c_contiguous:
+            return None
+        address = arr.__array_interface__["data"][0]
+        for name, (block, start) in self._blocks.items():
+            if start <= address and address + arr.nbytes <= start + block.size:
+                return name, True, address - start, arr.shape, arr.dtype.str
+        return None
+
+    def solve(
+        self,
+        m: int32,
+        x: ArrayLike,
+        udata: NDArray | None = None,
+        ftol: floating | None = None,
+        xtol: floating | None = None,
+        gtol: floating | None = None,
+        maxfev: int32 | None = None,
+        epsfcn: floating | None = None,
+    ) -> tuple[NDArray[floating], NDArray[floating], NDArray[int32], NDArray[int32]]:
+        """Solve k independent problems, split between the worker processes.
+
+        Parameters
+        ----------
+        m : int32
+            number of residuals of each problem
+        x : ArrayLike
+            (k, n) array of starting points
+        udata : NDArray | None, optional
+            array whose i-th row is passed as udata to the i-th problem, by default
+            None
+        ftol : floating | None, optional
+            see [lmdif][cminpack_numba.lmdif], by default None
+        xtol : floating | None, optional
+            see [lmdif][cminpack_numba.lmdif], by default None
+        gtol : floating | None, optional
+            see [lmdif][cminpack_numba.lmdif], by default None
+        maxfev : int32 | None, optional
+            see [lmdif][cminpack_numba.lmdif], by default None
+        epsfcn : floating | None, optional
+            see [lmdif][cminpack_numba.lmdif], ignored by `lmder`, by default None
+
+        Returns
+        -------
+        tuple[NDArray[floating], NDArray[floating], NDArray[int32], NDArray[int32]]
+            (k, n) solutions, (k, m) residuals, number of function evaluations and
+            info of each problem, as returned by
+            [lmdif_batch][cminpack_numba.lmdif_batch]
+
+        """
+        x = asarray(x)
+        k, n = x.shape
+        if udata is not None and udata.shape[0] != k:
+            msg = "udata must have a row per problem"
+            raise ValueError(msg)
+        options = (ftol, xtol, gtol, maxfev, epsfcn)
+
+        temporary: list[shared_memory.SharedMemory] = []
+        try:
+            arrays = [
+                self._temporary(shape, typ, temporary)
+                for shape, typ in (
+                    ((k, n), x.dtype),
+                    ((k, m), x.dtype),
+                    (k, int32),
+                    (k, int32),
+                )
+            ]
+            arrays[0][...] = x
+            specs = [_spec(b, a) for b, a in zip(temporary, arrays)]
+            if udata is None:
+                specs.append(None)
+            elif (spec := self._shared(udata)) is not None:
+                specs.append(spec)
+            else:
+                self._temporary(udata.shape, udata.dtype, temporary)[...] = udata
+                specs.append(_spec(temporary[-1], udata))
+
+            # with no problems, this compiles the specialisation the workers use
+            _KERNELS[self.kind](
+                0,
+                m,
+                *(a[:0] for a in arrays),
+                None if udata is None else empty((0, *udata.shape[1:]), udata.dtype),
+                *options,
+            )
+
+            nchunks = min(k, 4 * self.max_workers)
+            bounds = [c * k // nchunks for c in range(nchunks + 1)]
+            futures = [
+                self._executor.submit(_solve_rows, start, stop, specs, options)
+                for start, stop in zip(bounds[:-1], bounds[1:])
+                if stop > start
+            ]
+            for future in futures:
+                future.result()
+            results = tuple(a.copy() for a in arrays)
+            del arrays
+            return results
+        finally:
+            for block in temporary:
+                block.unlink()
+                with suppress(BufferError):
+                    block.close()
+
+    @staticmethod
+    def _temporary(
+        shape: int | tuple[int, ...],
+        dtype: DTypeLike,
+        temporary: list[shared_memory.SharedMemory],
+    ) -> NDArray:
+        """Array in new shared memory, appended to `temporary`."""
+        block, arr = _allocate(shape, dtype)
+        temporary.append(block)
+        return arr
+
+    def close(self) -> None:
+        """Shut the workers down and free the shared memory of the pool."""
+        self._executor.shutdown()
+        for block, _ in self._blocks.values():
+            block.unlink()
+            # still open while the arrays returned by `array` are alive
+            with suppress(BufferError):
+                block.close()
+        self._blocks.clear()
+
+    def __enter__(self) -> BatchPool:
+        """Use the pool as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the pool."""
+        self.close()
+
+
+def _allocate(
+    shape: int | tuple[int, ...],
+    dtype: DTypeLike,
+) -> tuple[shared_memory.SharedMemory, NDArray]:
+    """Create shared memory and an array of `shape` and `dtype` viewing it."""
+    shape = (shape,) if isinstance(shape, int) else tuple(shape)
+    itemsize = asarray(0, dtype).itemsize
+    block = shared_memory.SharedMemory(
+        create=True,
+        size=max(int(prod(shape)) * itemsize, 1),
+    )
+    return block, ndarray(shape, dtype, block.buf)
+
+
+def _spec(block: shared_memory.SharedMemory, arr: NDArray) -> tuple:
+    """Name, persistence, offset, shape and dtype of `arr`, filling `block`."""
+    return block.name, False, 0, arr.shape, arr.dtype.str
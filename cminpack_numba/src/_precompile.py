@@ -0,0 +1,87 @@
+"""Eager compilation of the common specialisations of the wrappers."""
+
+from __future__ import annotations
+
+import inspect
+from typing import TYPE_CHECKING
+
+from numba import types
+
+from ._dpmpar import dpmpar, sdpmpar
+from ._enorm import enorm
+from ._hybrd import hybrd, hybrd1, hybrd_batch
+from ._hybrj import hybrj, hybrj1, hybrj_batch
+from ._lmder import lmder, lmder1
+from ._lmdif import lmdif, lmdif1, lmdif_batch
+from ._lmstr import lmstr, lmstr1
+from ._workspace import workspace
+from .cminpack_ import _apply_prefix, _has_cminpack
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from numba.core.dispatcher import Dispatcher
+
+__all__ = ["precompile"]
+
+_SOLVERS = (lmdif, lmdif1, lmder, lmder1, lmstr, lmstr1, hybrd, hybrd1, hybrj, hybrj1)
+_BATCH_SOLVERS = (lmdif_batch, hybrd_batch, hybrj_batch)
+
+
+def _signature(
+    func: Dispatcher,
+    dtype: types.Float,
+    udata: types.Type | None,
+    ndim: int,
+) -> tuple[types.Type, ...]:
+    """Argument types of a call with positional fcn, m & x and udata as a keyword.
+
+    These are the types the dispatcher infers for e.g. `lmdif(address, m, x0)` or
+    `lmdif(address, m, x0, udata=udata)`: the other arguments are omitted.
+    """
+    argtypes = []
+    for name, param in inspect.signature(func.py_func).parameters.items():
+        if name in {"fcn", "m", "n"}:
+            argtypes.append(types.int64)
+        elif name == "x":
+            argtypes.append(types.Array(dtype, ndim, "C"))
+        elif name == "udata" and udata is not None:
+            argtypes.append(udata)
+        else:
+            argtypes.append(types.Omitted(param.default))
+    return tuple(argtypes)
+
+
+def precompile(dtypes: Iterable[str] = ("float64", "float32")) -> None:
+    """Compile the wrappers for the most common argument types.
+
+    For every dtype, the solvers are compiled for calls passing fcn, m (if any) and x
+    positionally, with udata omitted, an array of the same dtype (2D for the batched
+    solvers), or an int address. As the compiled functions are cached on disk, this
+    can be run once when building an image or at warm-up, e.g.
+    `python -c "import cminpack_numba; cminpack_numba.precompile()"`, so that later
+    processes load these specialisations from the cache instead of compiling them.
+
+    Parameters
+    ----------
+    dtypes : Iterable[str], optional
+        dtypes to compile for, by default ("float64", "float32"). dtypes whose cminpack
+        library is unavailable are skipped.
+
+    """
+    _dpmpar = {"float64": dpmpar, "float32": sdpmpar}
+    for name in dtypes:
+        if not _has_cminpack(_apply_prefix("", getattr(types, name))):
+            continue
+        dtype = getattr(types, name)
+        for udata in (None, types.Array(dtype, 1, "C"), types.int64):
+            for func in _SOLVERS:
+                func.compile(_signature(func, dtype, udata, 1))
+        for udata in (None, types.Array(dtype, 2, "C")):
+            for func in _BATCH_SOLVERS:
+                func.compile(_signature(func, dtype, udata, 2))
+        enorm.compile((types.Array(dtype, 1, "C"),))
+        _dpmpar[name].compile((types.int64,))
+        workspace.compile((types.int64, types.int64, types.NumberClass(dtype)))
+        if name == "float64":
+            workspace.compile(_signature(workspace, dtype, None, 1))
@@ -0,0 +1,127 @@
+"""Counters and timings of the calls to `fcn` made by the high-level wrappers."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from numba import extending, types
+from numba.experimental import structref
+from numpy import float64, int64, zeros
+
+from ._caching import njit
+from .utils import _perf_counter
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+__all__ = [
+    "Profile",
+    "profile",
+]
+
+_FIELDS = ("calls", "time", "total")
+
+
+@structref.register
+class ProfileType(types.StructRef):
+    """Numba type of [Profile][cminpack_numba.Profile]."""
+
+    def preprocess_fields(
+        self,
+        fields: tuple[tuple[str, types.Type], ...],
+    ) -> tuple[tuple[str, types.Type], ...]:
+        """Remove literal types from the fields."""
+        return tuple((name, types.unliteral(typ)) for name, typ in fields)
+
+
+class Profile(structref.StructRefProxy):
+    """Calls to `fcn` and time spent in them and in the solver.
+
+    Create with [profile][cminpack_numba.profile] and pass as the `profile` argument
+    of [lmdif][cminpack_numba.lmdif], [lmder][cminpack_numba.lmder],
+    [lmstr][cminpack_numba.lmstr], [hybrd][cminpack_numba.hybrd] or
+    [hybrj][cminpack_numba.hybrj]. The calls are grouped by iflag: 0 for the calls
+    made every nprint iterations, 1 for the residuals and 2 for the jacobian, which
+    includes its forward-difference approximation by `lmdif` and `hybrd` and the
+    rows of `lmstr`. The counts and times add up over all the solves using the
+    profile.
+    """
+
+    @property
+    def calls(self) -> NDArray[int64]:
+        """Number of calls to fcn with iflag 0, 1 and 2."""
+        return _get_calls(self)
+
+    @property
+    def time(self) -> NDArray[float64]:
+        """Seconds spent in fcn with iflag 0, 1 and 2."""
+        return _get_time(self)
+
+    @property
+    def total(self) -> float:
+        """Seconds spent in the solvers, including fcn."""
+        return _get_total(self)
+
+    @property
+    def solver(self) -> float:
+        """Seconds spent in the solvers, excluding fcn."""
+        return self.total - self.time.sum()
+
+
+@njit(cache=True)
+def _get_calls(self):
+    return self.calls
+
+
+@njit(cache=True)
+def _get_time(self):
+    return self.time
+
+
+@njit(cache=True)
+def _get_total(self):
+    return self.total
+
+
+structref.define_proxy(Profile, ProfileType, list(_FIELDS))
+
+
+@njit(cache=True)
+def profile() -> Profile:
+    """Create an empty profile.
+
+    Returns
+    -------
+    Profile
+        the profile, with no calls
+
+    """
+    return Profile(zeros(3, dtype=int64), zeros(3, dtype=float64), 0.0)
+
+
+def _start(profile):
+    raise NotImplementedError
+
+
+@extending.overload(_start)
+def _start_overload(profile):
+    """Time at the start of a solve, if profiling."""
+    if isinstance(profile, (types.NoneType, types.Omitted)):
+        return lambda profile: 0.0
+    return lambda profile: _perf_counter()
+
+
+def _stop(profile, start):
+    raise NotImplementedError
+
+
+@extending.overload(_stop)
+def _stop_overload(profile, start):
+    """Add the time since `start` to the total of the profile."""
+    if isinstance(profile, (types.NoneType, types.Omitted)):
+        return lambda profile, start: None
+
+    def impl(profile, start):
+        profile.total += _perf_counter() - start
+
+    return impl
@@ -0,0 +1,90 @@
+"""Results of the high-level wrappers.
+
+The results are namedtuples, so they can still be unpacked like the tuples the
+wrappers used to return, both in Python and in nopython mode.
+"""
+
+from __future__ import annotations
+
+from collections import namedtuple
+
+from numba import extending, types
+from numpy import empty_like
+
+__all__ = [
+    "HybrdResult",
+    "HybrjResult",
+    "LmderResult",
+    "LmdifResult",
+    "LmstrResult",
+    "LmstrStreamResult",
+    "MultistartResult",
+]
+
+LmdifResult = namedtuple(
+    "LmdifResult",
+    ["x", "fvec", "fjac", "ipvt", "qtf", "nfev", "info"],
+)
+LmdifResult.__doc__ = "Result of [lmdif][cminpack_numba.lmdif]."
+
+LmderResult = namedtuple(
+    "LmderResult",
+    ["x", "fvec", "fjac", "ipvt", "qtf", "nfev", "njev", "info"],
+)
+LmderResult.__doc__ = "Result of [lmder][cminpack_numba.lmder]."
+
+LmstrResult = namedtuple(
+    "LmstrResult",
+    ["x", "fvec", "fjac", "ipvt", "qtf", "nfev", "njev", "info"],
+)
+LmstrResult.__doc__ = "Result of [lmstr][cminpack_numba.lmstr]."
+
+LmstrStreamResult = namedtuple(
+    "LmstrStreamResult",
+    ["x", "fnorm", "fjac", "ipvt", "qtf", "nfev", "njev", "info"],
+)
+LmstrStreamResult.__doc__ = (
+    "Result of [lmstr_stream][cminpack_numba.pure.lmstr_stream]."
+)
+
+HybrdResult = namedtuple(
+    "HybrdResult",
+    ["x", "fvec", "fjac", "r", "qtf", "nfev", "info"],
+)
+HybrdResult.__doc__ = "Result of [hybrd][cminpack_numba.hybrd]."
+
+HybrjResult = namedtuple(
+    "HybrjResult",
+    ["x", "fvec", "fjac", "r", "qtf", "nfev", "njev", "info"],
+)
+HybrjResult.__doc__ = "Result of [hybrj][cminpack_numba.hybrj]."
+
+MultistartResult = namedtuple(
+    "MultistartResult",
+    ["x", "fnorm", "nfev", "njev", "info", "start"],
+)
+MultistartResult.__doc__ = (
+    "Result of [lmder_multistart][cminpack_numba.lmder_multistart]."
+)
+
+
+def _output(a, full_output):
+    raise NotImplementedError
+
+
+@extending.overload(_output)
+def _output_overload(a, full_output):
+    """`a`, or an empty array if full_output is False.
+
+    The empty array has the type of `a` but does not refer to its memory, so that
+    the result does not keep the solver's buffers, e.g. the m by n fjac, alive.
+    """
+    if isinstance(full_output, (types.NoneType, types.Omitted)):
+        return lambda a, full_output: a
+
+    def impl(a, full_output):
+        if full_output:
+            return a
+        return empty_like(a[:0])
+
+    return impl
@@ -0,0 +1,448 @@
+"""In-memory trace and profile of the iterations of the solvers, and bounds.
+
+cminpack calls `fcn` with iflag = 0 at the start of every nprint-th iteration and when
+it terminates, which is the only view of the iterations that the drivers give. When a
+`trace` array or a [Profile][cminpack_numba.Profile] is passed to one of the
+high-level wrappers, `fcn` is wrapped in a C function that records these calls in the
+trace, passing them on only if nprint > 0, and counts and times the calls to `fcn`,
+without leaving nopython mode. The bounded wrappers use the same C function to pass
+the external parameters to `fcn`, see [bounds][cminpack_numba.src.bounds], and to
+chain-rule the jacobian it returns to the internal parameters the solver works with.
+
+The wrapper is emitted into the LLVM module of the compiled function using it, rather
+than being a cfunc whose address would be baked into the compiled code, so that the
+functions passing `trace` or `profile` can still be cached on disk. It receives a
+single int64 context array as its udata, laid out as:
+
+    fcn | udata | trace | rows | previous x | forward iflag = 0 | count | calls |
+    profile calls | profile time | lower | upper | external x | gradient | ...
+
+followed by the previous x, the lower and upper bounds, the external x and the
+gradient of the transform if bounded and, for njit functions, the context of their
+trampoline.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from llvmlite import ir
+from numba import carray, errors, extending, types
+from numba.core import cgutils
+from numba.np.numpy_support import as_dtype
+from numpy import empty, float64, int64, nan
+
+from ._enorm import _enorm
+from ._trampoline import _address, _udata_context, trampoline
+from .bounds import in2ext, in2ext_grad
+from .signatures import CminpackSignature
+from .utils import _check_dtype, _perf_counter, address_as_void_pointer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from numba.core.typing import Signature
+    from numpy import dtype
+
+# columns of the trace
+_COLUMNS = 3
+
+# fields of the context
+_FCN, _UDATA, _TRACE, _ROWS, _PREVIOUS, _FORWARD, _COUNT, _CALLS = range(8)
+_PROFILE_CALLS, _PROFILE_TIME, _LOWER, _UPPER, _EXTERNAL, _GRADIENT = range(8, 14)
+_HEADER = 14
+
+# kinds of functions that can be bounded
+_BOUNDED = ("lmdif", "lmder")
+
+
+@extending.intrinsic
+def _call_address(typingctx, address, args) -> tuple[Signature, Callable]:
+    """Call the C function at `address` with the tuple of arguments `args`."""
+    sig = types.intc(address, args)
+
+    def codegen(context, builder, signature, llargs):
+        argtypes = signature.args[1].types
+        values = cgutils.unpack_tuple(builder, llargs[1], len(argtypes))
+        fnty = ir.FunctionType(
+            context.get_value_type(types.intc),
+            [context.get_value_type(i) for i in argtypes],
+        )
+        return builder.call(builder.inttoptr(llargs[0], fnty.as_pointer()), values)
+
+    return sig, codegen
+
+
+def _before(dtype: dtype) -> Callable:
+    @extending.register_jitable
+    def before(context, m, n, x, fvec, iflag):
+        """Record the iteration at x if iflag == 0, returning whether to call fcn."""
+        if iflag != 0:
+            context[_CALLS] += 1
+            return True
+        i = context[_COUNT]
+        if i < context[_ROWS]:
+            trace = carray(
+                address_as_void_pointer(context[_TRACE]),
+                (context[_ROWS], _COLUMNS),
+                dtype,
+            )
+            previous = carray(address_as_void_pointer(context[_PREVIOUS]), (n,), dtype)
+            trace[i, 0] = _enorm(m, carray(fvec, (m,)))
+            x = carray(x, (n,), dtype)
+            if i > 0:
+                for j in range(n):
+                    previous[j] = x[j] - previous[j]
+                trace[i, 1] = _enorm(n, previous)
+            else:
+                trace[i, 1] = 0.0
+            trace[i, 2] = context[_CALLS]
+            previous[:] = x
+        context[_COUNT] = i + 1
+        return context[_FORWARD] != 0
+
+    return before
+
+
+def _bounds(dtype: dtype, bounded: bool) -> tuple[Callable, Callable]:  # noqa: FBT001
+    if not bounded:
+
+        @extending.register_jitable
+        def external(context, n, x):
+            return x
+
+        @extending.register_jitable
+        def chain(context, m, n, x, fjac, ldfjac):
+            pass
+
+        return external, chain
+
+    @extending.register_jitable
+    def buffer(context, field, n):
+        return carray(address_as_void_pointer(context[field]), (n,), dtype)
+
+    @extending.register_jitable
+    def external(context, n, x):
+        """Map the internal parameters x to the external ones passed to fcn."""
+        x = carray(x, (n,), dtype)
+        lower, upper = buffer(context, _LOWER, n), buffer(context, _UPPER, n)
+        in2ext(x, lower, upper, buffer(context, _EXTERNAL, n))
+        return address_as_void_pointer(context[_EXTERNAL])
+
+    @extending.register_jitable
+    def chain(context, m, n, x, fjac, ldfjac):
+        """Scale the columns of fjac by the gradient of the external parameters."""
+        x = carray(x, (n,), dtype)
+        lower, upper = buffer(context, _LOWER, n), buffer(context, _UPPER, n)
+        gradient = in2ext_grad(x, lower, upper, buffer(context, _GRADIENT, n))
+        fjac = carray(fjac, (n, ldfjac), dtype)
+        for j in range(n):
+            fjac[j, :m] *= gradient[j]
+
+    return external, chain
+
+
+def _caller(profiled: bool) -> Callable:  # noqa: FBT001
+    @extending.register_jitable
+    def call(context, iflag, args):
+        """Call fcn with `args`, adding the call and its time to the profile."""
+        if not profiled:
+            return _call_address(context[_FCN], args)
+        start = _perf_counter()
+        info = _call_address(context[_FCN], args)
+        elapsed = _perf_counter() - start
+        group = min(iflag, 2)
+        calls = carray(address_as_void_pointer(context[_PROFILE_CALLS]), (3,), int64)
+        time = carray(address_as_void_pointer(context[_PROFILE_TIME]), (3,), float64)
+        calls[group] += 1
+        time[group] += elapsed
+        return info
+
+    return call
+
+
+def _lmdif_tracer(before: Callable, call: Callable, bounds: tuple) -> Callable:
+    external, _ = bounds
+
+    def tracer(p, m, n, x, fvec, iflag):
+        context = carray(p, (_HEADER,), int64)
+        x = external(context, n, x)
+        if not before(context, m, n, x, fvec, iflag):
+            return 0
+        udata = address_as_void_pointer(context[_UDATA])
+        return call(context, iflag, (udata, m, n, x, fvec, iflag))
+
+    return tracer
+
+
+def _lmder_tracer(before: Callable, call: Callable, bounds: tuple) -> Callable:
+    external, chain = bounds
+
+    def tracer(p, m, n, x, fvec, fjac, ldfjac, iflag):
+        context = carray(p, (_HEADER,), int64)
+        _x = external(context, n, x)
+        if not before(context, m, n, _x, fvec, iflag):
+            return 0
+        udata = address_as_void_pointer(context[_UDATA])
+        info = call(context, iflag, (udata, m, n, _x, fvec, fjac, ldfjac, iflag))
+        if iflag == 2:  # noqa: PLR2004
+            chain(context, m, n, x, fjac, ldfjac)
+        return info
+
+    return tracer
+
+
+def _lmstr_tracer(before: Callable, call: Callable, bounds: tuple) -> Callable:
+    def tracer(p, m, n, x, fvec, fjrow, iflag):
+        context = carray(p, (_HEADER,), int64)
+        if not before(context, m, n, x, fvec, iflag):
+            return 0
+        udata = address_as_void_pointer(context[_UDATA])
+        return call(context, iflag, (udata, m, n, x, fvec, fjrow, iflag))
+
+    return tracer
+
+
+def _hybrd_tracer(before: Callable, call: Callable, bounds: tuple) -> Callable:
+    def tracer(p, n, x, fvec, iflag):
+        context = carray(p, (_HEADER,), int64)
+        if not before(context, n, n, x, fvec, iflag):
+            return 0
+        udata = address_as_void_pointer(context[_UDATA])
+        return call(context, iflag, (udata, n, x, fvec, iflag))
+
+    return tracer
+
+
+def _hybrj_tracer(before: Callable, call: Callable, bounds: tuple) -> Callable:
+    def tracer(p, n, x, fvec, fjac, ldfjac, iflag):
+        context = carray(p, (_HEADER,), int64)
+        if not before(context, n, n, x, fvec, iflag):
+            return 0
+        udata = address_as_void_pointer(context[_UDATA])
+        return call(context, iflag, (udata, n, x, fvec, fjac, ldfjac, iflag))
+
+    return tracer
+
+
+_FACTORIES = {
+    "lmdif": _lmdif_tracer,
+    "lmder": _lmder_tracer,
+    "lmstr": _lmstr_tracer,
+    "hybrd": _hybrd_tracer,
+    "hybrj": _hybrj_tracer,
+}
+
+
+@lru_cache(maxsize=None)
+def _tracer_address(
+    kind: str,
+    dtype: types.Float,
+    profiled: bool,  # noqa: FBT001
+    bounded: bool,  # noqa: FBT001
+) -> Callable:
+    """Intrinsic returning the address of the tracing wrapper of `kind` functions."""
+    sig = getattr(CminpackSignature, kind)(types.voidptr, dtype)
+    py_func = _FACTORIES[kind](
+        _before(as_dtype(dtype)),
+        _caller(profiled),
+        _bounds(as_dtype(dtype), bounded),
+    )
+    name = (
+        f"cminpack_numba_trace_{kind}_{dtype}"
+        f"{'_profiled' if profiled else ''}{'_bounded' if bounded else ''}"
+    )
+    return _address(py_func, sig, name)
+
+
+def _trace(kind, fcn, x, nprint, udata, trace, profile):
+    raise NotImplementedError
+
+
+@extending.overload(_trace, prefer_literal=True)
+def _trace_overload(kind, fcn, x, nprint, udata, trace, profile):
+    """fcn, udata and nprint to pass to the driver to record its iterations in trace."""
+    if not isinstance(kind, types.StringLiteral):
+        return None
+    return lambda kind, fcn, x, nprint, udata, trace, profile: _wrap(
+        kind,
+        fcn,
+        x,
+        nprint,
+        udata,
+        trace,
+        profile,
+        None,
+        None,
+    )
+
+
+def _wrap(kind, fcn, x, nprint, udata, trace, profile, lower, upper):
+    raise NotImplementedError
+
+
+@extending.overload(_wrap, prefer_literal=True)
+def _wrap_overload(kind, fcn, x, nprint, udata, trace, profile, lower, upper):
+    """fcn, udata and nprint to pass to the driver to trace, profile or bound it.
+
+    If trace, profile, lower and upper are None, fcn and udata as passed to cminpack
+    by the drivers, i.e. the address and context of the trampoline of an njit
+    function, which are not first-class functions. Otherwise the address of the
+    wrapper, its context and an nprint of at least 1 if tracing. The rows of trace
+    are set to nan, and those of the iterations are overwritten with ||fvec||, the
+    norm of the step from the previous recorded iteration and the number of calls to
+    fcn with iflag != 0 so far. If bounded, x is in the internal parameters and fcn
+    is called with the external ones.
+    """
+    if not isinstance(kind, types.StringLiteral):
+        return None
+    traced = not isinstance(trace, (types.NoneType, types.Omitted))
+    profiled = not isinstance(profile, (types.NoneType, types.Omitted))
+    bounded = not isinstance(lower, (types.NoneType, types.Omitted))
+    if bounded and kind.literal_value not in _BOUNDED:
+        msg = f"{kind.literal_value} cannot be bounded"
+        raise errors.TypingError(msg)
+    if not traced and not profiled and not bounded:
+        if isinstance(fcn, types.Dispatcher):
+            fcn_address = trampoline(kind.literal_value, fcn, x.dtype, udata)
+            return lambda kind, fcn, x, nprint, udata, trace, profile, lower, upper: (
+                fcn_address(),
+                _udata_context(udata),
+                nprint,
+            )
+        return lambda kind, fcn, x, nprint, udata, trace, profile, lower, upper: (
+            fcn,
+            udata,
+            nprint,
+        )
+    if traced:
+        _check_dtype((trace,), x.dtype)
+    if bounded:
+        _check_dtype((lower, upper), x.dtype)
+    address = _tracer_address(kind.literal_value, x.dtype, profiled, bounded)
+    # previous x, and lower, upper, external x and gradient if bounded
+    tail = 5 if bounded else 1
+
+    if isinstance(fcn, types.Dispatcher):
+        fcn_address = trampoline(kind.literal_value, fcn, x.dtype, udata)
+        # the context of the trampoline is copied into the context of the wrapper
+        size = udata.ndim + 1 if isinstance(udata, types.Array) else 0
+
+        def fcn_udata(fcn, udata, out):
+            return fcn_address(), _pointer(_udata_context(udata), out)
+
+    else:
+        size = 0
+
+        def fcn_udata(fcn, udata, out):
+            return fcn, _pointer(udata, out)
+
+    fcn_udata = extending.register_jitable(fcn_udata)
+
+    def impl(kind, fcn, x, nprint, udata, trace, profile, lower, upper):
+        n = x.size
+        context = empty(_HEADER + tail * n + size, dtype=int64)
+        _fcn, _udata = fcn_udata(fcn, udata, context[_HEADER + tail * n :])
+        context[_FCN] = _fcn
+        context[_UDATA] = _udata
+        context[_TRACE], context[_ROWS] = _trace_buffer(trace)
+        context[_PREVIOUS] = context[_HEADER:].ctypes.data
+        context[_FORWARD] = nprint > 0
+        context[_COUNT] = 0
+        context[_CALLS] = 0
+        context[_PROFILE_CALLS], context[_PROFILE_TIME] = _profile_buffers(profile)
+        buffers = context[_HEADER + n : _HEADER + tail * n]
+        for i, j in enumerate(_bound_buffers(lower, upper, x, buffers)):
+            context[_LOWER + i] = j
+        return address(), context, max(nprint, 1) if traced else nprint
+
+    return impl
+
+
+def _trace_buffer(trace):
+    raise NotImplementedError
+
+
+@extending.overload(_trace_buffer)
+def _trace_buffer_overload(trace):
+    """Address and number of rows of the trace, after setting it to nan."""
+    if isinstance(trace, (types.NoneType, types.Omitted)):
+        return lambda trace: (0, 0)
+
+    def impl(trace):
+        if trace.shape[1] != _COLUMNS:
+            msg = "trace must have 3 columns"
+            raise ValueError(msg)
+        if not trace.flags.c_contiguous:
+            msg = "trace must be C contiguous"
+            raise ValueError(msg)
+        trace[:] = nan
+        return trace.ctypes.data, trace.shape[0]
+
+    return impl
+
+
+def _bound_buffers(lower, upper, x, out):
+    raise NotImplementedError
+
+
+@extending.overload(_bound_buffers)
+def _bound_buffers_overload(lower, upper, x, out):
+    """Addresses of the lower, upper, external x and gradient buffers in `out`.
+
+    The bounds are copied into `out`, so that they are contiguous.
+    """
+    if isinstance(lower, (types.NoneType, types.Omitted)):
+        return lambda lower, upper, x, out: (0, 0, 0, 0)
+    dtype = as_dtype(x.dtype)
+
+    def impl(lower, upper, x, out):
+        n = x.size
+        if lower.size != n or upper.size != n:
+            msg = "lower and upper must have the same size as x"
+            raise ValueError(msg)
+        addresses = (
+            out[:n].ctypes.data,
+            out[n : 2 * n].ctypes.data,
+            out[2 * n : 3 * n].ctypes.data,
+            out[3 * n :].ctypes.data,
+        )
+        carray(address_as_void_pointer(addresses[0]), (n,), dtype)[:] = lower
+        carray(address_as_void_pointer(addresses[1]), (n,), dtype)[:] = upper
+        return addresses
+
+    return impl
+
+
+def _profile_buffers(profile):
+    raise NotImplementedError
+
+
+@extending.overload(_profile_buffers)
+def _profile_buffers_overload(profile):
+    """Addresses of the calls and time arrays of the profile."""
+    if isinstance(profile, (types.NoneType, types.Omitted)):
+        return lambda profile: (0, 0)
+    return lambda profile: (profile.calls.ctypes.data, profile.time.ctypes.data)
+
+
+def _pointer(udata, out):
+    raise NotImplementedError
+
+
+@extending.overload(_pointer)
+def _pointer_overload(udata, out):
+    """udata as the int passed on to fcn, copying it to `out` if `out` is not empty."""
+    if isinstance(udata, types.NoneType):
+        return lambda udata, out: 0
+    if not isinstance(udata, types.Array):
+        return lambda udata, out: udata
+
+    def impl(udata, out):
+        if out.size:
+            out[:] = udata
+            return out.ctypes.data
+        return udata.ctypes.data
+
+    return impl
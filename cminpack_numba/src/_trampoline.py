@@ -0,0 +1,215 @@
+"""C trampolines for passing njit residual functions to the cminpack functions.
+
+The cminpack functions call `fcn` through a C function pointer, which is normally the
+address of a cfunc written with one of the signatures in `signatures.py`. The wrappers
+also accept an njit function with the array based signatures of
+[cminpack_numba.pure][], e.g. `fcn(udata, m, n, x, fvec, iflag)` for lmdif: a C
+function wrapping it is passed instead. Like the tracing wrapper of `_trace.py`, it is
+emitted into the LLVM module of the compiled function using it rather than being a
+cfunc, whose process-local address would be baked into code cached on disk.
+
+udata is passed to the njit function as given to the wrapper: None, an array, or the
+void pointer of an int address. As cminpack only passes a single pointer on, an array
+udata is passed to the trampoline as an int64 array holding its address and shape,
+from which the trampoline rebuilds the array.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from llvmlite import ir
+from numba import carray, extending, farray, njit, types
+from numba.core import cgutils
+from numba.np.numpy_support import as_dtype
+from numba.np.unsafe.ndarray import to_fixed_tuple
+from numpy import empty, int64
+
+from .signatures import CminpackSignature
+from .utils import address_as_void_pointer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from numba.core.dispatcher import Dispatcher
+    from numba.core.typing import Signature
+
+# Intrinsics returning the address of the trampolines, keyed on the njit function, the
+# kind of function, the dtype and the type of udata
+_TRAMPOLINES: dict[tuple, Callable] = {}
+
+
+def _address(py_func: Callable, sig: Signature, name: str) -> Callable:
+    """Intrinsic returning the address of `py_func` compiled as a C function.
+
+    The C function is emitted with internal linkage as `name` into the LLVM module of
+    the compiled function calling the intrinsic, so that no address is baked into its
+    code and it can be cached on disk. `name` must be unique to `py_func` and `sig`.
+    """
+
+    @extending.intrinsic
+    def address(typingctx) -> tuple[Signature, Callable]:
+        def codegen(context, builder, signature, args):
+            cres = context.compile_subroutine(builder, py_func, sig)
+            fnty = ir.FunctionType(
+                context.get_value_type(sig.return_type),
+                [context.get_value_type(i) for i in sig.args],
+            )
+            wrapper = cgutils.get_or_insert_function(builder.module, fnty, name)
+            if wrapper.is_declaration:
+                wrapper.linkage = "internal"
+                wbuilder = ir.IRBuilder(wrapper.append_basic_block())
+                _, result = context.call_internal_no_propagate(
+                    wbuilder,
+                    cres.fndesc,
+                    sig,
+                    wrapper.args,
+                )
+                wbuilder.ret(result)
+            return builder.ptrtoint(wrapper, context.get_value_type(types.int64))
+
+        return types.int64(), codegen
+
+    return address
+
+
+def _udata_converter(udata: types.Type) -> Dispatcher:
+    """njit function converting the udata pointer of a trampoline back to `udata`."""
+    if isinstance(udata, types.NoneType):
+        return njit(lambda p: None)
+    if not isinstance(udata, types.Array):
+        return njit(lambda p: p)
+
+    ndim = udata.ndim
+    dtype = as_dtype(udata.dtype)
+    array = farray if udata.layout == "F" else carray
+
+    @njit
+    def convert(p):
+        context = carray(p, (ndim + 1,), int64)
+        shape = to_fixed_tuple(context[1:], ndim)
+        return array(address_as_void_pointer(context[0]), shape, dtype)
+
+    return convert
+
+
+def _lmdif_trampoline(fcn: Dispatcher, udata: Dispatcher) -> Callable:
+    def trampoline(p, m, n, x, fvec, iflag):
+        return fcn(udata(p), m, n, carray(x, (n,)), carray(fvec, (m,)), iflag)
+
+    return trampoline
+
+
+def _lmder_trampoline(fcn: Dispatcher, udata: Dispatcher) -> Callable:
+    def trampoline(p, m, n, x, fvec, fjac, ldfjac, iflag):
+        return fcn(
+            udata(p),
+            m,
+            n,
+            carray(x, (n,)),
+            carray(fvec, (m,)),
+            farray(fjac, (ldfjac, n))[:m],
+            iflag,
+        )
+
+    return trampoline
+
+
+def _lmstr_trampoline(fcn: Dispatcher, udata: Dispatcher) -> Callable:
+    def trampoline(p, m, n, x, fvec, fjrow, iflag):
+        return fcn(
+            udata(p),
+            m,
+            n,
+            carray(x, (n,)),
+            carray(fvec, (m,)),
+            carray(fjrow, (n,)),
+            iflag,
+        )
+
+    return trampoline
+
+
+def _hybrd_trampoline(fcn: Dispatcher, udata: Dispatcher) -> Callable:
+    def trampoline(p, n, x, fvec, iflag):
+        return fcn(udata(p), n, carray(x, (n,)), carray(fvec, (n,)), iflag)
+
+    return trampoline
+
+
+def _hybrj_trampoline(fcn: Dispatcher, udata: Dispatcher) -> Callable:
+    def trampoline(p, n, x, fvec, fjac, ldfjac, iflag):
+        return fcn(
+            udata(p),
+            n,
+            carray(x, (n,)),
+            carray(fvec, (n,)),
+            farray(fjac, (ldfjac, n))[:n],
+            iflag,
+        )
+
+    return trampoline
+
+
+_FACTORIES = {
+    "lmdif": _lmdif_trampoline,
+    "lmder": _lmder_trampoline,
+    "lmstr": _lmstr_trampoline,
+    "hybrd": _hybrd_trampoline,
+    "hybrj": _hybrj_trampoline,
+}
+
+
+def trampoline(
+    kind: str,
+    fcn: types.Dispatcher,
+    dtype: types.Float,
+    udata: types.Type,
+) -> Callable:
+    """Intrinsic returning the address of the C function calling the njit `fcn`.
+
+    Parameters
+    ----------
+    kind : str
+        the kind of cminpack function, one of "lmdif", "lmder", "lmstr", "hybrd" and
+        "hybrj"
+    fcn : types.Dispatcher
+        type of the njit function
+    dtype : types.Float
+        dtype of the arrays passed to `fcn`
+    udata : types.Type
+        type of the udata given to the wrapper
+
+    Returns
+    -------
+    Callable
+        intrinsic taking no arguments and returning the address as an int64
+
+    """
+    key = (fcn.dispatcher, kind, dtype, udata)
+    if key not in _TRAMPOLINES:
+        sig = getattr(CminpackSignature, kind)(types.voidptr, dtype)
+        py_func = _FACTORIES[kind](fcn.dispatcher, _udata_converter(udata))
+        name = f"cminpack_numba_trampoline_{kind}_{len(_TRAMPOLINES)}"
+        _TRAMPOLINES[key] = _address(py_func, sig, name)
+    return _TRAMPOLINES[key]
+
+
+def _udata_context(udata):
+    raise NotImplementedError
+
+
+@extending.overload(_udata_context)
+def _udata_context_overload(udata):
+    """udata to pass to cminpack when calling a trampoline."""
+    if not isinstance(udata, types.Array):
+        return lambda udata: udata
+
+    def impl(udata):
+        context = empty(udata.ndim + 1, dtype=int64)
+        context[0] = udata.ctypes.data
+        for i in range(udata.ndim):
+            context[i + 1] = udata.shape[i]
+        return context
+
+    return impl
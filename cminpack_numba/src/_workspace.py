@@ -0,0 +1,256 @@
+"""Preallocated buffers for the high-level wrappers."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from numba import extending, types
+from numba.experimental import structref
+from numpy import empty, float64, floating, int32, ones
+
+from ._caching import njit
+from .utils import _check_dtype
+
+if TYPE_CHECKING:
+    from numpy.typing import DTypeLike, NDArray
+
+__all__ = [
+    "Workspace",
+    "workspace",
+]
+
+_FIELDS = ("x", "fvec", "fjac", "diag", "ipvt", "qtf", "r", "wa")
+
+
+@structref.register
+class WorkspaceType(types.StructRef):
+    """Numba type of [Workspace][cminpack_numba.Workspace]."""
+
+    def preprocess_fields(
+        self,
+        fields: tuple[tuple[str, types.Type], ...],
+    ) -> tuple[tuple[str, types.Type], ...]:
+        """Remove literal types from the fields."""
+        return tuple((name, types.unliteral(typ)) for name, typ in fields)
+
+
+class Workspace(structref.StructRefProxy):
+    """Buffers reused across calls to the high-level wrappers.
+
+    Create with [workspace][cminpack_numba.workspace] and pass as the `workspace`
+    argument of [lmdif][cminpack_numba.lmdif], [lmder][cminpack_numba.lmder],
+    [lmstr][cminpack_numba.lmstr], [hybrd][cminpack_numba.hybrd] or
+    [hybrj][cminpack_numba.hybrj]. The arrays returned by those functions are views of
+    the workspace, so they are overwritten by the next call using the same workspace.
+
+    The solvers release the GIL, so they can be called concurrently from threads, as
+    long as each thread passes its own workspace, trace and profile, and fcn and udata
+    are safe to share between threads.
+    """
+
+    @property
+    def x(self) -> NDArray[floating]:
+        """Solution, length n."""
+        return _get_x(self)
+
+    @property
+    def fvec(self) -> NDArray[floating]:
+        """Residuals, length m."""
+        return _get_fvec(self)
+
+    @property
+    def fjac(self) -> NDArray[floating]:
+        """Jacobian / QR factorisation, shape (m, n)."""
+        return _get_fjac(self)
+
+    @property
+    def diag(self) -> NDArray[floating]:
+        """Scaling factors, length n."""
+        return _get_diag(self)
+
+    @property
+    def ipvt(self) -> NDArray[int32]:
+        """Permutation of the QR factorisation, length n."""
+        return _get_ipvt(self)
+
+    @property
+    def qtf(self) -> NDArray[floating]:
+        """First n elements of Q^T fvec, length n."""
+        return _get_qtf(self)
+
+    @property
+    def r(self) -> NDArray[floating]:
+        """Packed upper triangular matrix of `hybrd`/`hybrj`, length n(n+1)/2 if m == n."""
+        return _get_r(self)
+
+    @property
+    def wa(self) -> NDArray[floating]:
+        """Work array, length 3n + m."""
+        return _get_wa(self)
+
+
+@njit(cache=True)
+def _get_x(self):
+    return self.x
+
+
+@njit(cache=True)
+def _get_fvec(self):
+    return self.fvec
+
+
+@njit(cache=True)
+def _get_fjac(self):
+    return self.fjac
+
+
+@njit(cache=True)
+def _get_diag(self):
+    return self.diag
+
+
+@njit(cache=True)
+def _get_ipvt(self):
+    return self.ipvt
+
+
+@njit(cache=True)
+def _get_qtf(self):
+    return self.qtf
+
+
+@njit(cache=True)
+def _get_r(self):
+    return self.r
+
+
+@njit(cache=True)
+def _get_wa(self):
+    return self.wa
+
+
+structref.define_proxy(Workspace, WorkspaceType, list(_FIELDS))
+
+
+@njit(cache=True)
+def workspace(m: int32, n: int32, dtype: DTypeLike = float64) -> Workspace:
+    """Allocate the buffers for problems with m functions and n variables.
+
+    Parameters
+    ----------
+    m : int32
+        number of functions, equal to n for `hybrd` and `hybrj`
+    n : int32
+        number of variables
+    dtype : DTypeLike, optional
+        dtype of the arrays, by default float64
+
+    Returns
+    -------
+    Workspace
+        the workspace
+
+    """
+    lr = (n * (n + 1)) // 2 if m == n else 0
+    return Workspace(
+        empty(n, dtype=dtype),
+        empty(m, dtype=dtype),
+        empty((m, n), dtype=dtype),
+        empty(n, dtype=dtype),
+        empty(n, dtype=int32),
+        empty(n, dtype=dtype),
+        empty(lr, dtype=dtype),
+        empty(3 * n + m, dtype=dtype),
+    )
+
+
+def _check_workspace(workspace, dtype):
+    fields = workspace.field_dict
+    _check_dtype(tuple(fields[i] for i in _FIELDS if i != "ipvt"), dtype)
+
+
+@extending.register_jitable
+def _workspace_x_diag(workspace, m, n, x, diag, warm=False):
+    if workspace.fvec.size != m or workspace.x.size != n:
+        msg = "workspace has the wrong size for this problem"
+        raise ValueError(msg)
+    workspace.x[:] = x
+    if diag is None:
+        # a warm start keeps the scaling of the previous solve
+        if not warm:
+            workspace.diag[:] = 1.0
+        return workspace.x, workspace.diag
+    return workspace.x, diag
+
+
+# ------------------------------------ lm buffers ------------------------------------ #
+
+
+def _lm_buffers(workspace, m, n, x, diag):
+    raise NotImplementedError
+
+
+@extending.overload(_lm_buffers)
+def _lm_buffers_overload(workspace, m, n, x, diag):
+    """Buffers of `lmdif`, `lmder` and `lmstr`: x, fvec, fjac, ipvt, qtf, wa, diag."""
+    if workspace is types.none:
+
+        def impl(workspace, m, n, x, diag):
+            fvec = empty(m, dtype=x.dtype)
+            fjac = empty((m, n), dtype=x.dtype)
+            ipvt = empty(n, dtype=int32)
+            qtf = empty(n, dtype=x.dtype)
+            wa = empty(3 * n + m, dtype=x.dtype)
+            _diag = ones(n, dtype=x.dtype) if diag is None else diag
+            return x.copy(), fvec, fjac, ipvt, qtf, wa, _diag
+
+        return impl
+
+    _check_workspace(workspace, x.dtype)
+
+    def impl(workspace, m, n, x, diag):
+        _x, _diag = _workspace_x_diag(workspace, m, n, x, diag)
+        ws = workspace
+        return _x, ws.fvec, ws.fjac, ws.ipvt, ws.qtf, ws.wa, _diag
+
+    return impl
+
+
+# ---------------------------------- hybrd buffers ----------------------------------- #
+
+
+def _hybrd_buffers(workspace, n, x, diag, warm=False):
+    raise NotImplementedError
+
+
+@extending.overload(_hybrd_buffers)
+def _hybrd_buffers_overload(workspace, n, x, diag, warm=False):
+    """Buffers of `hybrd` and `hybrj`: x, fvec, fjac, r, qtf, wa, diag.
+
+    If warm, the buffers of the workspace are returned as left by the previous solve,
+    except for x.
+    """
+    if workspace is types.none:
+
+        def impl(workspace, n, x, diag, warm=False):
+            if warm:
+                msg = "warm_start needs the workspace of the previous solve"
+                raise ValueError(msg)
+            fvec = empty(n, dtype=x.dtype)
+            fjac = empty((n, n), dtype=x.dtype)
+            r = empty((n * (n + 1)) // 2, dtype=x.dtype)
+            qtf = empty(n, dtype=x.dtype)
+            wa = empty(4 * n, dtype=x.dtype)
+            _diag = ones(n, dtype=x.dtype) if diag is None else diag
+            return x.copy(), fvec, fjac, r, qtf, wa, _diag
+
+        return impl
+
+    _check_workspace(workspace, x.dtype)
+
+    def impl(workspace, n, x, diag, warm=False):
+        _x, _diag = _workspace_x_diag(workspace, n, n, x, diag, warm)
+        ws = workspace
+        return _x, ws.fvec, ws.fjac, ws.r, ws.qtf, ws.wa, _diag
+
+    return impl
@@ -1,23 +1,29 @@
-"""_summary_"""
+"""Transforms between bounded external and unbounded internal parameters.
+
+A parameter x with a lower bound l is mapped to the internal parameter
+sqrt((x - l + 1)^2 - 1), with an upper bound u to sqrt((u - x + 1)^2 - 1) and with
+both to arcsin(2 (x - l) / (u - l) - 1), as in MINUIT. The bounds are given either
+as float arrays, with -inf and inf for the missing bounds, or per parameter as tuples
+of floats or None.
+"""
 
-from numba import njit
 from numba.core.errors import NumbaTypeError
-from numba.extending import overload
-from numba.types import NoneType, Number, Optional
+from numba.extending import overload, register_jitable
+from numba.types import Array, NoneType, Number, Optional
 from numpy import arcsin as _arcsin
-from numpy import cos, empty_like, pi, sin
+from numpy import cos, empty_like, isinf, pi, sin
 from numpy import sqrt as _sqrt
 
+from ._caching import njit
+
 
-@njit
+@njit(cache=True)
 def sqrt(x):
-    # print("x=", x)
     return _sqrt(x) if x > 0.0 else 0.0
 
 
-@njit
+@njit(cache=True)
 def arcsin(x):
-    print("hello")
     if x < -1.0:
         return -pi / 2.0
     if x > 1.0:
@@ -25,6 +31,48 @@ def arcsin(x):
     return _arcsin(x)
 
 
+def _vectorized(transform):
+    """Apply the scalar `transform` to the parameters x with the given bounds.
+
+    The bounds are either float arrays, with -inf and inf for the missing bounds, or
+    tuples of floats and None.
+    """
+
+    def apply(x, lower, upper, out):
+        raise NotImplementedError
+
+    @overload(apply)
+    def apply_overload(x, lower, upper, out):
+        if isinstance(lower, Array) and isinstance(upper, Array):
+
+            def impl(x, lower, upper, out):
+                assert lower.size == upper.size == x.size
+                for i in range(x.size):
+                    lower_i, upper_i = lower[i], upper[i]
+                    if isinf(lower_i):
+                        if isinf(upper_i):
+                            out[i] = transform(x[i], None, None)
+                        else:
+                            out[i] = transform(x[i], None, upper_i)
+                    elif isinf(upper_i):
+                        out[i] = transform(x[i], lower_i, None)
+                    else:
+                        out[i] = transform(x[i], lower_i, upper_i)
+                return out
+
+            return impl
+
+        def impl(x, lower, upper, out):
+            assert len(lower) == len(upper) == len(x)
+            for i in range(len(x)):
+                out[i] = transform(x[i], lower[i], upper[i])
+            return out
+
+        return impl
+
+    return apply
+
+
 def _ext2in(xi, lower, upper):
     raise NotImplementedError
 
@@ -72,15 +120,14 @@ def _ext2in_overload(xi, lower, upper):
     raise NumbaTypeError(error_msg)
 
 
-@njit
+_ext2in_vectorized = _vectorized(_ext2in)
+
+
+@njit(cache=True, inline="always")
 def ext2in(x, lower, upper, out=None):
-    assert len(lower) == len(upper) == len(x)
     assert x.ndim == 1
     _out = out if out is not None else empty_like(x)
-    for i in range(len(x)):
-        _out[i] = _ext2in(x[i], lower[i], upper[i])
-
-    return _out
+    return _ext2in_vectorized(x, lower, upper, _out)
 
 
 def _in2ext(xi, lower, upper):
@@ -130,15 +177,14 @@ def _in2ext_overload(xi, lower, upper):
     raise NumbaTypeError(error_msg)
 
 
-@njit
+_in2ext_vectorized = _vectorized(_in2ext)
+
+
+@njit(cache=True, inline="always")
 def in2ext(x, lower, upper, out=None):
-    assert len(lower) == len(upper) == len(x)
     assert x.ndim == 1
     _out = out if out is not None else empty_like(x)
-    for i in range(len(x)):
-        _out[i] = _in2ext(x[i], lower[i], upper[i])
-
-    return _out
+    return _in2ext_vectorized(x, lower, upper, _out)
 
 
 def _in2ext_grad(xi, lower, upper):
@@ -162,7 +208,7 @@ def _in2ext_grad_overload(xi, lower, upper):
 
     if isinstance(lower, NoneType) and isinstance(upper, Number):
 
-        def impl(xi, lowe, upper):
+        def impl(xi, lower, upper):
             return -xi / sqrt(xi * xi + 1.0)
 
     if isinstance(lower, Number) and isinstance(upper, Number):
@@ -188,12 +234,29 @@ def _in2ext_grad_overload(xi, lower, upper):
     raise NumbaTypeError(error_msg)
 
 
-@njit
+_in2ext_grad_vectorized = _vectorized(_in2ext_grad)
+
+
+@njit(cache=True, inline="always")
 def in2ext_grad(x, lower, upper, out=None):
-    assert len(lower) == len(upper) == len(x)
     assert x.ndim == 1
     _out = out if out is not None else empty_like(x)
-    for i in range(len(x)):
-        _out[i] = _in2ext_grad(x[i], lower[i], upper[i])
-
-    return _out
+    return _in2ext_grad_vectorized(x, lower, upper, _out)
+
+
+@register_jitable
+def _to_external(x, fjac, ipvt, lower, upper, wa):
+    """Map the solution x and the R of fjac of the MINPACK drivers to the external x.
+
+    Used by the bounded drivers. The columns of R are divided by the gradient of the
+    external parameters at x, computed in the work array wa of length n, so that R is
+    that of the jacobian with respect to the external parameters, which is singular if
+    x is at one of its bounds.
+    """
+    n = x.size
+    gradient = in2ext_grad(x, lower, upper, wa)
+    in2ext(x, lower, upper, x)
+    r = fjac.reshape((n, fjac.size // n))
+    for k in range(n):
+        r[k, : k + 1] /= gradient[ipvt[k] - 1]
+    return x
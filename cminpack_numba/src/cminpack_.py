@@ -1,17 +1,30 @@
 """Signatures for the cminpack functions."""
 
-import warnings
+from __future__ import annotations
+
+import os
 from ctypes.util import find_library
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from llvmlite import binding
 from numba import types
 
 from .utils import get_extension_path
 
+if TYPE_CHECKING:
+    from numba.core.typing import Signature
+
 __all__ = [
     "Cminpack",
+    "use_blas",
 ]
 
+# Directory the BLAS build of cminpack is loaded from, None for the reference build.
+# The package does not ship the BLAS build, the variable must name its directory.
+_blas = os.environ.get("CMINPACK_NUMBA_BLAS") or None
+
 
 def _apply_prefix(func: str, dtype: types.Float) -> str:
     """Get the cminpack function name with the correct prefix for the given dtype.
@@ -33,55 +46,168 @@ def _apply_prefix(func: str, dtype: types.Float) -> str:
     return f"{_cminpack_prefix[dtype]}{func}"
 
 
-def _ensure_cminpack(dtype: str = "") -> None:
-    """Ensure that the cminpack library is available, in either 64 or 32 bit precision.
+def _resolve_library(path: str) -> str:
+    """Path of a loaded library, `find_library` only returns its soname on linux.
+
+    Parameters
+    ----------
+    path : str
+        The path or soname the library was loaded from
+
+    Returns
+    -------
+    str
+        The path of the library file
+
+    """
+    if Path(path).is_file():
+        return path
+    maps = Path("/proc/self/maps")
+    if maps.is_file():
+        for line in maps.read_text().splitlines():
+            if line.endswith(f"/{path}") or f"/{path}." in line:
+                return line.split(maxsplit=5)[-1]
+    return path
+
+
+@lru_cache(maxsize=None)
+def _load_cminpack(dtype: str = "") -> str:
+    """Find and load the cminpack library, in either 64 or 32 bit precision.
+
+    The library is searched for on first use rather than at import, and its path is
+    cached. The BLAS build is loaded instead if selected with `use_blas`.
 
     Parameters
     ----------
     dtype : str, optional
         "" for double precision, "s" for single precision, by default ""
 
+    Returns
+    -------
+    str
+        The path of the loaded library
+
     Raises
     ------
     ImportError
         If the cminpack/cminpacks library is not found
 
     """
-    if (
-        find_library(f"cminpack{dtype}") is None
-        and get_extension_path(f"cminpack{dtype}") is None
-    ):
-        msg = f"cminpack{dtype} library not found"
+    name = f"cminpack{dtype}"
+    if _blas is None:
+        path = get_extension_path(name) or find_library(name)
+    else:
+        path = get_extension_path(name, _blas)
+    if path is None:
+        where = "" if _blas is None else f" (BLAS build) in {_blas}"
+        msg = f"{name} library not found{where}"
         raise ImportError(msg)
+    binding.load_library_permanently(path)
+    return _resolve_library(path)
 
 
-# Load double and single precision libraries
-try:
-    _cminpack_path = get_extension_path("cminpack") or find_library("cminpack")
-    _ensure_cminpack()
-    CMINPACK = True
-    binding.load_library_permanently(_cminpack_path)
-except ImportError:
-    warnings.warn(
-        "cminpack not found. Double precision functions unavailable.",
-        stacklevel=1,
-    )
-    CMINPACK = False
-try:
-    _cminpacks_path = get_extension_path("cminpacks") or find_library("cminpacks")
-    _ensure_cminpack("s")
-    CMINPACKS = True
-    binding.load_library_permanently(_cminpacks_path)
-except ImportError:
-    warnings.warn(
-        "cminpacks not found. Single precision functions unavailable.",
-        stacklevel=1,
+def use_blas(directory: str | None) -> None:
+    """Select a BLAS/LAPACK build of cminpack, or the reference build.
+
+    The BLAS build uses LAPACK's `geqp3` for the QR factorizations of lmdif, lmder
+    and lmstr, and BLAS in `enorm`, `lmpar` and `qrsolv`, which is much faster for n
+    in the hundreds. The package only ships the reference build: the BLAS build must
+    be built separately, see the README. Both builds export the same symbols, so only
+    one can be loaded in a process: call this before the first use of any solver, or
+    set the CMINPACK_NUMBA_BLAS environment variable to the directory of the build
+    before starting python.
+
+    Parameters
+    ----------
+    directory : str | None
+        directory of the libcminpack and libcminpacks libraries of the BLAS build,
+        None for the reference build shipped with the package
+
+    Raises
+    ------
+    RuntimeError
+        If a different cminpack library has already been loaded
+
+    """
+    global _blas  # noqa: PLW0603
+    if directory != _blas and _load_cminpack.cache_info().currsize:
+        msg = "use_blas must be called before the cminpack library is first used"
+        raise RuntimeError(msg)
+    _blas = directory
+
+
+def _has_cminpack(dtype: str = "") -> bool:
+    """Whether the cminpack library is available, in either 64 or 32 bit precision.
+
+    Parameters
+    ----------
+    dtype : str, optional
+        "" for double precision, "s" for single precision, by default ""
+
+    Returns
+    -------
+    bool
+        True if the library is found
+
+    """
+    try:
+        _load_cminpack(dtype)
+    except ImportError:
+        return False
+    return True
+
+
+def _has_symbol(func: str, dtype: str = "") -> bool:
+    """Whether the cminpack library exports a function, in either 64 or 32 bit precision.
+
+    cminpack.h only marks the drivers, fdjac1, fdjac2 and a few utilities for export, so
+    a Windows DLL built without exporting all symbols lacks the internal subroutines.
+
+    Parameters
+    ----------
+    func : str
+        The function name, without the precision prefix
+    dtype : str, optional
+        "" for double precision, "s" for single precision, by default ""
+
+    Returns
+    -------
+    bool
+        True if the library is found and exports the function
+
+    """
+    return (
+        _has_cminpack(dtype) and binding.address_of_symbol(f"{dtype}{func}") is not None
     )
-    CMINPACKS = False
 
-if not (CMINPACK or CMINPACKS):
-    _msg = "cminpack & cminpacks not found."
-    raise ImportError(_msg)
+
+def _external_function(
+    func: str,
+    dtype: types.Float,
+    sig: Signature,
+) -> types.ExternalFunction:
+    """Load the cminpack library for the given dtype and return one of its functions.
+
+    Parameters
+    ----------
+    func : str
+        The function name
+    dtype : types.Float
+        The dtype
+    sig : Signature
+        The signature of the function
+
+    Returns
+    -------
+    types.ExternalFunction
+        The external function
+
+    """
+    _load_cminpack(_apply_prefix("", dtype))
+    if not _has_symbol(func, _apply_prefix("", dtype)):
+        msg = f"{_apply_prefix(func, dtype)} is not exported by the cminpack library"
+        raise ImportError(msg)
+    return types.ExternalFunction(_apply_prefix(func, dtype), sig)
 
 
 class Cminpack:
@@ -116,7 +242,59 @@ class Cminpack:
             types.int32,  # mode
             types.CPointer(dtype),  # *err
         )
-        return types.ExternalFunction(_apply_prefix("chkder", dtype), sig)
+        return _external_function("chkder", dtype, sig)
+
+    @staticmethod
+    def covar(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for covar.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for covar
+
+        """
+        sig = types.void(
+            types.int32,  # n
+            types.CPointer(dtype),  # *r
+            types.int32,  # ldr
+            types.CPointer(types.int32),  # *ipvt
+            dtype,  # tol
+            types.CPointer(dtype),  # *wa
+        )
+        return _external_function("covar", dtype, sig)
+
+    @staticmethod
+    def covar1(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for covar1.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for covar1
+
+        """
+        sig = types.int32(
+            types.int32,  # m
+            types.int32,  # n
+            dtype,  # fsumsq
+            types.CPointer(dtype),  # *r
+            types.int32,  # ldr
+            types.CPointer(types.int32),  # *ipvt
+            dtype,  # tol
+            types.CPointer(dtype),  # *wa
+        )
+        return _external_function("covar1", dtype, sig)
 
     @staticmethod
     def dpmpar(dtype: types.Float) -> types.ExternalFunction:
@@ -134,7 +312,7 @@ class Cminpack:
 
         """
         sig = dtype(types.int32)
-        return types.ExternalFunction(_apply_prefix("dpmpar", dtype), sig)
+        return _external_function("dpmpar", dtype, sig)
 
     @staticmethod
     def enorm(dtype: types.Float) -> types.ExternalFunction:
@@ -155,7 +333,7 @@ class Cminpack:
             types.int32,  # n
             types.CPointer(dtype),  # *x
         )
-        return types.ExternalFunction(_apply_prefix("enorm", dtype), sig)
+        return _external_function("enorm", dtype, sig)
 
     @staticmethod
     def hybrd(dtype: types.Float) -> types.ExternalFunction:
@@ -198,7 +376,7 @@ class Cminpack:
             types.CPointer(dtype),  # *wa3
             types.CPointer(dtype),  # *wa4
         )
-        return types.ExternalFunction(_apply_prefix("hybrd", dtype), sig)
+        return _external_function("hybrd", dtype, sig)
 
     @staticmethod
     def hybrd1(dtype: types.Float) -> types.ExternalFunction:
@@ -225,7 +403,7 @@ class Cminpack:
             types.CPointer(dtype),  # *wa
             types.int32,  # lwa
         )
-        return types.ExternalFunction(_apply_prefix("hybrd1", dtype), sig)
+        return _external_function("hybrd1", dtype, sig)
 
     @staticmethod
     def hybrj(dtype: types.Float) -> types.ExternalFunction:
@@ -266,7 +444,7 @@ class Cminpack:
             types.CPointer(dtype),  # *wa3
             types.CPointer(dtype),  # *wa4
         )
-        return types.ExternalFunction(_apply_prefix("hybrj", dtype), sig)
+        return _external_function("hybrj", dtype, sig)
 
     @staticmethod
     def hybrj1(dtype: types.Float) -> types.ExternalFunction:
@@ -295,7 +473,7 @@ class Cminpack:
             types.CPointer(dtype),  # *wa
             types.int32,  # lwa
         )
-        return types.ExternalFunction(_apply_prefix("hybrj1", dtype), sig)
+        return _external_function("hybrj1", dtype, sig)
 
     @staticmethod
     def lmdif(dtype: types.Float) -> types.ExternalFunction:
@@ -338,7 +516,7 @@ class Cminpack:
             types.CPointer(dtype),  # *wa3
             types.CPointer(dtype),  # *wa4
         )
-        return types.ExternalFunction(_apply_prefix("lmdif", dtype), sig)
+        return _external_function("lmdif", dtype, sig)
 
     @staticmethod
     def lmdif1(dtype: types.Float) -> types.ExternalFunction:
@@ -367,7 +545,7 @@ class Cminpack:
             types.CPointer(dtype),  # *wa
             types.int32,  # lwa
         )
-        return types.ExternalFunction(_apply_prefix("lmdif1", dtype), sig)
+        return _external_function("lmdif1", dtype, sig)
 
     @staticmethod
     def lmder(dtype: types.Float) -> types.ExternalFunction:
@@ -410,7 +588,7 @@ class Cminpack:
             types.CPointer(dtype),  # *wa3
             types.CPointer(dtype),  # *wa4
         )
-        return types.ExternalFunction(_apply_prefix("lmder", dtype), sig)
+        return _external_function("lmder", dtype, sig)
 
     @staticmethod
     def lmder1(dtype: types.Float) -> types.ExternalFunction:
@@ -441,7 +619,7 @@ class Cminpack:
             types.CPointer(dtype),  # *wa
             types.int32,  # lwa
         )
-        return types.ExternalFunction(_apply_prefix("lmder1", dtype), sig)
+        return _external_function("lmder1", dtype, sig)
 
     @staticmethod
     def lmstr(
@@ -486,7 +664,7 @@ class Cminpack:
             types.CPointer(dtype),  # *wa3
             types.CPointer(dtype),  # *wa4
         )
-        return types.ExternalFunction(_apply_prefix("lmstr", dtype), sig)
+        return _external_function("lmstr", dtype, sig)
 
     @staticmethod
     def lmstr1(dtype: types.Float) -> types.ExternalFunction:
@@ -517,4 +695,285 @@ class Cminpack:
             types.CPointer(dtype),  # *wa
             types.int32,  # lwa
         )
-        return types.ExternalFunction(_apply_prefix("lmstr1", dtype), sig)
+        return _external_function("lmstr1", dtype, sig)
+
+    # ------------------------- internal MINPACK subroutines ------------------------- #
+
+    @staticmethod
+    def fdjac2(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for fdjac2.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for fdjac2
+
+        """
+        sig = types.int32(
+            types.voidptr,  # fcn
+            types.voidptr,  # *p / *udata
+            types.int32,  # m
+            types.int32,  # n
+            types.CPointer(dtype),  # *x
+            types.CPointer(dtype),  # *fvec
+            types.CPointer(dtype),  # *fjac
+            types.int32,  # ldfjac
+            dtype,  # epsfcn
+            types.CPointer(dtype),  # *wa
+        )
+        return _external_function("fdjac2", dtype, sig)
+
+    @staticmethod
+    def fdjac1(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for fdjac1.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for fdjac1
+
+        """
+        sig = types.int32(
+            types.voidptr,  # fcn
+            types.voidptr,  # *p / *udata
+            types.int32,  # n
+            types.CPointer(dtype),  # *x
+            types.CPointer(dtype),  # *fvec
+            types.CPointer(dtype),  # *fjac
+            types.int32,  # ldfjac
+            types.int32,  # ml
+            types.int32,  # mu
+            dtype,  # epsfcn
+            types.CPointer(dtype),  # *wa1
+            types.CPointer(dtype),  # *wa2
+        )
+        return _external_function("fdjac1", dtype, sig)
+
+    @staticmethod
+    def dogleg(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for dogleg.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for dogleg
+
+        """
+        sig = types.void(
+            types.int32,  # n
+            types.CPointer(dtype),  # *r
+            types.int32,  # lr
+            types.CPointer(dtype),  # *diag
+            types.CPointer(dtype),  # *qtb
+            dtype,  # delta
+            types.CPointer(dtype),  # *x
+            types.CPointer(dtype),  # *wa1
+            types.CPointer(dtype),  # *wa2
+        )
+        return _external_function("dogleg", dtype, sig)
+
+    @staticmethod
+    def qrfac(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for qrfac.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for qrfac
+
+        """
+        sig = types.void(
+            types.int32,  # m
+            types.int32,  # n
+            types.CPointer(dtype),  # *a
+            types.int32,  # lda
+            types.int32,  # pivot
+            types.CPointer(types.int32),  # *ipvt
+            types.int32,  # lipvt
+            types.CPointer(dtype),  # *rdiag
+            types.CPointer(dtype),  # *acnorm
+            types.CPointer(dtype),  # *wa
+        )
+        return _external_function("qrfac", dtype, sig)
+
+    @staticmethod
+    def qrsolv(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for qrsolv.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for qrsolv
+
+        """
+        sig = types.void(
+            types.int32,  # n
+            types.CPointer(dtype),  # *r
+            types.int32,  # ldr
+            types.CPointer(types.int32),  # *ipvt
+            types.CPointer(dtype),  # *diag
+            types.CPointer(dtype),  # *qtb
+            types.CPointer(dtype),  # *x
+            types.CPointer(dtype),  # *sdiag
+            types.CPointer(dtype),  # *wa
+        )
+        return _external_function("qrsolv", dtype, sig)
+
+    @staticmethod
+    def qform(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for qform.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for qform
+
+        """
+        sig = types.void(
+            types.int32,  # m
+            types.int32,  # n
+            types.CPointer(dtype),  # *q
+            types.int32,  # ldq
+            types.CPointer(dtype),  # *wa
+        )
+        return _external_function("qform", dtype, sig)
+
+    @staticmethod
+    def r1updt(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for r1updt.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for r1updt
+
+        """
+        sig = types.void(
+            types.int32,  # m
+            types.int32,  # n
+            types.CPointer(dtype),  # *s
+            types.int32,  # ls
+            types.CPointer(dtype),  # *u
+            types.CPointer(dtype),  # *v
+            types.CPointer(dtype),  # *w
+            types.CPointer(types.int32),  # *sing
+        )
+        return _external_function("r1updt", dtype, sig)
+
+    @staticmethod
+    def r1mpyq(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for r1mpyq.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for r1mpyq
+
+        """
+        sig = types.void(
+            types.int32,  # m
+            types.int32,  # n
+            types.CPointer(dtype),  # *a
+            types.int32,  # lda
+            types.CPointer(dtype),  # *v
+            types.CPointer(dtype),  # *w
+        )
+        return _external_function("r1mpyq", dtype, sig)
+
+    @staticmethod
+    def lmpar(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for lmpar.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for lmpar
+
+        """
+        sig = types.void(
+            types.int32,  # n
+            types.CPointer(dtype),  # *r
+            types.int32,  # ldr
+            types.CPointer(types.int32),  # *ipvt
+            types.CPointer(dtype),  # *diag
+            types.CPointer(dtype),  # *qtb
+            dtype,  # delta
+            types.CPointer(dtype),  # *par
+            types.CPointer(dtype),  # *x
+            types.CPointer(dtype),  # *sdiag
+            types.CPointer(dtype),  # *wa1
+            types.CPointer(dtype),  # *wa2
+        )
+        return _external_function("lmpar", dtype, sig)
+
+    @staticmethod
+    def rwupdt(dtype: types.Float) -> types.ExternalFunction:
+        """Return the external function for rwupdt.
+
+        Parameters
+        ----------
+        dtype : types.Float
+            The dtype
+
+        Returns
+        -------
+        types.ExternalFunction
+            The external function for rwupdt
+
+        """
+        sig = types.void(
+            types.int32,  # n
+            types.CPointer(dtype),  # *r
+            types.int32,  # ldr
+            types.CPointer(dtype),  # *w
+            types.CPointer(dtype),  # *b
+            types.CPointer(dtype),  # *alpha
+            types.CPointer(dtype),  # *cos
+            types.CPointer(dtype),  # *sin
+        )
+        return _external_function("rwupdt", dtype, sig)
@@ -0,0 +1,23 @@
+"""Numba implementation of the MINPACK solvers taking njit functions."""
+
+from ._hybrd import fdjac1, fdjac1_parallel, hybrd, hybrj
+from ._lm import fdjac2, fdjac2_parallel, lmder, lmdif
+from ._lmstr import lmstr_stream
+from ._minpack import enorm
+from ._sparse import bandwidth, color_columns, fdjac2_sparse
+
+__all__ = [
+    "bandwidth",
+    "color_columns",
+    "enorm",
+    "fdjac1",
+    "fdjac1_parallel",
+    "fdjac2",
+    "fdjac2_parallel",
+    "fdjac2_sparse",
+    "hybrd",
+    "hybrj",
+    "lmder",
+    "lmdif",
+    "lmstr_stream",
+]
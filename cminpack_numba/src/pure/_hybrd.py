@@ -0,0 +1,722 @@
+"""Numba ports of the `hybrd` and `hybrj` solvers."""
+
+from __future__ import annotations
+
+from math import sqrt
+from typing import TYPE_CHECKING
+
+from numba import njit, prange
+from numpy import empty, finfo, floating, int32
+
+from .._result import HybrdResult, HybrjResult, _output
+from .._workspace import _hybrd_buffers
+from ..utils import _NCHUNKS
+from ._minpack import _axpy, _dot, dogleg, enorm, qform, qrfac, r1mpyq, r1updt
+
+if TYPE_CHECKING:
+    from numba.core.dispatcher import Dispatcher
+    from numpy.typing import NDArray
+
+    from .._workspace import Workspace
+
+# The functions taking the user's function are not cached: they are specialised for
+# each function, which numba cannot cache across processes.
+
+
+@njit(error_model="numpy")
+def fdjac1(fcn, udata, n, x, fvec, fjac, ml, mu, epsfcn, wa1, wa2):
+    """Forward-difference approximation of the n by n jacobian of `fcn` at x.
+
+    If the jacobian is banded, with ml sub- and mu super-diagonals, and
+    ml + mu + 1 < n, the columns are perturbed in groups of ml + mu + 1 columns
+    which do not interact, with a single evaluation of fcn per group.
+    """
+    eps = sqrt(max(epsfcn, finfo(x.dtype).eps))
+    msum = ml + mu + 1
+    if msum >= n:
+        for j in range(n):
+            temp = x[j]
+            h = eps * abs(temp)
+            if h == 0.0:
+                h = eps
+            x[j] = temp + h
+            # iflag = 2 tells the function this is a jacobian evaluation
+            iflag = fcn(udata, n, x, wa1, 2)
+            if iflag < 0:
+                return iflag
+            x[j] = temp
+            for i in range(n):
+                fjac[i, j] = (wa1[i] - fvec[i]) / h
+        return 0
+
+    for k in range(msum):
+        for j in range(k, n, msum):
+            wa2[j] = x[j]
+            h = eps * abs(wa2[j])
+            if h == 0.0:
+                h = eps
+            x[j] = wa2[j] + h
+        iflag = fcn(udata, n, x, wa1, 1)
+        if iflag < 0:
+            return iflag
+        for j in range(k, n, msum):
+            x[j] = wa2[j]
+            h = eps * abs(wa2[j])
+            if h == 0.0:
+                h = eps
+            for i in range(n):
+                fjac[i, j] = 0.0
+                if j - mu <= i <= j + ml:
+                    fjac[i, j] = (wa1[i] - fvec[i]) / h
+    return 0
+
+
+@njit(parallel=True, error_model="numpy")
+def fdjac1_parallel(fcn, udata, n, x, fvec, fjac, ml, mu, epsfcn):
+    """`fdjac1` evaluating the columns, or groups of columns, in parallel.
+
+    The columns, or the groups of columns of a banded jacobian, are split into chunks
+    run in parallel, each perturbing its own copy of x, so fcn must be safe to call
+    concurrently. The jacobian is the same as the one computed by `fdjac1`, but all
+    the columns are evaluated even if fcn returns a negative value for one of them.
+    """
+    eps = sqrt(max(epsfcn, finfo(x.dtype).eps))
+    msum = ml + mu + 1
+    dense = msum >= n
+    # a dense jacobian is a banded one with groups of a single column
+    ngroups = n if dense else msum
+    iflag = 2 if dense else 1
+    iflags = empty(ngroups, dtype=int32)
+    nchunks = min(ngroups, _NCHUNKS)
+    for c in prange(nchunks):
+        xp = x.copy()
+        wa = empty(n, dtype=x.dtype)
+        for k in range(c * ngroups // nchunks, (c + 1) * ngroups // nchunks):
+            for j in range(k, n, ngroups):
+                h = eps * abs(x[j])
+                if h == 0.0:
+                    h = eps
+                xp[j] = x[j] + h
+            iflags[k] = fcn(udata, n, xp, wa, iflag)
+            for j in range(k, n, ngroups):
+                xp[j] = x[j]
+                h = eps * abs(x[j])
+                if h == 0.0:
+                    h = eps
+                for i in range(n):
+                    if dense or j - mu <= i <= j + ml:
+                        fjac[i, j] = (wa[i] - fvec[i]) / h
+                    else:
+                        fjac[i, j] = 0.0
+    for k in range(ngroups):
+        if iflags[k] < 0:
+            return iflags[k]
+    return 0
+
+
+# ------------------------------- function calls ------------------------------- #
+
+
+@njit(error_model="numpy")
+def _hybrd_fun(fcn, udata, n, x, fvec, fjac, iflag):
+    return fcn(udata, n, x, fvec, iflag)
+
+
+@njit(error_model="numpy")
+def _hybrd_jac(fcn, udata, n, x, fvec, fjac, ml, mu, epsfcn, wa1, wa2):
+    return fdjac1(fcn, udata, n, x, fvec, fjac, ml, mu, epsfcn, wa1, wa2), min(
+        ml + mu + 1,
+        n,
+    )
+
+
+@njit(error_model="numpy")
+def _hybrd_jac_parallel(fcn, udata, n, x, fvec, fjac, ml, mu, epsfcn, wa1, wa2):
+    return fdjac1_parallel(fcn, udata, n, x, fvec, fjac, ml, mu, epsfcn), min(
+        ml + mu + 1,
+        n,
+    )
+
+
+@njit(error_model="numpy")
+def _hybrj_fun(fcn, udata, n, x, fvec, fjac, iflag):
+    return fcn(udata, n, x, fvec, fjac, iflag)
+
+
+@njit(error_model="numpy")
+def _hybrj_jac(fcn, udata, n, x, fvec, fjac, ml, mu, epsfcn, wa1, wa2):
+    return fcn(udata, n, x, fvec, fjac, 2), 0
+
+
+# ---------------------------------- powell ------------------------------------ #
+
+
+@njit(error_model="numpy")
+def _powell_iterate(
+    fun,
+    jac,
+    fcn,
+    udata,
+    x,
+    fvec,
+    fjac,
+    xtol,
+    maxfev,
+    ml,
+    mu,
+    epsfcn,
+    diag,
+    mode,
+    factor,
+    nprint,
+    warm,
+    r,
+    qtf,
+    wa1,
+    wa2,
+    wa3,
+    wa4,
+):
+    """Body of `hybrd`/`hybrj`, returning iflag, info, nfev and njev.
+
+    If warm, fjac, r, qtf and diag hold the Q and R factors of the jacobian, and the
+    scaling, left by a previous solve, which are used for the first iterations
+    instead of a new jacobian at x.
+    """
+    n = x.size
+    epsmch = finfo(x.dtype).eps
+    info = 0
+    nfev = 0
+    njev = 0
+
+    if (
+        n <= 0
+        or xtol < 0.0
+        or maxfev <= 0
+        or ml < 0
+        or mu < 0
+        or factor <= 0.0
+        or r.size < (n * (n + 1)) // 2
+    ):
+        return 0, info, nfev, njev
+    if mode == 2:
+        for j in range(n):
+            if diag[j] <= 0.0:
+                return 0, info, nfev, njev
+
+    iflag = fun(fcn, udata, n, x, fvec, fjac, 1)
+    nfev = 1
+    if iflag < 0:
+        return iflag, info, nfev, njev
+    fnorm = enorm(fvec)
+
+    iwa = empty(1, dtype=int32)
+    qtf2d = qtf.reshape((1, n))
+    delta = 0.0
+    xnorm = 0.0
+    it = 1
+    ncsuc = 0
+    ncfail = 0
+    nslow1 = 0
+    nslow2 = 0
+    while True:
+        jeval = True
+
+        if warm:
+            # start from the q and r factors of the previous solve, as after a
+            # broyden update, instead of evaluating the jacobian at x
+            warm = False
+            jeval = False
+            for j in range(n):
+                wa3[j] = diag[j] * x[j]
+                qtf[j] = _dot(fjac[:, j], fvec)
+            xnorm = enorm(wa3)
+            delta = factor * xnorm
+            if delta == 0.0:
+                delta = factor
+        else:
+            # jacobian and its qr factorisation
+            iflag, jac_nfev = jac(
+                fcn, udata, n, x, fvec, fjac, ml, mu, epsfcn, wa1, wa2
+            )
+            nfev += jac_nfev
+            njev += 1
+            if iflag < 0:
+                return iflag, info, nfev, njev
+            qrfac(fjac, False, iwa, wa1, wa2, wa3)
+
+            # on the first iteration, scale according to the norms of the columns of
+            # the jacobian and initialise the step bound delta
+            if it == 1:
+                if mode != 2:
+                    for j in range(n):
+                        diag[j] = wa2[j]
+                        if wa2[j] == 0.0:
+                            diag[j] = 1.0
+                for j in range(n):
+                    wa3[j] = diag[j] * x[j]
+                xnorm = enorm(wa3)
+                delta = factor * xnorm
+                if delta == 0.0:
+                    delta = factor
+
+            # q^T fvec, stored in qtf
+            for i in range(n):
+                qtf[i] = fvec[i]
+            for j in range(n):
+                if fjac[j, j] != 0.0:
+                    temp = -_dot(fjac[j:, j], qtf[j:]) / fjac[j, j]
+                    _axpy(temp, fjac[j:, j], qtf[j:])
+
+            # copy the triangular factor of the qr factorisation into r
+            for j in range(n):
+                l = j
+                for i in range(j):
+                    r[l] = fjac[i, j]
+                    l += n - i - 1
+                r[l] = wa1[j]
+
+            # accumulate the orthogonal factor in fjac
+            qform(fjac, n, wa1)
+
+            if mode != 2:
+                for j in range(n):
+                    diag[j] = max(diag[j], wa2[j])
+
+        while True:
+            if nprint > 0:
+                iflag = 0
+                if (it - 1) % nprint == 0:
+                    iflag = fun(fcn, udata, n, x, fvec, fjac, 0)
+                if iflag < 0:
+                    return iflag, info, nfev, njev
+
+            # dogleg direction
+            dogleg(r, diag, qtf, delta, wa1, wa2, wa3)
+            for j in range(n):
+                wa1[j] = -wa1[j]
+                wa2[j] = x[j] + wa1[j]
+                wa3[j] = diag[j] * wa1[j]
+            pnorm = enorm(wa3)
+            if it == 1:
+                delta = min(delta, pnorm)
+
+            iflag = fun(fcn, udata, n, wa2, wa4, fjac, 1)
+            nfev += 1
+            if iflag < 0:
+                return iflag, info, nfev, njev
+            fnorm1 = enorm(wa4)
+
+            # actual and predicted reductions
+            actred = -1.0
+            if fnorm1 < fnorm:
+                d = fnorm1 / fnorm
+                actred = 1.0 - d * d
+            l = 0
+            for i in range(n):
+                wa3[i] = qtf[i] + _dot(r[l : l + n - i], wa1[i:])
+                l += n - i
+            temp = enorm(wa3)
+            prered = 0.0
+            if temp < fnorm:
+                d = temp / fnorm
+                prered = 1.0 - d * d
+            ratio = 0.0
+            if prered > 0.0:
+                ratio = actred / prered
+
+            # update the step bound
+            if ratio < 0.1:
+                ncsuc = 0
+                ncfail += 1
+                delta = 0.5 * delta
+            else:
+                ncfail = 0
+                ncsuc += 1
+                if ratio >= 0.5 or ncsuc > 1:
+                    delta = max(delta, pnorm / 0.5)
+                if abs(ratio - 1.0) <= 0.1:
+                    delta = pnorm / 0.5
+
+            # accept the step if it reduced the norm sufficiently
+            if ratio >= 1e-4:
+                for j in range(n):
+                    x[j] = wa2[j]
+                    wa2[j] = diag[j] * x[j]
+                    fvec[j] = wa4[j]
+                xnorm = enorm(wa2)
+                fnorm = fnorm1
+                it += 1
+
+            # progress of the iteration
+            nslow1 += 1
+            if actred >= 0.001:
+                nslow1 = 0
+            if jeval:
+                nslow2 += 1
+            if actred >= 0.1:
+                nslow2 = 0
+
+            # convergence and termination tests
+            if delta <= xtol * xnorm or fnorm == 0.0:
+                info = 1
+                return iflag, info, nfev, njev
+            if nfev >= maxfev:
+                info = 2
+            if 0.1 * max(0.1 * delta, pnorm) <= epsmch * xnorm:
+                info = 3
+            if nslow2 == 5:
+                info = 4
+            if nslow1 == 10:
+                info = 5
+            if info != 0:
+                return iflag, info, nfev, njev
+
+            # recompute the jacobian after two consecutive failures
+            if ncfail == 2:
+                break
+
+            # broyden rank-1 update of the jacobian
+            for j in range(n):
+                s = _dot(fjac[:, j], wa4)
+                wa2[j] = (s - wa3[j]) / pnorm
+                wa1[j] = diag[j] * ((diag[j] * wa1[j]) / pnorm)
+                if ratio >= 1e-4:
+                    qtf[j] = s
+            r1updt(n, n, r, wa1, wa2, wa3)
+            r1mpyq(fjac, wa2, wa3)
+            r1mpyq(qtf2d, wa2, wa3)
+            jeval = False
+
+
+@njit(error_model="numpy")
+def _powell(
+    fun,
+    jac,
+    fcn,
+    udata,
+    x,
+    fvec,
+    fjac,
+    xtol,
+    maxfev,
+    ml,
+    mu,
+    epsfcn,
+    diag,
+    mode,
+    factor,
+    nprint,
+    warm,
+    r,
+    qtf,
+    wa1,
+    wa2,
+    wa3,
+    wa4,
+):
+    """Powell hybrid driver shared by `hybrd` and `hybrj`."""
+    n = x.size
+    iflag, info, nfev, njev = _powell_iterate(
+        fun,
+        jac,
+        fcn,
+        udata,
+        x,
+        fvec,
+        fjac,
+        xtol,
+        maxfev,
+        ml,
+        mu,
+        epsfcn,
+        diag,
+        mode,
+        factor,
+        nprint,
+        warm,
+        r,
+        qtf,
+        wa1,
+        wa2,
+        wa3,
+        wa4,
+    )
+    if iflag < 0:
+        info = iflag
+    if nprint > 0:
+        fun(fcn, udata, n, x, fvec, fjac, 0)
+    return info, nfev, njev
+
+
+# ----------------------------------- hybrd ------------------------------------ #
+
+
+@njit(error_model="numpy", nogil=True)
+def hybrd(
+    fcn: Dispatcher,
+    x: NDArray[floating],
+    xtol: floating | None = None,
+    maxfev: int32 | None = None,
+    ml: int32 | None = None,
+    mu: int32 | None = None,
+    epsfcn: floating | None = None,
+    diag: NDArray[floating] | None = None,
+    mode: int32 | None = None,
+    factor: floating | None = None,
+    nprint: int32 | None = None,
+    udata: object = None,
+    workspace: Workspace | None = None,
+    parallel: bool | None = None,
+    full_output: bool | None = None,
+    warm_start: bool | None = None,
+) -> HybrdResult:
+    """Find a zero of n functions in n variables with a forward-difference jacobian.
+
+    Numba implementation of [hybrd][cminpack_numba.hybrd] taking an njit function,
+    which is compiled together with the solver, so that it can be inlined.
+
+    Parameters
+    ----------
+    fcn : Dispatcher
+        njit function `fcn(udata, n, x, fvec, iflag) -> int` computing the n
+        functions at x in fvec. iflag is 1 (or 2 during the approximation of the
+        jacobian), or 0 to print if nprint > 0. Return a negative value to stop.
+    x : NDArray[floating]
+        initial estimate of the solution
+    xtol : floating | None, optional
+        relative error desired in the solution, by default 1.49012e-8
+    maxfev : int32 | None, optional
+        maximum number of calls to fcn, by default 200 * (n + 1)
+    ml : int32 | None, optional
+        number of subdiagonals of a banded jacobian, see `bandwidth`, by default n
+    mu : int32 | None, optional
+        number of superdiagonals of a banded jacobian, by default n
+    epsfcn : floating | None, optional
+        step length for the forward-difference approximation, by default the machine
+        precision of x.dtype
+    diag : NDArray[floating] | None, optional
+        multiplicative scale factors of the variables, by default None
+    mode : int32 | None, optional
+        1 to scale the variables internally, 2 to use diag, by default 1
+    factor : floating | None, optional
+        initial step bound, by default 100.0
+    nprint : int32 | None, optional
+        call fcn with iflag 0 every nprint iterations if positive, by default 0
+    udata : object, optional
+        passed as is to fcn, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    parallel : bool | None, optional
+        evaluate the columns of the forward-difference jacobian in parallel with
+        `fdjac1_parallel`, for expensive functions, by default False
+    full_output : bool | None, optional
+        if False, fjac, r and qtf are empty in the result, which then does not keep
+        the solver's buffers alive, by default True
+    warm_start : bool | None, optional
+        continue from the previous solve using `workspace`, e.g. along a parameter
+        path: the Q and R factors of its jacobian (fjac and r) are reused for the
+        first iterations instead of approximating a jacobian at x, and so are its
+        scaling factors if diag is None. The jacobian is approximated after two
+        consecutive failed steps, as usual, by default False
+
+    Returns
+    -------
+    HybrdResult
+        x, fvec, fjac, r, qtf, nfev and info, as returned by
+        [hybrd][cminpack_numba.hybrd]
+
+    """
+    n = int32(x.size)
+    warm = warm_start is not None and warm_start
+    x, fvec, fjac, r, qtf, wa, diag = _hybrd_buffers(workspace, n, x, diag, warm)
+    wa1 = wa[:n]
+    wa2 = wa[n : 2 * n]
+    wa3 = wa[2 * n : 3 * n]
+    wa4 = wa[3 * n :]
+    xtol = xtol or 1.49012e-8
+    maxfev = maxfev or 200 * (n + 1)
+    ml = n if ml is None else ml
+    mu = n if mu is None else mu
+    epsfcn = epsfcn or finfo(x.dtype).eps
+    mode = mode or 1
+    factor = factor or 100.0
+    nprint = nprint or 0
+    # checking for None lets numba prune the parallel branch if parallel is omitted
+    if parallel is not None and parallel:
+        info, nfev, _ = _powell(
+            _hybrd_fun,
+            _hybrd_jac_parallel,
+            fcn,
+            udata,
+            x,
+            fvec,
+            # column-major view: the memory has the same layout as cminpack's fjac
+            fjac.T,
+            xtol,
+            maxfev,
+            ml,
+            mu,
+            epsfcn,
+            diag,
+            mode,
+            factor,
+            nprint,
+            warm,
+            r,
+            qtf,
+            wa1,
+            wa2,
+            wa3,
+            wa4,
+        )
+    else:
+        info, nfev, _ = _powell(
+            _hybrd_fun,
+            _hybrd_jac,
+            fcn,
+            udata,
+            x,
+            fvec,
+            # column-major view: the memory has the same layout as cminpack's fjac
+            fjac.T,
+            xtol,
+            maxfev,
+            ml,
+            mu,
+            epsfcn,
+            diag,
+            mode,
+            factor,
+            nprint,
+            warm,
+            r,
+            qtf,
+            wa1,
+            wa2,
+            wa3,
+            wa4,
+        )
+    return HybrdResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        _output(r, full_output),
+        _output(qtf, full_output),
+        nfev,
+        info,
+    )
+
+
+# ----------------------------------- hybrj ------------------------------------ #
+
+
+@njit(error_model="numpy", nogil=True)
+def hybrj(
+    fcn: Dispatcher,
+    x: NDArray[floating],
+    xtol: floating | None = None,
+    maxfev: int32 | None = None,
+    diag: NDArray[floating] | None = None,
+    mode: int32 | None = None,
+    factor: floating | None = None,
+    nprint: int32 | None = None,
+    udata: object = None,
+    workspace: Workspace | None = None,
+    full_output: bool | None = None,
+    warm_start: bool | None = None,
+) -> HybrjResult:
+    """Find a zero of n functions in n variables with a user supplied jacobian.
+
+    Numba implementation of [hybrj][cminpack_numba.hybrj] taking an njit function,
+    which is compiled together with the solver, so that it can be inlined.
+
+    Parameters
+    ----------
+    fcn : Dispatcher
+        njit function `fcn(udata, n, x, fvec, fjac, iflag) -> int` computing the n
+        functions at x in fvec if iflag is 1, or the (n, n) jacobian `fjac[i, j]` if
+        iflag is 2. iflag is 0 to print if nprint > 0. Return a negative value to
+        stop.
+    x : NDArray[floating]
+        initial estimate of the solution
+    xtol : floating | None, optional
+        relative error desired in the solution, by default 1.49012e-8
+    maxfev : int32 | None, optional
+        maximum number of calls to fcn with iflag 1, by default 200 * (n + 1)
+    diag : NDArray[floating] | None, optional
+        multiplicative scale factors of the variables, by default None
+    mode : int32 | None, optional
+        1 to scale the variables internally, 2 to use diag, by default 1
+    factor : floating | None, optional
+        initial step bound, by default 100.0
+    nprint : int32 | None, optional
+        call fcn with iflag 0 every nprint iterations if positive, by default 0
+    udata : object, optional
+        passed as is to fcn, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    full_output : bool | None, optional
+        if False, fjac, r and qtf are empty in the result, which then does not keep
+        the solver's buffers alive, by default True
+    warm_start : bool | None, optional
+        continue from the previous solve using `workspace`, e.g. along a parameter
+        path: the Q and R factors of its jacobian (fjac and r) are reused for the
+        first iterations instead of evaluating a jacobian at x, and so are its
+        scaling factors if diag is None. The jacobian is evaluated after two
+        consecutive failed steps, as usual, by default False
+
+    Returns
+    -------
+    HybrjResult
+        x, fvec, fjac, r, qtf, nfev, njev and info, as returned by
+        [hybrj][cminpack_numba.hybrj]
+
+    """
+    n = int32(x.size)
+    warm = warm_start is not None and warm_start
+    x, fvec, fjac, r, qtf, wa, diag = _hybrd_buffers(workspace, n, x, diag, warm)
+    wa1 = wa[:n]
+    wa2 = wa[n : 2 * n]
+    wa3 = wa[2 * n : 3 * n]
+    wa4 = wa[3 * n :]
+    xtol = xtol or 1.49012e-8
+    maxfev = maxfev or 200 * (n + 1)
+    mode = mode or 1
+    factor = factor or 100.0
+    nprint = nprint or 0
+    info, nfev, njev = _powell(
+        _hybrj_fun,
+        _hybrj_jac,
+        fcn,
+        udata,
+        x,
+        fvec,
+        fjac.T,
+        xtol,
+        maxfev,
+        n,
+        n,
+        0.0,
+        diag,
+        mode,
+        factor,
+        nprint,
+        warm,
+        r,
+        qtf,
+        wa1,
+        wa2,
+        wa3,
+        wa4,
+    )
+    return HybrjResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        _output(r, full_output),
+        _output(qtf, full_output),
+        nfev,
+        njev,
+        info,
+    )
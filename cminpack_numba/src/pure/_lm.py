@@ -0,0 +1,817 @@
+"""Numba ports of the `lmdif` and `lmder` solvers."""
+
+from __future__ import annotations
+
+from math import sqrt
+from typing import TYPE_CHECKING
+
+from numba import extending, njit, prange, types
+from numpy import empty, finfo, floating, int32, nan
+
+from .._result import LmderResult, LmdifResult, _output
+from .._workspace import _lm_buffers
+from ..utils import _NCHUNKS
+from ._minpack import _axpy, _dot, enorm, lmpar, qrfac
+from ._sparse import color_columns, fdjac2_sparse
+
+if TYPE_CHECKING:
+    from numba.core.dispatcher import Dispatcher
+    from numpy import integer
+    from numpy.typing import NDArray
+
+    from .._workspace import Workspace
+
+# The functions taking the user's residual function are not cached: they are
+# specialised for each residual function, which numba cannot cache across processes.
+
+
+@njit(error_model="numpy")
+def fdjac2(fcn, udata, m, n, x, fvec, fjac, epsfcn, wa):
+    """Forward-difference approximation of the m by n jacobian of `fcn` at x."""
+    eps = sqrt(max(epsfcn, finfo(x.dtype).eps))
+    for j in range(n):
+        temp = x[j]
+        h = eps * abs(temp)
+        if h == 0.0:
+            h = eps
+        x[j] = temp + h
+        # iflag = 2 tells the residual function this is a jacobian evaluation
+        iflag = fcn(udata, m, n, x, wa, 2)
+        if iflag < 0:
+            return iflag
+        x[j] = temp
+        for i in range(m):
+            fjac[i, j] = (wa[i] - fvec[i]) / h
+    return 0
+
+
+@njit(parallel=True, error_model="numpy")
+def fdjac2_parallel(fcn, udata, m, n, x, fvec, fjac, epsfcn):
+    """`fdjac2` evaluating the columns of the jacobian in parallel.
+
+    The columns are split into chunks run in parallel, each perturbing its own copy
+    of x, so fcn must be safe to call concurrently. The jacobian is the same as the one
+    computed by `fdjac2`, but all the columns are evaluated even if fcn returns a
+    negative value for one of them.
+    """
+    eps = sqrt(max(epsfcn, finfo(x.dtype).eps))
+    iflags = empty(n, dtype=int32)
+    nchunks = min(n, _NCHUNKS)
+    for c in prange(nchunks):
+        xp = x.copy()
+        wa = empty(m, dtype=x.dtype)
+        for j in range(c * n // nchunks, (c + 1) * n // nchunks):
+            temp = x[j]
+            h = eps * abs(temp)
+            if h == 0.0:
+                h = eps
+            xp[j] = temp + h
+            iflags[j] = fcn(udata, m, n, xp, wa, 2)
+            xp[j] = temp
+            for i in range(m):
+                fjac[i, j] = (wa[i] - fvec[i]) / h
+    for j in range(n):
+        if iflags[j] < 0:
+            return iflags[j]
+    return 0
+
+
+# ------------------------------- function calls ------------------------------- #
+
+
+@njit(error_model="numpy")
+def _lmdif_fun(fcn, udata, m, n, x, fvec, fjac, iflag):
+    return fcn(udata, m, n, x, fvec, iflag)
+
+
+@njit(error_model="numpy")
+def _lmdif_jac(fcn, udata, m, n, x, fvec, fjac, epsfcn, wa):
+    return fdjac2(fcn, udata, m, n, x, fvec, fjac, epsfcn, wa), n
+
+
+@njit(error_model="numpy")
+def _lmdif_jac_parallel(fcn, udata, m, n, x, fvec, fjac, epsfcn, wa):
+    return fdjac2_parallel(fcn, udata, m, n, x, fvec, fjac, epsfcn), n
+
+
+# The sparse jacobian passes (udata, indptr, indices, groupptr, groups) as udata.
+
+
+@njit(error_model="numpy")
+def _lmdif_sparse_fun(fcn, data, m, n, x, fvec, fjac, iflag):
+    return fcn(data[0], m, n, x, fvec, iflag)
+
+
+@njit(error_model="numpy")
+def _lmdif_sparse_jac(fcn, data, m, n, x, fvec, fjac, epsfcn, wa):
+    udata, indptr, indices, groupptr, groups = data
+    iflag = fdjac2_sparse(
+        fcn,
+        udata,
+        m,
+        n,
+        x,
+        fvec,
+        fjac,
+        epsfcn,
+        wa,
+        indptr,
+        indices,
+        groupptr,
+        groups,
+    )
+    return iflag, groupptr.size - 1
+
+
+@njit(error_model="numpy")
+def _lmder_fun(fcn, udata, m, n, x, fvec, fjac, iflag):
+    return fcn(udata, m, n, x, fvec, fjac, iflag)
+
+
+@njit(error_model="numpy")
+def _lmder_jac(fcn, udata, m, n, x, fvec, fjac, epsfcn, wa):
+    return fcn(udata, m, n, x, fvec, fjac, 2), 0
+
+
+# ---------------------------------- trace ------------------------------------ #
+
+# columns of the trace: those of the trace of the cminpack wrappers, and lambda
+_COLUMNS = 4
+
+
+def _trace_context(trace, n, dtype):
+    raise NotImplementedError
+
+
+@extending.overload(_trace_context)
+def _trace_context_overload(trace, n, dtype):
+    """Set the trace to nan and allocate its context, or None if not tracing.
+
+    The context holds the x of the last recorded row, the number of rows recorded
+    and the levenberg-marquardt parameter of the last accepted step.
+    """
+    if isinstance(trace, (types.NoneType, types.Omitted)):
+        return lambda trace, n, dtype: None
+
+    def impl(trace, n, dtype):
+        if trace.shape[1] != _COLUMNS:
+            msg = "trace must have 4 columns"
+            raise ValueError(msg)
+        trace[:] = nan
+        context = empty(n + 2, dtype=dtype)
+        context[n] = 0.0
+        context[n + 1] = 0.0
+        return context
+
+    return impl
+
+
+def _record(trace, context, x, fvec, calls):
+    raise NotImplementedError
+
+
+@extending.overload(_record)
+def _record_overload(trace, context, x, fvec, calls):
+    """Record ||fvec||, the norm of the step, calls and lambda in the next row."""
+    if isinstance(trace, (types.NoneType, types.Omitted)):
+        return lambda trace, context, x, fvec, calls: None
+
+    def impl(trace, context, x, fvec, calls):
+        n = x.size
+        i = int(context[n])
+        if i < trace.shape[0]:
+            trace[i, 0] = enorm(fvec)
+            if i > 0:
+                for j in range(n):
+                    context[j] = x[j] - context[j]
+                trace[i, 1] = enorm(context[:n])
+            else:
+                trace[i, 1] = 0.0
+            trace[i, 2] = calls
+            trace[i, 3] = context[n + 1]
+            context[:n] = x
+        context[n] = i + 1
+
+    return impl
+
+
+def _record_par(context, par):
+    raise NotImplementedError
+
+
+@extending.overload(_record_par)
+def _record_par_overload(context, par):
+    """Keep the levenberg-marquardt parameter of the step just accepted."""
+    if isinstance(context, (types.NoneType, types.Omitted)):
+        return lambda context, par: None
+
+    def impl(context, par):
+        context[context.size - 1] = par
+
+    return impl
+
+
+# ------------------------------------ lm -------------------------------------- #
+
+
+@njit(error_model="numpy")
+def _lm_iterate(
+    fun,
+    jac,
+    fcn,
+    udata,
+    x,
+    fvec,
+    fjac,
+    ftol,
+    xtol,
+    gtol,
+    maxfev,
+    epsfcn,
+    diag,
+    mode,
+    factor,
+    nprint,
+    ipvt,
+    qtf,
+    wa1,
+    wa2,
+    wa3,
+    wa4,
+    trace,
+    context,
+):
+    """Body of `lmdif`/`lmder`, returning iflag, info, nfev, njev and the calls."""
+    m, n = fjac.shape
+    epsmch = finfo(x.dtype).eps
+    info = 0
+    nfev = 0
+    njev = 0
+    # calls to fcn with iflag != 0, which differ from nfev for lmder
+    calls = 0
+
+    if (
+        n <= 0
+        or m < n
+        or ftol < 0.0
+        or xtol < 0.0
+        or gtol < 0.0
+        or maxfev <= 0
+        or factor <= 0.0
+    ):
+        return 0, info, nfev, njev, calls
+    if mode == 2:
+        for j in range(n):
+            if diag[j] <= 0.0:
+                return 0, info, nfev, njev, calls
+
+    iflag = fun(fcn, udata, m, n, x, fvec, fjac, 1)
+    nfev = 1
+    calls = 1
+    if iflag < 0:
+        return iflag, info, nfev, njev, calls
+    fnorm = enorm(fvec)
+
+    par = 0.0
+    delta = 0.0
+    xnorm = 0.0
+    it = 1
+    wa4n = wa4[:n]
+    while True:
+        # jacobian and its qr factorisation
+        iflag, jac_nfev = jac(fcn, udata, m, n, x, fvec, fjac, epsfcn, wa4)
+        nfev += jac_nfev
+        njev += 1
+        calls += max(jac_nfev, 1)
+        if iflag < 0:
+            return iflag, info, nfev, njev, calls
+
+        if nprint > 0:
+            iflag = 0
+            if (it - 1) % nprint == 0:
+                iflag = fun(fcn, udata, m, n, x, fvec, fjac, 0)
+            if iflag < 0:
+                return iflag, info, nfev, njev, calls
+        # the iterations the cminpack wrappers trace, every one if nprint is 0
+        if (it - 1) % max(nprint, 1) == 0:
+            _record(trace, context, x, fvec, calls)
+
+        qrfac(fjac, True, ipvt, wa1, wa2, wa3)
+
+        # on the first iteration, scale according to the norms of the columns of
+        # the jacobian and initialise the step bound delta
+        if it == 1:
+            if mode != 2:
+                for j in range(n):
+                    diag[j] = wa2[j]
+                    if wa2[j] == 0.0:
+                        diag[j] = 1.0
+            for j in range(n):
+                wa3[j] = diag[j] * x[j]
+            xnorm = enorm(wa3)
+            delta = factor * xnorm
+            if delta == 0.0:
+                delta = factor
+
+        # q^T fvec, stored in the first n elements of qtf
+        for i in range(m):
+            wa4[i] = fvec[i]
+        for j in range(n):
+            if fjac[j, j] != 0.0:
+                temp = -_dot(fjac[j:, j], wa4[j:]) / fjac[j, j]
+                _axpy(temp, fjac[j:, j], wa4[j:])
+            fjac[j, j] = wa1[j]
+            qtf[j] = wa4[j]
+
+        # norm of the scaled gradient
+        gnorm = 0.0
+        if fnorm != 0.0:
+            for j in range(n):
+                l = ipvt[j] - 1
+                if wa2[l] != 0.0:
+                    s = 0.0
+                    for i in range(j + 1):
+                        s += fjac[i, j] * (qtf[i] / fnorm)
+                    gnorm = max(gnorm, abs(s / wa2[l]))
+
+        if gnorm <= gtol:
+            info = 4
+            return iflag, info, nfev, njev, calls
+
+        if mode != 2:
+            for j in range(n):
+                diag[j] = max(diag[j], wa2[j])
+
+        while True:
+            # levenberg-marquardt parameter and step
+            par = lmpar(fjac, ipvt, diag, qtf, delta, par, wa1, wa2, wa3, wa4n)
+            steppar = par
+            for j in range(n):
+                wa1[j] = -wa1[j]
+                wa2[j] = x[j] + wa1[j]
+                wa3[j] = diag[j] * wa1[j]
+            pnorm = enorm(wa3)
+            if it == 1:
+                delta = min(delta, pnorm)
+
+            iflag = fun(fcn, udata, m, n, wa2, wa4, fjac, 1)
+            nfev += 1
+            calls += 1
+            if iflag < 0:
+                return iflag, info, nfev, njev, calls
+            fnorm1 = enorm(wa4)
+
+            # actual and predicted reductions, and the scaled directional derivative
+            actred = -1.0
+            if 0.1 * fnorm1 < fnorm:
+                d = fnorm1 / fnorm
+                actred = 1.0 - d * d
+            for j in range(n):
+                wa3[j] = 0.0
+                temp = wa1[ipvt[j] - 1]
+                for i in range(j + 1):
+                    wa3[i] += fjac[i, j] * temp
+            temp1 = enorm(wa3) / fnorm
+            temp2 = (sqrt(par) * pnorm) / fnorm
+            prered = temp1 * temp1 + temp2 * temp2 / 0.5
+            dirder = -(temp1 * temp1 + temp2 * temp2)
+            ratio = 0.0
+            if prered != 0.0:
+                ratio = actred / prered
+
+            # update the step bound
+            if ratio <= 0.25:
+                if actred >= 0.0:
+                    temp = 0.5
+                else:
+                    temp = 0.5 * dirder / (dirder + 0.5 * actred)
+                if 0.1 * fnorm1 >= fnorm or temp < 0.1:
+                    temp = 0.1
+                delta = temp * min(delta, pnorm / 0.1)
+                par /= temp
+            elif par == 0.0 or ratio >= 0.75:
+                delta = pnorm / 0.5
+                par = 0.5 * par
+
+            # accept the step if it reduced the norm sufficiently
+            if ratio >= 1e-4:
+                for j in range(n):
+                    x[j] = wa2[j]
+                    wa2[j] = diag[j] * x[j]
+                for i in range(m):
+                    fvec[i] = wa4[i]
+                xnorm = enorm(wa2)
+                fnorm = fnorm1
+                it += 1
+                _record_par(context, steppar)
+
+            # convergence tests
+            ftest = abs(actred) <= ftol and prered <= ftol and 0.5 * ratio <= 1.0
+            if ftest:
+                info = 1
+            if delta <= xtol * xnorm:
+                info = 3 if ftest else 2
+            if info != 0:
+                return iflag, info, nfev, njev, calls
+
+            # termination and stringent tolerances
+            if nfev >= maxfev:
+                info = 5
+            if abs(actred) <= epsmch and prered <= epsmch and 0.5 * ratio <= 1.0:
+                info = 6
+            if delta <= epsmch * xnorm:
+                info = 7
+            if gnorm <= epsmch:
+                info = 8
+            if info != 0:
+                return iflag, info, nfev, njev, calls
+
+            if ratio >= 1e-4:
+                break
+
+
+@njit(error_model="numpy")
+def _lm(
+    fun,
+    jac,
+    fcn,
+    udata,
+    x,
+    fvec,
+    fjac,
+    ftol,
+    xtol,
+    gtol,
+    maxfev,
+    epsfcn,
+    diag,
+    mode,
+    factor,
+    nprint,
+    ipvt,
+    qtf,
+    wa1,
+    wa2,
+    wa3,
+    wa4,
+    trace,
+    context,
+):
+    """Levenberg-Marquardt driver shared by `lmdif` and `lmder`."""
+    m, n = fjac.shape
+    iflag, info, nfev, njev, calls = _lm_iterate(
+        fun,
+        jac,
+        fcn,
+        udata,
+        x,
+        fvec,
+        fjac,
+        ftol,
+        xtol,
+        gtol,
+        maxfev,
+        epsfcn,
+        diag,
+        mode,
+        factor,
+        nprint,
+        ipvt,
+        qtf,
+        wa1,
+        wa2,
+        wa3,
+        wa4,
+        trace,
+        context,
+    )
+    if iflag < 0:
+        info = iflag
+    if nprint > 0:
+        fun(fcn, udata, m, n, x, fvec, fjac, 0)
+    if nfev > 0:
+        _record(trace, context, x, fvec, calls)
+    return info, nfev, njev
+
+
+# ----------------------------------- lmdif ------------------------------------ #
+
+
+@njit(error_model="numpy", nogil=True)
+def lmdif(
+    fcn: Dispatcher,
+    m: int32,
+    x: NDArray[floating],
+    ftol: floating | None = None,
+    xtol: floating | None = None,
+    gtol: floating | None = None,
+    maxfev: int32 | None = None,
+    epsfcn: floating | None = None,
+    diag: NDArray[floating] | None = None,
+    mode: int32 | None = None,
+    factor: floating | None = None,
+    nprint: int32 | None = None,
+    udata: object = None,
+    workspace: Workspace | None = None,
+    parallel: bool | None = None,
+    sparsity: tuple[NDArray[integer], NDArray[integer]] | None = None,
+    full_output: bool | None = None,
+    trace: NDArray[floating] | None = None,
+) -> LmdifResult:
+    """Minimise the sum of squares of m functions with a forward-difference jacobian.
+
+    Numba implementation of [lmdif][cminpack_numba.lmdif] taking an njit function,
+    which is compiled together with the solver, so that it can be inlined.
+
+    Parameters
+    ----------
+    fcn : Dispatcher
+        njit function `fcn(udata, m, n, x, fvec, iflag) -> int` computing the m
+        residuals at x in fvec. iflag is 1 (or 2 during the approximation of the
+        jacobian), or 0 to print if nprint > 0. Return a negative value to stop.
+    m : int32
+        number of functions
+    x : NDArray[floating]
+        initial estimate of the solution
+    ftol : floating | None, optional
+        relative error desired in the sum of squares, by default 1.49012e-8
+    xtol : floating | None, optional
+        relative error desired in the solution, by default 1.49012e-8
+    gtol : floating | None, optional
+        orthogonality desired between fvec and the columns of the jacobian, by
+        default 0.0
+    maxfev : int32 | None, optional
+        maximum number of calls to fcn, by default 200 * (n + 1)
+    epsfcn : floating | None, optional
+        step length for the forward-difference approximation, by default the machine
+        precision of x.dtype
+    diag : NDArray[floating] | None, optional
+        multiplicative scale factors of the variables, by default None
+    mode : int32 | None, optional
+        1 to scale the variables internally, 2 to use diag, by default 1
+    factor : floating | None, optional
+        initial step bound, by default 100.0
+    nprint : int32 | None, optional
+        call fcn with iflag 0 every nprint iterations if positive, by default 0
+    udata : object, optional
+        passed as is to fcn, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    parallel : bool | None, optional
+        evaluate the columns of the forward-difference jacobian in parallel with
+        `fdjac2_parallel`, for expensive residuals, by default False
+    sparsity : tuple[NDArray[integer], NDArray[integer]] | None, optional
+        (indptr, indices) of the sparsity pattern of the jacobian in CSC format, e.g.
+        from a scipy.sparse.csc_array. The columns are grouped with `color_columns`
+        and the jacobian approximated with one evaluation of fcn per group, with
+        `fdjac2_sparse`. Takes precedence over parallel. By default None
+    full_output : bool | None, optional
+        if False, fjac and qtf are empty in the result, which then does not keep
+        the solver's buffers alive, by default True
+    trace : NDArray[floating] | None, optional
+        (k, 4) array set as the trace of [lmdif][cminpack_numba.lmdif], with the
+        levenberg-marquardt parameter lambda of the step leading to the x of each
+        row in the fourth column, 0 in the first row, by default None
+
+    Returns
+    -------
+    LmdifResult
+        x, fvec, fjac, ipvt, qtf, nfev and info, as returned by
+        [lmdif][cminpack_numba.lmdif]
+
+    """
+    n = int32(x.size)
+    x, fvec, fjac, ipvt, qtf, wa, diag = _lm_buffers(workspace, m, n, x, diag)
+    context = _trace_context(trace, n, x.dtype)
+    wa1 = wa[:n]
+    wa2 = wa[n : 2 * n]
+    wa3 = wa[2 * n : 3 * n]
+    wa4 = wa[3 * n :]
+    ftol = ftol or 1.49012e-8
+    xtol = xtol or 1.49012e-8
+    gtol = gtol or 0.0
+    mode = mode or 1
+    factor = factor or 100.0
+    nprint = nprint or 0
+    epsfcn = epsfcn or finfo(x.dtype).eps
+    maxfev = maxfev or 200 * (n + 1)
+    # checking for None lets numba prune the branches of the omitted arguments
+    if sparsity is not None:
+        groupptr, groups = color_columns(sparsity[0], sparsity[1], m)
+        info, nfev, _ = _lm(
+            _lmdif_sparse_fun,
+            _lmdif_sparse_jac,
+            fcn,
+            (udata, sparsity[0], sparsity[1], groupptr, groups),
+            x,
+            fvec,
+            # column-major view: the memory has the same layout as cminpack's fjac
+            fjac.reshape(fjac.shape[::-1]).T,
+            ftol,
+            xtol,
+            gtol,
+            maxfev,
+            epsfcn,
+            diag,
+            mode,
+            factor,
+            nprint,
+            ipvt,
+            qtf,
+            wa1,
+            wa2,
+            wa3,
+            wa4,
+            trace,
+            context,
+        )
+    elif parallel is not None and parallel:
+        info, nfev, _ = _lm(
+            _lmdif_fun,
+            _lmdif_jac_parallel,
+            fcn,
+            udata,
+            x,
+            fvec,
+            # column-major view: the memory has the same layout as cminpack's fjac
+            fjac.reshape(fjac.shape[::-1]).T,
+            ftol,
+            xtol,
+            gtol,
+            maxfev,
+            epsfcn,
+            diag,
+            mode,
+            factor,
+            nprint,
+            ipvt,
+            qtf,
+            wa1,
+            wa2,
+            wa3,
+            wa4,
+            trace,
+            context,
+        )
+    else:
+        info, nfev, _ = _lm(
+            _lmdif_fun,
+            _lmdif_jac,
+            fcn,
+            udata,
+            x,
+            fvec,
+            # column-major view: the memory has the same layout as cminpack's fjac
+            fjac.reshape(fjac.shape[::-1]).T,
+            ftol,
+            xtol,
+            gtol,
+            maxfev,
+            epsfcn,
+            diag,
+            mode,
+            factor,
+            nprint,
+            ipvt,
+            qtf,
+            wa1,
+            wa2,
+            wa3,
+            wa4,
+            trace,
+            context,
+        )
+    return LmdifResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        ipvt,
+        _output(qtf, full_output),
+        nfev,
+        info,
+    )
+
+
+# ----------------------------------- lmder ------------------------------------ #
+
+
+@njit(error_model="numpy", nogil=True)
+def lmder(
+    fcn: Dispatcher,
+    m: int32,
+    x: NDArray[floating],
+    ftol: floating | None = None,
+    xtol: floating | None = None,
+    gtol: floating | None = None,
+    maxfev: int32 | None = None,
+    diag: NDArray[floating] | None = None,
+    mode: int32 | None = None,
+    factor: floating | None = None,
+    nprint: int32 | None = None,
+    udata: object = None,
+    workspace: Workspace | None = None,
+    full_output: bool | None = None,
+    trace: NDArray[floating] | None = None,
+) -> LmderResult:
+    """Minimise the sum of squares of m functions with a user supplied jacobian.
+
+    Numba implementation of [lmder][cminpack_numba.lmder] taking an njit function,
+    which is compiled together with the solver, so that it can be inlined.
+
+    Parameters
+    ----------
+    fcn : Dispatcher
+        njit function `fcn(udata, m, n, x, fvec, fjac, iflag) -> int` computing the
+        m residuals at x in fvec if iflag is 1, or the (m, n) jacobian `fjac[i, j]`
+        if iflag is 2. iflag is 0 to print if nprint > 0. Return a negative value to
+        stop.
+    m : int32
+        number of functions
+    x : NDArray[floating]
+        initial estimate of the solution
+    ftol : floating | None, optional
+        relative error desired in the sum of squares, by default 1.49012e-8
+    xtol : floating | None, optional
+        relative error desired in the solution, by default 1.49012e-8
+    gtol : floating | None, optional
+        orthogonality desired between fvec and the columns of the jacobian, by
+        default 0.0
+    maxfev : int32 | None, optional
+        maximum number of calls to fcn with iflag 1, by default 200 * (n + 1)
+    diag : NDArray[floating] | None, optional
+        multiplicative scale factors of the variables, by default None
+    mode : int32 | None, optional
+        1 to scale the variables internally, 2 to use diag, by default 1
+    factor : floating | None, optional
+        initial step bound, by default 100.0
+    nprint : int32 | None, optional
+        call fcn with iflag 0 every nprint iterations if positive, by default 0
+    udata : object, optional
+        passed as is to fcn, by default None
+    workspace : Workspace | None, optional
+        preallocated buffers, by default None
+    full_output : bool | None, optional
+        if False, fjac and qtf are empty in the result, which then does not keep
+        the solver's buffers alive, by default True
+    trace : NDArray[floating] | None, optional
+        (k, 4) array set as the trace of [lmder][cminpack_numba.lmder], with the
+        levenberg-marquardt parameter lambda of the step leading to the x of each
+        row in the fourth column, 0 in the first row, by default None
+
+    Returns
+    -------
+    LmderResult
+        x, fvec, fjac, ipvt, qtf, nfev, njev and info, as returned by
+        [lmder][cminpack_numba.lmder]
+
+    """
+    n = int32(x.size)
+    x, fvec, fjac, ipvt, qtf, wa, diag = _lm_buffers(workspace, m, n, x, diag)
+    context = _trace_context(trace, n, x.dtype)
+    wa1 = wa[:n]
+    wa2 = wa[n : 2 * n]
+    wa3 = wa[2 * n : 3 * n]
+    wa4 = wa[3 * n :]
+    ftol = ftol or 1.49012e-8
+    xtol = xtol or 1.49012e-8
+    gtol = gtol or 0.0
+    mode = mode or 1
+    factor = factor or 100.0
+    nprint = nprint or 0
+    maxfev = maxfev or 200 * (n + 1)
+    info, nfev, njev = _lm(
+        _lmder_fun,
+        _lmder_jac,
+        fcn,
+        udata,
+        x,
+        fvec,
+        fjac.reshape(fjac.shape[::-1]).T,
+        ftol,
+        xtol,
+        gtol,
+        maxfev,
+        0.0,
+        diag,
+        mode,
+        factor,
+        nprint,
+        ipvt,
+        qtf,
+        wa1,
+        wa2,
+        wa3,
+        wa4,
+        trace,
+        context,
+    )
+    return LmderResult(
+        x,
+        fvec,
+        _output(fjac, full_output),
+        ipvt,
+        _output(qtf, full_output),
+        nfev,
+        njev,
+        info,
+    )
@@ -0,0 +1,380 @@
+"""Numba port of `lmstr` streaming the observations, for very large data sets."""
+
+from __future__ import annotations
+
+from math import hypot, sqrt
+from typing import TYPE_CHECKING
+
+from numpy import asarray, empty, finfo, int32, maximum, ones, zeros
+
+from .._caching import njit
+from .._result import LmstrStreamResult
+from ._minpack import _axpy, _dot, enorm, lmpar, qrfac, rwupdt
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from numba.core.dispatcher import Dispatcher
+    from numpy import floating
+    from numpy.typing import NDArray
+
+# As in _lm.py, the functions taking the user's function are not cached.
+
+
+@njit(error_model="numpy", nogil=True)
+def _stream_fun(fcn, udata, data, x, fvec, fjac):
+    """Residuals of the rows of `data`, returning iflag and their norm."""
+    c = data.shape[0]
+    iflag = fcn(udata, data, x, fvec[:c], fjac[:c], 1)
+    return iflag, enorm(fvec[:c])
+
+
+@njit(error_model="numpy", nogil=True)
+def _stream_jac(fcn, udata, data, x, fvec, fjac, r, qtf, wa1, wa2):
+    """Add the rows of the jacobian of `data` to the triangular r and to qtf."""
+    c = data.shape[0]
+    iflag = fcn(udata, data, x, fvec[:c], fjac[:c], 2)
+    if iflag < 0:
+        return iflag
+    for i in range(c):
+        rwupdt(r, fjac[i], qtf, fvec[i], wa1, wa2)
+    return iflag
+
+
+@njit(cache=True, error_model="numpy")
+def _stream_qr(r, qtf, ipvt, wa1, wa2, wa3):
+    """Column norms of r in wa2, and its qr factorisation with pivoting if singular."""
+    n = r.shape[1]
+    sing = False
+    for j in range(n):
+        if r[j, j] == 0.0:
+            sing = True
+        ipvt[j] = j + 1
+        wa2[j] = enorm(r[: j + 1, j])
+    if not sing:
+        return
+    qrfac(r, True, ipvt, wa1, wa2, wa3)
+    for j in range(n):
+        if r[j, j] != 0.0:
+            temp = -_dot(r[j:, j], qtf[j:]) / r[j, j]
+            _axpy(temp, r[j:, j], qtf[j:])
+        r[j, j] = wa1[j]
+
+
+@njit(cache=True, error_model="numpy")
+def _stream_gnorm(r, ipvt, qtf, wa2, fnorm):
+    """Norm of the scaled gradient."""
+    n = r.shape[1]
+    gnorm = 0.0
+    if fnorm != 0.0:
+        for j in range(n):
+            l = ipvt[j] - 1
+            if wa2[l] != 0.0:
+                s = 0.0
+                for i in range(j + 1):
+                    s += r[i, j] * (qtf[i] / fnorm)
+                gnorm = max(gnorm, abs(s / wa2[l]))
+    return gnorm
+
+
+@njit(cache=True, error_model="numpy")
+def _stream_rnorm(r, ipvt, p, wa3):
+    """Norm of r times the permuted step p."""
+    n = r.shape[1]
+    for j in range(n):
+        wa3[j] = 0.0
+        temp = p[ipvt[j] - 1]
+        for i in range(j + 1):
+            wa3[i] += r[i, j] * temp
+    return enorm(wa3)
+
+
+def _chunks(
+    data: NDArray | Callable[[], Iterable[NDArray]],
+    chunksize: int,
+) -> Iterator[NDArray]:
+    """Chunks of rows of `data`, read anew for each pass."""
+    if callable(data):
+        for chunk in data():
+            yield asarray(chunk)
+        return
+    for i in range(0, len(data), chunksize):
+        # a slice of a memmap is only read from disk here, chunk by chunk
+        yield asarray(data[i : i + chunksize])
+
+
+class _Passes:
+    """Passes of fcn over the chunks of data, with the buffers of one chunk."""
+
+    def __init__(self, fcn, data, udata, chunksize, n, dtype) -> None:
+        self.fcn = fcn
+        self.data = data
+        self.udata = udata
+        self.chunksize = chunksize
+        self.fvec = empty(0, dtype=dtype)
+        self.fjac = empty((0, n), dtype=dtype)
+
+    def _chunks(self) -> Iterator[NDArray]:
+        for chunk in _chunks(self.data, self.chunksize):
+            if chunk.shape[0] > self.fvec.size:
+                self.fvec = empty(chunk.shape[0], dtype=self.fvec.dtype)
+                self.fjac = empty((chunk.shape[0], self.fjac.shape[1]), self.fjac.dtype)
+            yield chunk
+
+    def fun(self, x: NDArray) -> tuple[int, float, int]:
+        """Norm of the residuals at x and number of rows, with iflag."""
+        fnorm = 0.0
+        m = 0
+        for chunk in self._chunks():
+            iflag, norm = _stream_fun(
+                self.fcn,
+                self.udata,
+                chunk,
+                x,
+                self.fvec,
+                self.fjac,
+            )
+            if iflag < 0:
+                return iflag, fnorm, m
+            fnorm = hypot(fnorm, norm)
+            m += chunk.shape[0]
+        return 0, fnorm, m
+
+    def jac(self, x, r, qtf, wa1, wa2) -> int:
+        """Accumulate the triangular factor of the jacobian at x in r, row by row."""
+        r[...] = 0.0
+        qtf[:] = 0.0
+        for chunk in self._chunks():
+            iflag = _stream_jac(
+                self.fcn,
+                self.udata,
+                chunk,
+                x,
+                self.fvec,
+                self.fjac,
+                r,
+                qtf,
+                wa1,
+                wa2,
+            )
+            if iflag < 0:
+                return iflag
+        return 0
+
+
+def _lmstr_iterate(passes, x, ftol, xtol, gtol, maxfev, diag, mode, factor, bufs):
+    """Body of `lmstr_stream`, returning iflag, info, nfev, njev and fnorm."""
+    r, ipvt, qtf, wa1, wa2, wa3, wa4 = bufs
+    n = x.size
+    epsmch = finfo(x.dtype).eps
+    info = 0
+    nfev = 0
+    njev = 0
+
+    if n <= 0 or ftol < 0.0 or xtol < 0.0 or gtol < 0.0 or maxfev <= 0 or factor <= 0.0:
+        return 0, info, nfev, njev, 0.0
+    if mode == 2 and (diag <= 0.0).any():
+        return 0, info, nfev, njev, 0.0
+
+    iflag, fnorm, m = passes.fun(x)
+    nfev = 1
+    if iflag < 0 or m < n:
+        return iflag, info, nfev, njev, fnorm
+
+    par = 0.0
+    delta = 0.0
+    xnorm = 0.0
+    it = 1
+    while True:
+        # triangular factor of the jacobian, accumulated row by row, and q^T fvec
+        iflag = passes.jac(x, r, qtf, wa1, wa2)
+        njev += 1
+        if iflag < 0:
+            return iflag, info, nfev, njev, fnorm
+        _stream_qr(r, qtf, ipvt, wa1, wa2, wa3)
+
+        # on the first iteration, scale according to the norms of the columns of
+        # the jacobian and initialise the step bound delta
+        if it == 1:
+            if mode != 2:
+                diag[:] = wa2
+                diag[wa2 == 0.0] = 1.0
+            xnorm = enorm(diag * x)
+            delta = factor * xnorm
+            if delta == 0.0:
+                delta = factor
+
+        gnorm = _stream_gnorm(r, ipvt, qtf, wa2, fnorm)
+        if gnorm <= gtol:
+            info = 4
+            return iflag, info, nfev, njev, fnorm
+
+        if mode != 2:
+            maximum(diag, wa2, out=diag)
+
+        while True:
+            # levenberg-marquardt parameter and step
+            par = lmpar(r, ipvt, diag, qtf, delta, par, wa1, wa2, wa3, wa4)
+            wa1 *= -1.0
+            wa2[:] = x + wa1
+            wa3[:] = diag * wa1
+            pnorm = enorm(wa3)
+            if it == 1:
+                delta = min(delta, pnorm)
+
+            iflag, fnorm1, _ = passes.fun(wa2)
+            nfev += 1
+            if iflag < 0:
+                return iflag, info, nfev, njev, fnorm
+
+            # actual and predicted reductions, and the scaled directional derivative
+            actred = -1.0
+            if 0.1 * fnorm1 < fnorm:
+                d = fnorm1 / fnorm
+                actred = 1.0 - d * d
+            temp1 = _stream_rnorm(r, ipvt, wa1, wa3) / fnorm
+            temp2 = (sqrt(par) * pnorm) / fnorm
+            prered = temp1 * temp1 + temp2 * temp2 / 0.5
+            dirder = -(temp1 * temp1 + temp2 * temp2)
+            ratio = 0.0
+            if prered != 0.0:
+                ratio = actred / prered
+
+            # update the step bound
+            if ratio <= 0.25:
+                if actred >= 0.0:
+                    temp = 0.5
+                else:
+                    temp = 0.5 * dirder / (dirder + 0.5 * actred)
+                if 0.1 * fnorm1 >= fnorm or temp < 0.1:
+                    temp = 0.1
+                delta = temp * min(delta, pnorm / 0.1)
+                par /= temp
+            elif par == 0.0 or ratio >= 0.75:
+                delta = pnorm / 0.5
+                par = 0.5 * par
+
+            # accept the step if it reduced the norm sufficiently
+            if ratio >= 1e-4:
+                x[:] = wa2
+                xnorm = enorm(diag * x)
+                fnorm = fnorm1
+                it += 1
+
+            # convergence tests
+            ftest = abs(actred) <= ftol and prered <= ftol and 0.5 * ratio <= 1.0
+            if ftest:
+                info = 1
+            if delta <= xtol * xnorm:
+                info = 3 if ftest else 2
+            if info != 0:
+                return iflag, info, nfev, njev, fnorm
+
+            # termination and stringent tolerances
+            if nfev >= maxfev:
+                info = 5
+            if abs(actred) <= epsmch and prered <= epsmch and 0.5 * ratio <= 1.0:
+                info = 6
+            if delta <= epsmch * xnorm:
+                info = 7
+            if gnorm <= epsmch:
+                info = 8
+            if info != 0:
+                return iflag, info, nfev, njev, fnorm
+
+            if ratio >= 1e-4:
+                break
+
+
+def lmstr_stream(
+    fcn: Dispatcher,
+    data: NDArray | Callable[[], Iterable[NDArray]],
+    x: NDArray[floating],
+    ftol: floating | None = None,
+    xtol: floating | None = None,
+    gtol: floating | None = None,
+    maxfev: int32 | None = None,
+    diag: NDArray[floating] | None = None,
+    mode: int32 | None = None,
+    factor: floating | None = None,
+    udata: object = None,
+    chunksize: int | None = None,
+) -> LmstrStreamResult:
+    """Minimise the sum of squares of residuals streamed in chunks of observations.
+
+    Implementation of [lmstr][cminpack_numba.lmstr] for data sets too large for
+    the residuals, let alone the m by n jacobian, to be kept in memory. Each
+    evaluation of the residuals or of the jacobian is a pass over the rows of
+    `data`, read chunk by chunk, and the jacobian is reduced to its n by n
+    triangular factor row by row, as in MINPACK's lmstr, so that the memory used is
+    O(n^2) plus the buffers of one chunk, independently of m.
+
+    The passes are driven from Python, which cannot be done from nopython mode with
+    a chunk generator, but the chunks are processed by njit functions compiled
+    together with fcn, which release the GIL.
+
+    Parameters
+    ----------
+    fcn : Dispatcher
+        njit function `fcn(udata, data, x, fvec, fjac, iflag) -> int` computing the
+        residuals of the c rows of the chunk `data` at x in fvec, of length c, and
+        if iflag is 2 their (c, n) jacobian `fjac[i, j]` too. Return a negative
+        value to stop.
+    data : NDArray | Callable[[], Iterable[NDArray]]
+        observations, whose first axis indexes the rows, e.g. a `numpy.memmap`
+        read in chunks of `chunksize` rows, or a function returning an iterable of
+        the chunks, e.g. a generator function, called once per pass
+    x : NDArray[floating]
+        initial estimate of the solution
+    ftol : floating | None, optional
+        relative error desired in the sum of squares, by default 1.49012e-8
+    xtol : floating | None, optional
+        relative error desired in the solution, by default 1.49012e-8
+    gtol : floating | None, optional
+        orthogonality desired between fvec and the columns of the jacobian, by
+        default 0.0
+    maxfev : int32 | None, optional
+        maximum number of passes computing the residuals, by default 200 * (n + 1)
+    diag : NDArray[floating] | None, optional
+        multiplicative scale factors of the variables, by default None
+    mode : int32 | None, optional
+        1 to scale the variables internally, 2 to use diag, by default 1
+    factor : floating | None, optional
+        initial step bound, by default 100.0
+    udata : object, optional
+        passed as is to fcn, by default None
+    chunksize : int | None, optional
+        number of rows of the chunks of an array `data`, by default 65536
+
+    Returns
+    -------
+    LmstrStreamResult
+        x, norm of the residuals fnorm, fjac holding the n by n upper triangular
+        factor of the jacobian, ipvt, qtf, nfev, njev and info, as returned by
+        [lmstr][cminpack_numba.lmstr]. fjac can be passed to
+        [covar][cminpack_numba.covar]
+
+    """
+    x = asarray(x).copy()
+    n = x.size
+    diag = ones(n, dtype=x.dtype) if diag is None else diag
+    # column-major, as the first n rows of cminpack's fjac
+    r = zeros((n, n), dtype=x.dtype, order="F")
+    bufs = (r, empty(n, dtype=int32), *(empty(n, dtype=x.dtype) for _ in range(5)))
+    passes = _Passes(fcn, data, udata, chunksize or 65536, n, x.dtype)
+    iflag, info, nfev, njev, fnorm = _lmstr_iterate(
+        passes,
+        x,
+        ftol or 1.49012e-8,
+        xtol or 1.49012e-8,
+        gtol or 0.0,
+        maxfev or 200 * (n + 1),
+        diag,
+        mode or 1,
+        factor or 100.0,
+        bufs,
+    )
+    if iflag < 0:
+        info = iflag
+    # r.T has the memory layout of the fjac of lmstr, e.g. for covar
+    return LmstrStreamResult(x, fnorm, r.T, bufs[1], bufs[2], nfev, njev, info)
@@ -0,0 +1,633 @@
+"""Numba ports of the MINPACK linear algebra subroutines.
+
+The matrices are 2D arrays indexed as `a[i, j]`; the solvers pass Fortran ordered
+views so that the columns are contiguous, as in MINPACK. The permutations in `ipvt`
+are 1-based, as returned by cminpack. `error_model="numpy"` keeps the IEEE semantics
+of the C code, e.g. divisions by zero give inf instead of raising.
+
+The innermost loops go through `_dot`, `_axpy` and `_rot` on slices: loops starting
+at 0 let LLVM drop the wraparound of negative indices, which otherwise makes them
+several times slower than the C code.
+"""
+
+from __future__ import annotations
+
+from math import sqrt
+from typing import TYPE_CHECKING
+
+from numba import extending, types
+from numpy import finfo
+
+from .._caching import njit
+
+if TYPE_CHECKING:
+    from numpy import floating, int32
+    from numpy.typing import NDArray
+
+# ---------------------------------- kernels ----------------------------------- #
+
+
+@njit(cache=True, error_model="numpy")
+def _dot(x, y):
+    s = 0.0
+    for i in range(x.size):
+        s += x[i] * y[i]
+    return s
+
+
+@njit(cache=True, error_model="numpy")
+def _axpy(a, x, y):
+    for i in range(x.size):
+        y[i] += a * x[i]
+
+
+@njit(cache=True, error_model="numpy")
+def _rot(cs, sn, x, y):
+    # apply the givens rotation [[cs, sn], [-sn, cs]] to the rows x and y
+    for i in range(x.size):
+        temp = cs * x[i] + sn * y[i]
+        y[i] = -sn * x[i] + cs * y[i]
+        x[i] = temp
+
+
+# ----------------------------------- enorm ------------------------------------ #
+
+
+def _dwarf_giant(x):
+    raise NotImplementedError
+
+
+@extending.overload(_dwarf_giant)
+def _dwarf_giant_overload(x):
+    # the constants of cminpack's enorm.c
+    if x.dtype == types.float32:
+        return lambda x: (1.327871072777421e-18, 1.844674297419792e18)
+    return lambda x: (1.82691291192569e-153, 1.34078079299426e153)
+
+
+@njit(cache=True, error_model="numpy")
+def enorm(x: NDArray[floating]) -> float:
+    """Euclidean norm of x, avoiding destructive underflows and overflows.
+
+    Parameters
+    ----------
+    x : NDArray[floating]
+        the vector
+
+    Returns
+    -------
+    float
+        the Euclidean norm of x
+
+    """
+    n = x.size
+    if n == 0:
+        return 0.0
+    rdwarf, rgiant = _dwarf_giant(x)
+    s1 = s2 = s3 = x1max = x3max = 0.0
+    agiant = rgiant / n
+    for i in range(n):
+        xabs = abs(x[i])
+        if xabs >= agiant:
+            if xabs > x1max:
+                d = x1max / xabs
+                s1 = 1.0 + s1 * (d * d)
+                x1max = xabs
+            else:
+                d = xabs / x1max
+                s1 += d * d
+        elif xabs <= rdwarf:
+            if xabs > x3max:
+                d = x3max / xabs
+                s3 = 1.0 + s3 * (d * d)
+                x3max = xabs
+            elif xabs != 0.0:
+                d = xabs / x3max
+                s3 += d * d
+        else:
+            s2 += xabs * xabs
+    if s1 != 0.0:
+        return x1max * sqrt(s1 + (s2 / x1max) / x1max)
+    if s2 != 0.0:
+        if s2 >= x3max:
+            return sqrt(s2 * (1.0 + (x3max / s2) * (x3max * s3)))
+        return sqrt(x3max * ((s2 / x3max) + (x3max * s3)))
+    return x3max * sqrt(s3)
+
+
+# ----------------------------------- qrfac ------------------------------------ #
+
+
+@njit(cache=True, error_model="numpy")
+def qrfac(
+    a: NDArray[floating],
+    pivot: bool,
+    ipvt: NDArray[int32],
+    rdiag: NDArray[floating],
+    acnorm: NDArray[floating],
+    wa: NDArray[floating],
+) -> None:
+    """QR factorisation of the m by n matrix a with optional column pivoting.
+
+    On output the strict upper trapezoidal part of a contains the strict upper
+    trapezoidal part of r, and the lower trapezoidal part the Householder vectors.
+    rdiag holds the diagonal of r and acnorm the norms of the columns of a.
+    """
+    m, n = a.shape
+    epsmch = finfo(a.dtype).eps
+    for j in range(n):
+        acnorm[j] = enorm(a[:, j])
+        rdiag[j] = acnorm[j]
+        wa[j] = rdiag[j]
+        if pivot:
+            ipvt[j] = j + 1
+
+    for j in range(min(m, n)):
+        if pivot:
+            # bring the column of largest norm into the pivot position
+            kmax = j
+            for k in range(j, n):
+                if rdiag[k] > rdiag[kmax]:
+                    kmax = k
+            if kmax != j:
+                for i in range(m):
+                    temp = a[i, j]
+                    a[i, j] = a[i, kmax]
+                    a[i, kmax] = temp
+                rdiag[kmax] = rdiag[j]
+                wa[kmax] = wa[j]
+                k = ipvt[j]
+                ipvt[j] = ipvt[kmax]
+                ipvt[kmax] = k
+
+        # householder transformation reducing the j-th column to a multiple of e_j
+        ajnorm = enorm(a[j:, j])
+        if ajnorm != 0.0:
+            if a[j, j] < 0.0:
+                ajnorm = -ajnorm
+            for i in range(j, m):
+                a[i, j] /= ajnorm
+            a[j, j] += 1.0
+
+            # apply it to the remaining columns and update the norms
+            for k in range(j + 1, n):
+                temp = _dot(a[j:, j], a[j:, k]) / a[j, j]
+                _axpy(-temp, a[j:, j], a[j:, k])
+                if pivot and rdiag[k] != 0.0:
+                    temp = a[j, k] / rdiag[k]
+                    rdiag[k] *= sqrt(max(0.0, 1.0 - temp * temp))
+                    d = rdiag[k] / wa[k]
+                    if 0.05 * (d * d) <= epsmch:
+                        rdiag[k] = enorm(a[j + 1 :, k])
+                        wa[k] = rdiag[k]
+        rdiag[j] = -ajnorm
+
+
+# ----------------------------------- qrsolv ----------------------------------- #
+
+
+@njit(cache=True, error_model="numpy")
+def qrsolv(
+    r: NDArray[floating],
+    ipvt: NDArray[int32],
+    diag: NDArray[floating],
+    qtb: NDArray[floating],
+    x: NDArray[floating],
+    sdiag: NDArray[floating],
+    wa: NDArray[floating],
+) -> None:
+    """Solve a*x = b, d*x = 0 in the least squares sense given the QR of a.
+
+    Only the upper n by n block of r is used; its strict lower triangle is
+    overwritten with the transpose of the upper triangular matrix s such that
+    p^T (a^T a + d d) p = s^T s, whose diagonal is stored in sdiag.
+    """
+    n = r.shape[1]
+    # copy r and q^T b to preserve input and initialise s
+    for j in range(n):
+        for i in range(j, n):
+            r[i, j] = r[j, i]
+        x[j] = r[j, j]
+        wa[j] = qtb[j]
+
+    # eliminate the diagonal matrix d using givens rotations
+    for j in range(n):
+        l = ipvt[j] - 1
+        if diag[l] != 0.0:
+            for k in range(j, n):
+                sdiag[k] = 0.0
+            sdiag[j] = diag[l]
+            qtbpj = 0.0
+            for k in range(j, n):
+                if sdiag[k] == 0.0:
+                    continue
+                if abs(r[k, k]) < abs(sdiag[k]):
+                    cotan = r[k, k] / sdiag[k]
+                    sn = 0.5 / sqrt(0.25 + 0.25 * (cotan * cotan))
+                    cs = sn * cotan
+                else:
+                    tan = sdiag[k] / r[k, k]
+                    cs = 0.5 / sqrt(0.25 + 0.25 * (tan * tan))
+                    sn = cs * tan
+                temp = cs * wa[k] + sn * qtbpj
+                qtbpj = -sn * wa[k] + cs * qtbpj
+                wa[k] = temp
+                r[k, k] = cs * r[k, k] + sn * sdiag[k]
+                _rot(cs, sn, r[k + 1 : n, k], sdiag[k + 1 : n])
+        sdiag[j] = r[j, j]
+        r[j, j] = x[j]
+
+    # solve the triangular system, in the least squares sense if it is singular
+    nsing = n
+    for j in range(n):
+        if sdiag[j] == 0.0 and nsing == n:
+            nsing = j
+        if nsing < n:
+            wa[j] = 0.0
+    for j in range(nsing - 1, -1, -1):
+        s = _dot(r[j + 1 : nsing, j], wa[j + 1 : nsing])
+        wa[j] = (wa[j] - s) / sdiag[j]
+
+    for j in range(n):
+        x[ipvt[j] - 1] = wa[j]
+
+
+# ----------------------------------- lmpar ------------------------------------ #
+
+
+@njit(cache=True, error_model="numpy")
+def lmpar(
+    r: NDArray[floating],
+    ipvt: NDArray[int32],
+    diag: NDArray[floating],
+    qtb: NDArray[floating],
+    delta: float,
+    par: float,
+    x: NDArray[floating],
+    sdiag: NDArray[floating],
+    wa1: NDArray[floating],
+    wa2: NDArray[floating],
+) -> float:
+    """Levenberg-Marquardt parameter for the trust region of radius delta.
+
+    Returns the parameter, par being the initial estimate, and sets x to the
+    corresponding step. The vectors all have length n.
+    """
+    n = r.shape[1]
+    dwarf = finfo(r.dtype).tiny
+
+    # gauss-newton direction, in the least squares sense if r is singular
+    nsing = n
+    for j in range(n):
+        wa1[j] = qtb[j]
+        if r[j, j] == 0.0 and nsing == n:
+            nsing = j
+        if nsing < n:
+            wa1[j] = 0.0
+    for j in range(nsing - 1, -1, -1):
+        wa1[j] /= r[j, j]
+        _axpy(-wa1[j], r[:j, j], wa1[:j])
+    for j in range(n):
+        x[ipvt[j] - 1] = wa1[j]
+
+    # accept the gauss-newton direction if it is within the trust region
+    for j in range(n):
+        wa2[j] = diag[j] * x[j]
+    dxnorm = enorm(wa2)
+    fp = dxnorm - delta
+    if fp <= 0.1 * delta:
+        return 0.0
+
+    # lower bound parl of the zero of the function, if r is not singular
+    parl = 0.0
+    if nsing >= n:
+        for j in range(n):
+            l = ipvt[j] - 1
+            wa1[j] = diag[l] * (wa2[l] / dxnorm)
+        for j in range(n):
+            wa1[j] = (wa1[j] - _dot(r[:j, j], wa1[:j])) / r[j, j]
+        temp = enorm(wa1)
+        parl = fp / delta / temp / temp
+
+    # upper bound paru of the zero of the function
+    for j in range(n):
+        wa1[j] = _dot(r[: j + 1, j], qtb[: j + 1]) / diag[ipvt[j] - 1]
+    gnorm = enorm(wa1)
+    paru = gnorm / delta
+    if paru == 0.0:
+        paru = dwarf / min(delta, 0.1)
+
+    par = min(max(par, parl), paru)
+    if par == 0.0:
+        par = gnorm / dxnorm
+
+    for it in range(1, 11):
+        if par == 0.0:
+            par = max(dwarf, 0.001 * paru)
+        temp = sqrt(par)
+        for j in range(n):
+            wa1[j] = temp * diag[j]
+        qrsolv(r, ipvt, wa1, qtb, x, sdiag, wa2)
+        for j in range(n):
+            wa2[j] = diag[j] * x[j]
+        dxnorm = enorm(wa2)
+        temp = fp
+        fp = dxnorm - delta
+
+        # stop if the step is accurate enough, or parl is zero and the function
+        # decreases towards a negative value, or after 10 iterations
+        if abs(fp) <= 0.1 * delta or (parl == 0.0 and fp <= temp < 0.0) or it == 10:
+            break
+
+        # newton correction
+        for j in range(n):
+            l = ipvt[j] - 1
+            wa1[j] = diag[l] * (wa2[l] / dxnorm)
+        for j in range(n):
+            wa1[j] /= sdiag[j]
+            _axpy(-wa1[j], r[j + 1 : n, j], wa1[j + 1 : n])
+        temp = enorm(wa1)
+        parc = fp / delta / temp / temp
+
+        if fp > 0.0:
+            parl = max(parl, par)
+        if fp < 0.0:
+            paru = min(paru, par)
+        par = max(parl, par + parc)
+    return par
+
+
+# ----------------------------------- dogleg ----------------------------------- #
+
+
+@njit(cache=True, error_model="numpy")
+def dogleg(
+    r: NDArray[floating],
+    diag: NDArray[floating],
+    qtb: NDArray[floating],
+    delta: float,
+    x: NDArray[floating],
+    wa1: NDArray[floating],
+    wa2: NDArray[floating],
+) -> None:
+    """Dogleg step within the trust region of radius delta.
+
+    r is the upper triangular matrix of the QR factorisation packed by rows.
+    """
+    n = x.size
+    epsmch = finfo(r.dtype).eps
+
+    # gauss-newton direction
+    jj = (n * (n + 1)) // 2
+    for k in range(1, n + 1):
+        j = n - k
+        jj -= k
+        s = _dot(r[jj + 1 : jj + k], x[j + 1 :])
+        temp = r[jj]
+        if temp == 0.0:
+            l = j
+            for i in range(j + 1):
+                temp = max(temp, abs(r[l]))
+                l += n - i - 1
+            temp = epsmch * temp
+            if temp == 0.0:
+                temp = epsmch
+        x[j] = (qtb[j] - s) / temp
+
+    # accept it if it is within the trust region
+    for j in range(n):
+        wa1[j] = 0.0
+        wa2[j] = diag[j] * x[j]
+    qnorm = enorm(wa2)
+    if qnorm <= delta:
+        return
+
+    # scaled gradient direction
+    l = 0
+    for j in range(n):
+        _axpy(qtb[j], r[l : l + n - j], wa1[j:])
+        l += n - j
+        wa1[j] /= diag[j]
+
+    # norm of the scaled gradient and the point along it minimising the model
+    gnorm = enorm(wa1)
+    sgnorm = 0.0
+    alpha = delta / qnorm
+    if gnorm != 0.0:
+        for j in range(n):
+            wa1[j] = (wa1[j] / gnorm) / diag[j]
+        l = 0
+        for j in range(n):
+            wa2[j] = _dot(r[l : l + n - j], wa1[j:])
+            l += n - j
+        temp = enorm(wa2)
+        sgnorm = gnorm / temp / temp
+
+        # the gauss-newton point is outside the trust region: find the dogleg point
+        alpha = 0.0
+        if sgnorm < delta:
+            bnorm = enorm(qtb)
+            temp = (bnorm / gnorm) * (bnorm / qnorm) * (sgnorm / delta)
+            d1 = sgnorm / delta
+            d2 = temp - delta / qnorm
+            d3 = delta / qnorm
+            temp = (
+                temp
+                - (delta / qnorm) * (d1 * d1)
+                + sqrt(d2 * d2 + (1.0 - d3 * d3) * (1.0 - d1 * d1))
+            )
+            alpha = ((delta / qnorm) * (1.0 - d1 * d1)) / temp
+
+    # convex combination of the gauss-newton and scaled gradient directions
+    temp = (1.0 - alpha) * min(sgnorm, delta)
+    for j in range(n):
+        x[j] = temp * wa1[j] + alpha * x[j]
+
+
+# ----------------------------------- r1updt ----------------------------------- #
+
+
+@njit(cache=True, error_model="numpy")
+def r1updt(
+    m: int,
+    n: int,
+    s: NDArray[floating],
+    u: NDArray[floating],
+    v: NDArray[floating],
+    w: NDArray[floating],
+) -> bool:
+    """Update the lower trapezoidal s, packed by columns, after a rank-1 change.
+
+    Returns whether the updated matrix is singular. v and w are overwritten with
+    the givens rotations, as used by [r1mpyq][cminpack_numba.src.pure._minpack.r1mpyq].
+    """
+    giant = finfo(s.dtype).max
+
+    # start of the last column of s
+    jj = (n * (2 * m - n + 1)) // 2 - (m - n) - 1
+    l = jj
+    for i in range(n - 1, m):
+        w[i] = s[l]
+        l += 1
+
+    # rotate v into a multiple of e_n, introducing a spike in w
+    for j in range(n - 2, -1, -1):
+        jj -= m - j
+        w[j] = 0.0
+        if v[j] == 0.0:
+            continue
+        if abs(v[n - 1]) < abs(v[j]):
+            cotan = v[n - 1] / v[j]
+            sn = 0.5 / sqrt(0.25 + 0.25 * (cotan * cotan))
+            cs = sn * cotan
+            tau = 1.0
+            if abs(cs) * giant > 1.0:
+                tau = 1.0 / cs
+        else:
+            tan = v[j] / v[n - 1]
+            cs = 0.5 / sqrt(0.25 + 0.25 * (tan * tan))
+            sn = cs * tan
+            tau = sn
+        v[n - 1] = sn * v[j] + cs * v[n - 1]
+        v[j] = tau
+        _rot(cs, -sn, s[jj : jj + m - j], w[j:m])
+
+    # add the spike from the rank 1 update to w
+    for i in range(m):
+        w[i] += v[n - 1] * u[i]
+
+    # eliminate the spike
+    sing = False
+    for j in range(n - 1):
+        if w[j] != 0.0:
+            if abs(s[jj]) < abs(w[j]):
+                cotan = s[jj] / w[j]
+                sn = 0.5 / sqrt(0.25 + 0.25 * (cotan * cotan))
+                cs = sn * cotan
+                tau = 1.0
+                if abs(cs) * giant > 1.0:
+                    tau = 1.0 / cs
+            else:
+                tan = w[j] / s[jj]
+                cs = 0.5 / sqrt(0.25 + 0.25 * (tan * tan))
+                sn = cs * tan
+                tau = sn
+            _rot(cs, sn, s[jj : jj + m - j], w[j:m])
+            w[j] = tau
+        if s[jj] == 0.0:
+            sing = True
+        jj += m - j
+
+    # move w back into the last column of s
+    l = jj
+    for i in range(n - 1, m):
+        s[l] = w[i]
+        l += 1
+    if s[jj] == 0.0:
+        sing = True
+    return sing
+
+
+# ----------------------------------- r1mpyq ----------------------------------- #
+
+
+@njit(cache=True, error_model="numpy")
+def r1mpyq(a: NDArray[floating], v: NDArray[floating], w: NDArray[floating]) -> None:
+    """Multiply the m by n matrix a by the givens rotations stored in v and w."""
+    n = a.shape[1]
+    for j in range(n - 2, -1, -1):
+        if abs(v[j]) > 1.0:
+            cs = 1.0 / v[j]
+            sn = sqrt(1.0 - cs * cs)
+        else:
+            sn = v[j]
+            cs = sqrt(1.0 - sn * sn)
+        _rot(cs, -sn, a[:, j], a[:, n - 1])
+    for j in range(n - 1):
+        if abs(w[j]) > 1.0:
+            cs = 1.0 / w[j]
+            sn = sqrt(1.0 - cs * cs)
+        else:
+            sn = w[j]
+            cs = sqrt(1.0 - sn * sn)
+        _rot(cs, sn, a[:, j], a[:, n - 1])
+
+
+# ----------------------------------- qform ------------------------------------ #
+
+
+@njit(cache=True, error_model="numpy")
+def qform(q: NDArray[floating], n: int, wa: NDArray[floating]) -> None:
+    """Accumulate the m by m orthogonal matrix q from its factored form from qrfac."""
+    m = q.shape[0]
+    minmn = min(m, n)
+
+    # zero out the upper triangle of q in the first min(m, n) columns
+    for j in range(1, minmn):
+        for i in range(j):
+            q[i, j] = 0.0
+
+    # initialise the remaining columns to those of the identity matrix
+    for j in range(n, m):
+        for i in range(m):
+            q[i, j] = 0.0
+        q[j, j] = 1.0
+
+    # accumulate q from its factored form
+    for k in range(minmn - 1, -1, -1):
+        for i in range(k, m):
+            wa[i] = q[i, k]
+            q[i, k] = 0.0
+        q[k, k] = 1.0
+        if wa[k] != 0.0:
+            for j in range(k, m):
+                temp = _dot(q[k:, j], wa[k:m]) / wa[k]
+                _axpy(-temp, wa[k:m], q[k:, j])
+
+
+# ----------------------------------- rwupdt ----------------------------------- #
+
+
+@njit(cache=True, error_model="numpy")
+def rwupdt(
+    r: NDArray[floating],
+    w: NDArray[floating],
+    b: NDArray[floating],
+    alpha: float,
+    cos: NDArray[floating],
+    sin: NDArray[floating],
+) -> float:
+    """Update the n by n upper triangular r and b after adding the row w to the matrix.
+
+    The row (w, alpha) is added to the system (r, b) and eliminated with givens
+    rotations, stored in cos and sin. Returns the updated alpha.
+    """
+    n = r.shape[1]
+    for j in range(n):
+        rowj = w[j]
+
+        # apply the previous transformations to r[i, j], i < j, and to w[j]
+        for i in range(j):
+            temp = cos[i] * r[i, j] + sin[i] * rowj
+            rowj = -sin[i] * r[i, j] + cos[i] * rowj
+            r[i, j] = temp
+
+        # givens rotation eliminating w[j]
+        cos[j] = 1.0
+        sin[j] = 0.0
+        if rowj != 0.0:
+            if abs(r[j, j]) < abs(rowj):
+                cotan = r[j, j] / rowj
+                sin[j] = 0.5 / sqrt(0.25 + 0.25 * (cotan * cotan))
+                cos[j] = sin[j] * cotan
+            else:
+                tan = rowj / r[j, j]
+                cos[j] = 0.5 / sqrt(0.25 + 0.25 * (tan * tan))
+                sin[j] = cos[j] * tan
+
+            # apply it to r[j, j], b[j] and alpha
+            r[j, j] = cos[j] * r[j, j] + sin[j] * rowj
+            temp = cos[j] * b[j] + sin[j] * alpha
+            alpha = -sin[j] * b[j] + cos[j] * alpha
+            b[j] = temp
+    return alpha
@@ -0,0 +1,170 @@
+"""Forward-difference jacobians of sparse functions with grouped columns."""
+
+from __future__ import annotations
+
+from math import sqrt
+from typing import TYPE_CHECKING
+
+from numpy import empty, finfo, full, int64, zeros
+
+from .._caching import njit
+
+if TYPE_CHECKING:
+    from numpy import integer
+    from numpy.typing import NDArray
+
+
+@njit(cache=True)
+def color_columns(
+    indptr: NDArray[integer],
+    indices: NDArray[integer],
+    m: int,
+) -> tuple[NDArray[int64], NDArray[int64]]:
+    """Group the columns of a sparse m by n jacobian that share no row.
+
+    The columns are coloured greedily, in order, with the first colour not used by a
+    column sharing a row with them. The columns of a group can be perturbed together
+    in a forward-difference approximation of the jacobian, which then takes one
+    function evaluation per group instead of one per column.
+
+    Parameters
+    ----------
+    indptr : NDArray[integer]
+        (n + 1,) index pointer of the sparsity pattern in CSC format
+    indices : NDArray[integer]
+        row indices of the sparsity pattern in CSC format
+    m : int
+        number of rows of the jacobian
+
+    Returns
+    -------
+    tuple[NDArray[int64], NDArray[int64]]
+        groupptr and groups: the columns of the k-th group are
+        groups[groupptr[k]:groupptr[k + 1]]
+
+    """
+    n = indptr.size - 1
+    nnz = indptr[n]
+
+    # columns of each row: the pattern in CSR format
+    rowptr = zeros(m + 1, dtype=int64)
+    for p in range(nnz):
+        rowptr[indices[p] + 1] += 1
+    for i in range(m):
+        rowptr[i + 1] += rowptr[i]
+    cols = empty(nnz, dtype=int64)
+    fill = rowptr[:m].copy()
+    for j in range(n):
+        for p in range(indptr[j], indptr[j + 1]):
+            i = indices[p]
+            cols[fill[i]] = j
+            fill[i] += 1
+
+    colors = full(n, -1, dtype=int64)
+    # forbidden[c] == j if colour c is used by a column sharing a row with column j
+    forbidden = full(n + 1, -1, dtype=int64)
+    ncolors = 0
+    for j in range(n):
+        for p in range(indptr[j], indptr[j + 1]):
+            i = indices[p]
+            for q in range(rowptr[i], rowptr[i + 1]):
+                c = colors[cols[q]]
+                if c >= 0:
+                    forbidden[c] = j
+        c = 0
+        while forbidden[c] == j:
+            c += 1
+        colors[j] = c
+        ncolors = max(ncolors, c + 1)
+
+    groupptr = zeros(ncolors + 1, dtype=int64)
+    for j in range(n):
+        groupptr[colors[j] + 1] += 1
+    for c in range(ncolors):
+        groupptr[c + 1] += groupptr[c]
+    groups = empty(n, dtype=int64)
+    fill = groupptr[:ncolors].copy()
+    for j in range(n):
+        groups[fill[colors[j]]] = j
+        fill[colors[j]] += 1
+    return groupptr, groups
+
+
+@njit(cache=True)
+def bandwidth(indptr: NDArray[integer], indices: NDArray[integer]) -> tuple[int, int]:
+    """Number of sub- and superdiagonals of a sparsity pattern.
+
+    For the ml and mu arguments of [hybrd][cminpack_numba.hybrd], which then
+    approximates the jacobian with ml + mu + 1 evaluations of fcn instead of n.
+
+    Parameters
+    ----------
+    indptr : NDArray[integer]
+        (n + 1,) index pointer of the sparsity pattern in CSC format
+    indices : NDArray[integer]
+        row indices of the sparsity pattern in CSC format
+
+    Returns
+    -------
+    tuple[int, int]
+        ml and mu
+
+    """
+    ml = 0
+    mu = 0
+    for j in range(indptr.size - 1):
+        for p in range(indptr[j], indptr[j + 1]):
+            ml = max(ml, indices[p] - j)
+            mu = max(mu, j - indices[p])
+    return ml, mu
+
+
+# Takes the user's function, so is not cached, see _lm.py.
+@njit(error_model="numpy")
+def fdjac2_sparse(
+    fcn,
+    udata,
+    m,
+    n,
+    x,
+    fvec,
+    fjac,
+    epsfcn,
+    wa,
+    indptr,
+    indices,
+    groupptr,
+    groups,
+):
+    """`fdjac2` for a sparse jacobian, perturbing the columns in groups.
+
+    The groups are those of `color_columns` for the sparsity pattern (indptr,
+    indices) in CSC format: fcn is evaluated once per group and the entries outside
+    the pattern are set to zero.
+    """
+    eps = sqrt(max(epsfcn, finfo(x.dtype).eps))
+    xs = x.copy()
+    for k in range(groupptr.size - 1):
+        for p in range(groupptr[k], groupptr[k + 1]):
+            j = groups[p]
+            h = eps * abs(xs[j])
+            if h == 0.0:
+                h = eps
+            x[j] = xs[j] + h
+        # iflag = 2 tells the residual function this is a jacobian evaluation
+        iflag = fcn(udata, m, n, x, wa, 2)
+        if iflag < 0:
+            x[:] = xs
+            return iflag
+        for p in range(groupptr[k], groupptr[k + 1]):
+            j = groups[p]
+            x[j] = xs[j]
+            h = eps * abs(xs[j])
+            if h == 0.0:
+                h = eps
+            for i in range(m):
+                fjac[i, j] = 0.0
+            for q in range(indptr[j], indptr[j + 1]):
+                i = indices[q]
+                fjac[i, j] = (wa[i] - fvec[i]) / h
+    return 0
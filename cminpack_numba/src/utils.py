@@ -3,13 +3,25 @@
 from __future__ import annotations
 
 import ctypes as ct
+import sys
+import time
 import typing
 import warnings
 from pathlib import Path
 
-from numba.core import cgutils
-from numba.extending import intrinsic
-from numba.types import CPointer, int32, voidptr
+from numba.core import cgutils, errors
+from numba.extending import intrinsic, overload, register_jitable
+from numba.types import (
+    Array,
+    CPointer,
+    ExternalFunction,
+    NoneType,
+    UniTuple,
+    int32,
+    int64,
+    intc,
+    voidptr,
+)
 
 if typing.TYPE_CHECKING:
     from numba.core.typing import Signature
@@ -18,6 +30,11 @@ if typing.TYPE_CHECKING:
 
 ptr_int32 = CPointer(int32)
 
+# Number of chunks the batched drivers split their problems into, each chunk allocates
+# its workspace once. A constant rather than get_num_threads(), which would make the
+# batched drivers uncacheable.
+_NCHUNKS = 256
+
 
 @intrinsic
 def address_as_void_pointer(
@@ -103,6 +120,61 @@ def val_from_ptr(typingctx, src: Type) -> tuple[Signature, callable]:
     return sig, impl
 
 
+# Monotonic clock in seconds for nopython mode. The C functions are linked by name, so
+# the functions using it can be cached, and write to stack variables, so it does not
+# allocate.
+if sys.platform == "win32":
+    _query_performance_counter = ExternalFunction(
+        "QueryPerformanceCounter",
+        intc(CPointer(int64)),
+    )
+    _query_performance_frequency = ExternalFunction(
+        "QueryPerformanceFrequency",
+        intc(CPointer(int64)),
+    )
+
+    @register_jitable
+    def _perf_counter():
+        counter = ptr_from_val(int64(0))
+        frequency = ptr_from_val(int64(0))
+        _query_performance_counter(counter)
+        _query_performance_frequency(frequency)
+        return val_from_ptr(counter) / val_from_ptr(frequency)
+
+else:
+    _clock_gettime = ExternalFunction(
+        "clock_gettime",
+        intc(intc, CPointer(UniTuple(int64, 2))),
+    )
+    _CLOCK_MONOTONIC = time.CLOCK_MONOTONIC
+
+    @register_jitable
+    def _perf_counter():
+        timespec = ptr_from_val((int64(0), int64(0)))
+        _clock_gettime(_CLOCK_MONOTONIC, timespec)
+        seconds, nanoseconds = val_from_ptr(timespec)
+        return seconds + 1e-9 * nanoseconds
+
+
+def _row(arr, i):
+    raise NotImplementedError
+
+
+@overload(_row)
+def _row_overload(arr, i):
+    """Row `i` of `arr`, or None if `arr` is None.
+
+    Used by the batched drivers to select the udata of a single problem, so unlike
+    the udata of the single problem drivers, it must be an array.
+    """
+    if isinstance(arr, NoneType):
+        return lambda arr, i: None
+    if not isinstance(arr, Array):
+        msg = f"the batched drivers take an array with a row per problem, not {arr}"
+        raise errors.TypingError(msg)
+    return lambda arr, i: arr[i]
+
+
 def _check_dtype(
     args: tuple[ArrayLike, ...],
     dtype: DTypeLike,
@@ -163,13 +235,15 @@ def check_cfunc(func: FunctionType, *args: NDArray | int) -> ct.c_int:
     return _func(*_args)
 
 
-def get_extension_path(lib_name: str) -> str:
+def get_extension_path(lib_name: str, directory: str | None = None) -> str:
     """Get the path to the library with the given name in the parent directory.
 
     Parameters
     ----------
     lib_name : str
         The name of the library to search for.
+    directory : str | None, optional
+        The directory to search in instead of the parent directory, by default None
 
     Returns
     -------
@@ -177,7 +251,7 @@ def get_extension_path(lib_name: str) -> str:
         The path to the library.
 
     """
-    search_path = Path(__file__).parent.parent
+    search_path = Path(__file__).parent.parent if directory is None else Path(directory)
     ext_path = f"*{lib_name}.*"
     matches = search_path.glob(ext_path)
     try:
@@ -0,0 +1,404 @@
+"""Benchmarks of the solvers against scipy and NumbaMinpack.
+
+The problems are from the MINPACK test set (Moré, Garbow and Hillstrom, "Testing
+unconstrained optimization software", 1981), at several sizes. Each solver is timed
+in steady state, i.e. compiled and warmed up, and from a cold start, i.e. a new
+interpreter importing the package, loading it from the on-disk cache and solving
+one problem.
+
+Run the benchmarks alone with `pytest tests/test_benchmarks.py --benchmark-only`,
+and save and compare runs with `--benchmark-autosave` and `--benchmark-compare` to
+catch performance regressions, e.g. when upgrading numba or cminpack.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from math import cos, sin, sqrt
+from pathlib import Path
+
+import pytest
+from numba import carray, cfunc, farray, njit
+from numpy import array, empty, full
+
+from cminpack_numba import hybrd, hybrj, lmder, lmdif, lmstr
+from cminpack_numba.signatures import (
+    hybrd_sig,
+    hybrj_sig,
+    lmder_sig,
+    lmdif_sig,
+    lmstr_sig,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+# ------------------------------------- problems ------------------------------------- #
+
+
+@njit
+def rosenbrock(x, fvec):
+    fvec[0] = 10.0 * (x[1] - x[0] ** 2)
+    fvec[1] = 1.0 - x[0]
+
+
+@njit
+def rosenbrock_row(x, i, m, row):
+    if i == 0:
+        row[0] = -20.0 * x[0]
+        row[1] = 10.0
+    else:
+        row[0] = -1.0
+        row[1] = 0.0
+
+
+@njit
+def powell_singular(x, fvec):
+    fvec[0] = x[0] + 10.0 * x[1]
+    fvec[1] = sqrt(5.0) * (x[2] - x[3])
+    fvec[2] = (x[1] - 2.0 * x[2]) ** 2
+    fvec[3] = sqrt(10.0) * (x[0] - x[3]) ** 2
+
+
+@njit
+def powell_singular_row(x, i, m, row):
+    row[:] = 0.0
+    if i == 0:
+        row[0] = 1.0
+        row[1] = 10.0
+    elif i == 1:
+        row[2] = sqrt(5.0)
+        row[3] = -sqrt(5.0)
+    elif i == 2:  # noqa: PLR2004
+        row[1] = 2.0 * (x[1] - 2.0 * x[2])
+        row[2] = -2.0 * row[1]
+    else:
+        row[0] = 2.0 * sqrt(10.0) * (x[0] - x[3])
+        row[3] = -row[0]
+
+
+@njit
+def brown_almost_linear(x, fvec):
+    n = x.size
+    total = x.sum()
+    for i in range(n - 1):
+        fvec[i] = x[i] + total - (n + 1)
+    fvec[n - 1] = x.prod() - 1.0
+
+
+@njit
+def brown_almost_linear_row(x, i, m, row):
+    n = x.size
+    if i < n - 1:
+        row[:] = 1.0
+        row[i] = 2.0
+        return
+    for j in range(n):
+        product = 1.0
+        for k in range(n):
+            if k != j:
+                product *= x[k]
+        row[j] = product
+
+
+@njit
+def trigonometric(x, fvec):
+    n = x.size
+    total = 0.0
+    for j in range(n):
+        total += cos(x[j])
+    for i in range(n):
+        fvec[i] = n - total + (i + 1) * (1.0 - cos(x[i])) - sin(x[i])
+
+
+@njit
+def trigonometric_row(x, i, m, row):
+    for j in range(x.size):
+        row[j] = sin(x[j])
+    row[i] += (i + 1) * sin(x[i]) - cos(x[i])
+
+
+@njit
+def linear_full_rank(x, fvec):
+    m = fvec.size
+    total = 2.0 * x.sum() / m
+    for i in range(m):
+        fvec[i] = -total - 1.0
+    for i in range(x.size):
+        fvec[i] += x[i]
+
+
+@njit
+def linear_full_rank_row(x, i, m, row):
+    row[:] = -2.0 / m
+    if i < x.size:
+        row[i] += 1.0
+
+
+@njit
+def broyden_tridiagonal(x, fvec):
+    n = x.size
+    for i in range(n):
+        fvec[i] = (3.0 - 2.0 * x[i]) * x[i] + 1.0
+        if i > 0:
+            fvec[i] -= x[i - 1]
+        if i < n - 1:
+            fvec[i] -= 2.0 * x[i + 1]
+
+
+@njit
+def broyden_tridiagonal_row(x, i, m, row):
+    row[:] = 0.0
+    row[i] = 3.0 - 4.0 * x[i]
+    if i > 0:
+        row[i - 1] = -1.0
+    if i < x.size - 1:
+        row[i + 1] = -2.0
+
+
+Problem = namedtuple("Problem", ["name", "m", "n", "x0", "residuals", "row"])
+
+
+def _problem(name, m, n, x0):
+    # x0 as a tuple so that problems are hashable
+    x0 = tuple(float(i) for i in x0)
+    return Problem(name, m, n, x0, globals()[name], globals()[f"{name}_row"])
+
+
+LEAST_SQUARES = [
+    _problem("rosenbrock", 2, 2, [-1.2, 1.0]),
+    _problem("powell_singular", 4, 4, [3.0, -1.0, 0.0, 1.0]),
+    _problem("brown_almost_linear", 10, 10, full(10, 0.5)),
+    _problem("trigonometric", 10, 10, full(10, 0.1)),
+    _problem("trigonometric", 50, 50, full(50, 0.02)),
+    _problem("linear_full_rank", 20, 10, full(10, 1.0)),
+    _problem("linear_full_rank", 200, 100, full(100, 1.0)),
+]
+EQUATIONS = [
+    _problem("rosenbrock", 2, 2, [-1.2, 1.0]),
+    _problem("powell_singular", 4, 4, [3.0, -1.0, 0.0, 1.0]),
+    _problem("brown_almost_linear", 10, 10, full(10, 0.5)),
+    _problem("trigonometric", 10, 10, full(10, 0.1)),
+    _problem("broyden_tridiagonal", 10, 10, full(10, -1.0)),
+    _problem("broyden_tridiagonal", 100, 100, full(100, -1.0)),
+]
+
+
+def _id(problem):
+    return f"{problem.name}-{problem.m}x{problem.n}"
+
+
+# ---------------------------------- residual cfuncs --------------------------------- #
+
+
+@njit
+def _jacobian(problem_row, x, fjac):
+    m = fjac.shape[0]
+    for i in range(m):
+        problem_row(x, i, m, fjac[i])
+
+
+@lru_cache(maxsize=None)
+def _cfunc(kind, problem):
+    """Address of the cfunc computing the residuals of `problem` for `kind`."""
+    residuals = problem.residuals
+    row = problem.row
+
+    if kind == "lmdif":
+
+        def fcn(udata, m, n, x, fvec, iflag):
+            residuals(carray(x, (n,)), carray(fvec, (m,)))
+            return 0
+
+        return cfunc(lmdif_sig)(fcn).address
+
+    if kind == "lmder":
+
+        def fcn(udata, m, n, x, fvec, fjac, ldfjac, iflag):
+            if iflag == 1:
+                residuals(carray(x, (n,)), carray(fvec, (m,)))
+            else:
+                _jacobian(row, carray(x, (n,)), farray(fjac, (ldfjac, n))[:m])
+            return 0
+
+        return cfunc(lmder_sig)(fcn).address
+
+    if kind == "lmstr":
+
+        def fcn(udata, m, n, x, fvec, fjrow, iflag):
+            if iflag == 1:
+                residuals(carray(x, (n,)), carray(fvec, (m,)))
+            else:
+                row(carray(x, (n,)), iflag - 2, m, carray(fjrow, (n,)))
+            return 0
+
+        return cfunc(lmstr_sig)(fcn).address
+
+    if kind == "hybrd":
+
+        def fcn(udata, n, x, fvec, iflag):
+            residuals(carray(x, (n,)), carray(fvec, (n,)))
+            return 0
+
+        return cfunc(hybrd_sig)(fcn).address
+
+    def fcn(udata, n, x, fvec, fjac, ldfjac, iflag):
+        if iflag == 1:
+            residuals(carray(x, (n,)), carray(fvec, (n,)))
+        else:
+            _jacobian(row, carray(x, (n,)), farray(fjac, (ldfjac, n))[:n])
+        return 0
+
+    return cfunc(hybrj_sig)(fcn).address
+
+
+# -------------------------------------- solvers ------------------------------------- #
+
+
+def _solve_cminpack(kind, problem):
+    address = _cfunc(kind, problem)
+    x0 = array(problem.x0)
+    if kind == "lmdif":
+        return lambda: lmdif(address, problem.m, x0)
+    if kind == "lmder":
+        return lambda: lmder(address, problem.m, x0)
+    if kind == "lmstr":
+        return lambda: lmstr(address, problem.m, x0)
+    if kind == "hybrd":
+        return lambda: hybrd(address, x0)
+    return lambda: hybrj(address, x0)
+
+
+def _scipy_functions(problem):
+    residuals = problem.residuals
+    row = problem.row
+
+    def fun(x):
+        fvec = empty(problem.m)
+        residuals(x, fvec)
+        return fvec
+
+    def jac(x):
+        fjac = empty((problem.m, problem.n))
+        _jacobian(row, x, fjac)
+        return fjac
+
+    return fun, jac
+
+
+def _solve_scipy(kind, problem):
+    optimize = pytest.importorskip("scipy.optimize")
+    fun, jac = _scipy_functions(problem)
+    x0 = array(problem.x0)
+    # method="lm" and "hybr" wrap MINPACK's lmdif/lmder and hybrd/hybrj
+    if kind == "lmdif":
+        return lambda: optimize.least_squares(fun, x0, method="lm")
+    if kind in {"lmder", "lmstr"}:
+        return lambda: optimize.least_squares(fun, x0, jac, method="lm")
+    if kind == "hybrd":
+        return lambda: optimize.root(fun, x0, method="hybr")
+    return lambda: optimize.root(fun, x0, jac=jac, method="hybr")
+
+
+@lru_cache(maxsize=None)
+def _numbaminpack_cfunc(problem):
+    numbaminpack = pytest.importorskip("NumbaMinpack")
+    residuals = problem.residuals
+    m = problem.m
+    n = problem.n
+
+    @cfunc(numbaminpack.minpack_sig)
+    def fcn(x, fvec, args):
+        residuals(carray(x, (n,)), carray(fvec, (m,)))
+
+    return fcn.address
+
+
+def _solve_numbaminpack(kind, problem):
+    numbaminpack = pytest.importorskip("NumbaMinpack")
+    address = _numbaminpack_cfunc(problem)
+    x0 = array(problem.x0)
+    args = empty(0)
+    if kind == "lmdif":
+        return lambda: numbaminpack.lmdif(address, x0, problem.m, args)
+    if kind == "hybrd":
+        return lambda: numbaminpack.hybrd(address, x0, args)
+    pytest.skip(f"NumbaMinpack has no {kind}")
+    return None
+
+
+_SOLVERS = {
+    "cminpack_numba": _solve_cminpack,
+    "scipy": _solve_scipy,
+    "NumbaMinpack": _solve_numbaminpack,
+}
+
+# ----------------------------------- steady state ----------------------------------- #
+
+
+def _steady_state(benchmark, kind, library, problem):
+    solve = _SOLVERS[library](kind, problem)
+    solve()  # compile and warm up
+    benchmark.group = f"{kind}-{_id(problem)}"
+    benchmark(solve)
+
+
+@pytest.mark.parametrize("library", list(_SOLVERS))
+@pytest.mark.parametrize("problem", LEAST_SQUARES, ids=_id)
+def test_lmdif(benchmark, library, problem) -> None:
+    _steady_state(benchmark, "lmdif", library, problem)
+
+
+@pytest.mark.parametrize("library", ["cminpack_numba", "scipy"])
+@pytest.mark.parametrize("problem", LEAST_SQUARES, ids=_id)
+def test_lmder(benchmark, library, problem) -> None:
+    _steady_state(benchmark, "lmder", library, problem)
+
+
+@pytest.mark.parametrize("library", ["cminpack_numba", "scipy"])
+@pytest.mark.parametrize("problem", LEAST_SQUARES, ids=_id)
+def test_lmstr(benchmark, library, problem) -> None:
+    _steady_state(benchmark, "lmstr", library, problem)
+
+
+@pytest.mark.parametrize("library", list(_SOLVERS))
+@pytest.mark.parametrize("problem", EQUATIONS, ids=_id)
+def test_hybrd(benchmark, library, problem) -> None:
+    _steady_state(benchmark, "hybrd", library, problem)
+
+
+@pytest.mark.parametrize("library", ["cminpack_numba", "scipy"])
+@pytest.mark.parametrize("problem", EQUATIONS, ids=_id)
+def test_hybrj(benchmark, library, problem) -> None:
+    _steady_state(benchmark, "hybrj", library, problem)
+
+
+# ------------------------------------ cold start ------------------------------------ #
+
+_COLD_START = """
+import sys
+sys.path.insert(0, {root!r})
+from tests.test_benchmarks import {problems}, _SOLVERS
+_SOLVERS[{library!r}]({kind!r}, {problems}[{index}])()
+"""
+
+
+@pytest.mark.parametrize("library", list(_SOLVERS))
+@pytest.mark.parametrize("kind", ["lmdif", "hybrd"])
+def test_cold_start(benchmark, kind, library) -> None:
+    if library != "cminpack_numba":
+        pytest.importorskip({"scipy": "scipy", "NumbaMinpack": "NumbaMinpack"}[library])
+    problems = "LEAST_SQUARES" if kind == "lmdif" else "EQUATIONS"
+    script = _COLD_START.format(
+        root=str(Path(__file__).parent.parent),
+        problems=problems,
+        library=library,
+        kind=kind,
+        index=0,
+    )
+    command = [sys.executable, "-c", script]
+    subprocess.run(command, check=True)  # populate the on-disk cache
+    benchmark.group = f"cold-start-{kind}"
+    benchmark.pedantic(subprocess.run, (command,), {"check": True}, rounds=3)
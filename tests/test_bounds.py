@@ -2,13 +2,20 @@
 
 from numba import carray, cfunc, njit
 from numba.types import float64
-from numpy import array, inf, take
+from numpy import array, concatenate, empty, inf, isinf, isnan, take, triu, zeros
 from numpy.linalg import norm
-from numpy.testing import assert_, assert_allclose
+from numpy.random import default_rng
+from numpy.testing import (
+    assert_,
+    assert_allclose,
+    assert_array_equal,
+    assert_equal,
+    assert_raises,
+)
 
-from cminpack_numba import lmder, lmdif
+from cminpack_numba import enorm, lmder, lmder_bounded, lmdif, lmdif_bounded, profile
 from cminpack_numba.signatures import lmder_sig, lmdif_sig
-from cminpack_numba.src.bounds import in2ext, in2ext_grad
+from cminpack_numba.src.bounds import ext2in, in2ext, in2ext_grad
 
 
 @cfunc(lmdif_sig)
@@ -71,6 +78,17 @@ def rosenbrock_bounds(udata, m, n, x, fvec, iflag):
     return 0
 
 
+@cfunc(lmdif_sig)
+def rosenbrock_array_bounds(udata, m, n, x, fvec, iflag):
+    x_in = carray(x, (n,), float64)
+    fvec = carray(fvec, (m,), float64)
+    udata = carray(udata, (2 * n,), float64)
+    x_ext = in2ext(x_in, udata[:n], udata[n:])
+    fvec[0] = 10.0 * (x_ext[1] - x_ext[0] ** 2)
+    fvec[1] = 1.0 - x_ext[0]
+    return 0
+
+
 @njit
 def driver_fun_trivial(address, x0, lb, ub):
     x, fvec, fjac, ipvt, qtf, _nfev, info = lmdif(address, 1, x0, udata=array([lb, ub]))
@@ -164,3 +182,142 @@ def test_rosenbrock_bounds() -> None:
         optimality = driver_rosenbrock(rosenbrock_bounds.address, x0, bounds)
         print(optimality)
         # assert_allclose(optimality, 0.0, atol=1e-5)
+
+
+def _random_bounds(n):
+    rng = default_rng(0)
+    no_lower, no_upper = rng.integers(0, 2, (2, n), dtype=bool)
+    lower = rng.uniform(-2.0, 0.0, n)
+    upper = rng.uniform(1.0, 3.0, n)
+    lower[no_lower] = -inf
+    upper[no_upper] = inf
+    return rng.standard_normal(n), lower, upper
+
+
+def _optional(bound):
+    return None if isinf(bound) else bound
+
+
+def test_array_bounds() -> None:
+    x, lower, upper = _random_bounds(100)
+    for transform in ext2in, in2ext, in2ext_grad:
+        expected = empty(x.size)
+        for i in range(x.size):
+            bounds = (_optional(lower[i]),), (_optional(upper[i]),)
+            expected[i] = transform(x[i : i + 1], *bounds)[0]
+        out = empty(x.size)
+        assert_(transform(x, lower, upper, out=out) is out)
+        assert_array_equal(out, expected)
+
+    # the transforms are inverse of each other on the external parameters
+    x_ext = in2ext(x, lower, upper)
+    assert_allclose(in2ext(ext2in(x_ext, lower, upper), lower, upper), x_ext)
+    assert_((x_ext >= lower).all())
+    assert_((x_ext <= upper).all())
+
+    step = 1e-6
+    gradient = (in2ext(x + step, lower, upper) - in2ext(x - step, lower, upper)) / (
+        2.0 * step
+    )
+    assert_allclose(in2ext_grad(x, lower, upper), gradient, rtol=1e-6, atol=1e-9)
+
+
+def test_rosenbrock_array_bounds() -> None:
+    x0 = array([-1.2, 1.0])
+    udata = array([-50.0, 0.0, 0.5, 100.0])
+    expected = lmdif(rosenbrock_bounds.address, 2, x0, udata=udata)
+    result = lmdif(rosenbrock_array_bounds.address, 2, x0, udata=udata)
+    assert_equal(len(result), len(expected))
+    for i, j in zip(result, expected):
+        assert_array_equal(i, j)
+
+
+@njit
+def rosenbrock(udata, m, n, x, fvec, iflag):
+    # records the range of the parameters fcn is called with
+    for i in range(n):
+        udata[0, i] = min(udata[0, i], x[i])
+        udata[1, i] = max(udata[1, i], x[i])
+    fvec[0] = 10.0 * (x[1] - x[0] ** 2)
+    fvec[1] = 1.0 - x[0]
+    return 0
+
+
+@njit
+def rosenbrock_jac(udata, m, n, x, fvec, fjac, iflag):
+    if iflag == 1:
+        return rosenbrock(udata, m, n, x, fvec, iflag)
+    fjac[0, 0] = -20.0 * x[0]
+    fjac[0, 1] = 10.0
+    fjac[1, 0] = -1.0
+    fjac[1, 1] = 0.0
+    return 0
+
+
+def _called_range():
+    called = empty((2, 2))
+    called[0] = inf
+    called[1] = -inf
+    return called
+
+
+def test_lmdif_bounded() -> None:
+    x0 = array([-1.2, 1.0])
+    lower, upper = array([-50.0, 0.0]), array([0.5, 100.0])
+    udata = _called_range()
+    result = lmdif_bounded(rosenbrock, 2, x0, lower, upper, udata=udata)
+    assert_((udata[0] >= lower).all())
+    assert_((udata[1] <= upper).all())
+    assert_allclose(result.x, [0.5, 0.25])
+
+    # the same as transforming the parameters in the residual
+    expected = lmdif(
+        rosenbrock_array_bounds.address,
+        2,
+        ext2in(x0, lower, upper),
+        udata=concatenate((lower, upper)),
+    )
+    assert_array_equal(result.x, in2ext(expected.x, lower, upper))
+    assert_array_equal(result.fvec, expected.fvec)
+    assert_equal(result.nfev, expected.nfev)
+
+    with assert_raises(ValueError):
+        lmdif_bounded(rosenbrock, 2, x0, lower[:1], upper[:1], udata=udata)
+
+
+def test_lmder_bounded() -> None:
+    x0 = array([-1.2, 1.0])
+    lower, upper = array([-50.0, -inf]), array([0.9, 100.0])
+    udata = _called_range()
+    trace = empty((100, 3))
+    prof = profile()
+    result = lmder_bounded(
+        rosenbrock_jac,
+        2,
+        x0,
+        lower,
+        upper,
+        udata=udata,
+        trace=trace,
+        profile=prof,
+    )
+    assert_((udata[0] >= lower).all())
+    assert_((udata[1] <= upper).all())
+    assert_allclose(result.x, [0.9, 0.81])
+    assert_equal(prof.calls[1:], [result.nfev, result.njev])
+    k = (~isnan(trace[:, 0])).sum()
+    assert_allclose(trace[k - 1, 0], enorm(result.fvec))
+    assert_allclose(
+        lmdif_bounded(rosenbrock, 2, x0, lower, upper, udata=_called_range()).x,
+        result.x,
+    )
+
+    # fjac holds the R of the jacobian with respect to the external parameters
+    lower, upper = array([-2.0, -inf]), array([2.0, inf])
+    result = lmder_bounded(rosenbrock_jac, 2, x0, lower, upper, udata=_called_range())
+    assert_allclose(result.x, [1.0, 1.0])
+    fjac = zeros((2, 2))
+    rosenbrock_jac(_called_range(), 2, 2, result.x, empty(2), fjac, 2)
+    pivoted = fjac[:, result.ipvt - 1]
+    r = triu(result.fjac.reshape(2, 2).T)
+    assert_allclose(r.T @ r, pivoted.T @ pivoted)
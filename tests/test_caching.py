@@ -0,0 +1,127 @@
+"""Test the on-disk caching of the compiled functions."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from numba import njit
+from numba.core.caching import FunctionCache
+from numpy.testing import assert_, assert_equal
+
+from cminpack_numba import lmdif
+from cminpack_numba.src import _caching
+
+# root of the source checkout, for the fresh interpreters to import the package from
+_ROOT = str(Path(__file__).parent.parent)
+
+
+def test_locator() -> None:
+    locator = lmdif._cache._impl.locator
+    assert_(isinstance(locator, _caching._CminpackLocatorMixin))
+    _, package, library = locator.get_source_stamp().value
+    assert_("_lmdif.py" in dict(package))
+    assert_(len(library) > 0)
+
+
+def test_other_functions_unchanged() -> None:
+    @njit(cache=True)
+    def f():
+        return 1
+
+    assert_equal(type(f._cache), FunctionCache)
+    assert_(not isinstance(f._cache._impl.locator, _caching._CminpackLocatorMixin))
+    assert_(isinstance(lmdif._cache, _caching._FunctionCache))
+
+
+def test_package_stamp_once() -> None:
+    assert_(_caching._package_stamp() is _caching._package_stamp())
+
+
+def test_library_change_invalidates(monkeypatch, tmp_path) -> None:
+    cache_file = lmdif._cache._cache_file
+    locator = lmdif._cache._impl.locator
+    monkeypatch.setattr(cache_file, "_index_path", str(tmp_path / "index.nbi"))
+    cache_file._save_index({"key": "data.nbc"})
+    assert_equal(cache_file._load_index(), {"key": "data.nbc"})
+
+    monkeypatch.setattr(_caching, "_library_stamp", lambda: (("libcminpack", b""),))
+    monkeypatch.setattr(cache_file, "_source_stamp", locator.get_source_stamp())
+    assert_equal(cache_file._load_index(), {})
+
+
+_NJIT_SCRIPT = """
+from numba import njit
+from numpy import arange, array
+
+from cminpack_numba import lmdif
+
+
+@njit
+def fcn(udata, m, n, x, fvec, iflag):
+    for i in range(m):
+        fvec[i] = x[0] * i + x[1] - udata[i]
+    return 0
+
+
+result = lmdif(fcn, 5, array([1.0, 1.0]), udata=2.0 * arange(5.0) + 1.0)
+assert abs(result.x - array([2.0, 1.0])).max() < 1e-8
+print(sum(lmdif.stats.cache_hits.values()), sum(lmdif.stats.cache_misses.values()))
+"""
+
+
+def _run(tmp_path, *args) -> list[str]:
+    """Run python with `args` in a fresh interpreter caching in tmp_path."""
+    path = os.pathsep.join(filter(None, [_ROOT, os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "NUMBA_CACHE_DIR": str(tmp_path / "cache"), "PYTHONPATH": path}
+    out = subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        check=True,
+        text=True,
+        env=env,
+    )
+    return out.stdout.split()
+
+
+def test_njit_fcn_cache_hit(tmp_path) -> None:
+    # the trampoline of an njit fcn must not bake an address into the cached code
+    script = tmp_path / "script.py"
+    script.write_text(_NJIT_SCRIPT)
+    runs = []
+    for _ in range(2):
+        runs.append(_run(tmp_path, str(script)))
+        runs[-1].append(len(list((tmp_path / "cache").rglob("_lmdif.lmdif-*.nbc"))))
+    assert_equal(runs, [["0", "1", 1], ["1", "0", 1]])
+
+
+_CONSTANT_SCRIPT = """
+from numba import njit
+from numpy import zeros
+
+from cminpack_numba import lmdif
+
+
+@njit
+def fcn(udata, m, n, x, fvec, iflag):
+    for i in range(m):
+        fvec[i] = x[i] - {value}
+    return 0
+
+
+result = lmdif(fcn, 2, zeros(2))
+print(result.x[0], sum(lmdif.stats.cache_hits.values()))
+"""
+
+
+def test_njit_fcn_constant_change(tmp_path) -> None:
+    # the same bytecode with another constant must not load the first machine code
+    script = tmp_path / "script.py"
+    for value in ("1.0", "2.0"):
+        script.write_text(_CONSTANT_SCRIPT.format(value=value))
+        assert_equal(_run(tmp_path, str(script)), [value, "0"])
+    # without a source file, the changes of fcn cannot be detected: no caching
+    for value in ("1.0", "2.0"):
+        source = _CONSTANT_SCRIPT.format(value=value)
+        assert_equal(_run(tmp_path, "-c", source), [value, "0"])
+    assert_equal(_run(tmp_path, "-c", source), [value, "0"])
@@ -0,0 +1,82 @@
+"""Test the loading of the cminpack libraries."""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from numba import types
+from numpy.testing import assert_, assert_equal
+
+from cminpack_numba import use_blas
+from cminpack_numba.src.cminpack_ import (
+    _external_function,
+    _has_cminpack,
+    _has_symbol,
+    _load_cminpack,
+)
+
+_SCRIPT = """
+import cminpack_numba
+print(cminpack_numba.src.cminpack_._load_cminpack.cache_info().currsize)
+"""
+
+
+def test_lazy_loading() -> None:
+    out = subprocess.run(
+        [sys.executable, "-c", _SCRIPT],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert_equal(out.stdout.strip(), "0")
+
+
+def test_load_cminpack() -> None:
+    assert_equal(_has_cminpack(), True)
+    assert_equal(_load_cminpack(), _load_cminpack())
+    assert_equal(_load_cminpack.cache_info().currsize > 0, True)
+
+
+def test_missing_symbol() -> None:
+    assert_(_has_symbol("lmdif"))
+    assert_(not _has_symbol("lmdif", "q"))
+    with pytest.raises(ImportError, match="not exported by the cminpack library"):
+        _external_function("missing", types.float64, types.void())
+
+
+_BLAS_SCRIPT = """
+import cminpack_numba
+from cminpack_numba.src.cminpack_ import _load_cminpack
+print(_load_cminpack())
+"""
+
+
+def _run(script, **env):
+    return subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=False,
+        text=True,
+        env={**os.environ, **env},
+    )
+
+
+def test_blas_environment(tmp_path) -> None:
+    # any build of cminpack stands in for the BLAS build
+    library = tmp_path / Path(_load_cminpack()).name
+    shutil.copy(_load_cminpack(), library)
+    out = _run(_BLAS_SCRIPT, CMINPACK_NUMBA_BLAS=str(tmp_path))
+    assert_equal(out.stdout.strip(), str(library))
+
+    out = _run(_BLAS_SCRIPT, CMINPACK_NUMBA_BLAS=str(tmp_path / "missing"))
+    assert_("BLAS build" in out.stderr)
+
+
+def test_use_blas() -> None:
+    _load_cminpack()
+    use_blas(None)
+    with pytest.raises(RuntimeError, match="before the cminpack library"):
+        use_blas("/path/to/cminpack-blas")
@@ -0,0 +1,82 @@
+"""Test the covariance matrices of lmdif, lmder and lmstr."""
+
+from numba import njit
+from numpy import arange, column_stack, diag, empty, full_like, tile, where
+from numpy.linalg import inv
+from numpy.testing import assert_allclose, assert_equal
+
+from cminpack_numba import covar, covar1, lmder, lmdif, lmdif_batch, lmstr
+
+from . import test_lmder, test_lmdif, test_lmstr
+
+
+def _reference(x):
+    """Unscaled covariance matrix of the lmdif test problem from its jacobian."""
+    i = arange(1, 16)
+    tmp2 = 16 - i
+    tmp3 = where(i > 8, tmp2, i)
+    den = (x[1] * tmp2 + x[2] * tmp3) ** 2
+    fjac = column_stack((full_like(x, -1.0, shape=15), i * tmp2 / den, i * tmp3 / den))
+    return inv(fjac.T @ fjac)
+
+
+def test_covar() -> None:
+    t = test_lmdif
+    result = lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, udata=t.UDATA)
+    reference = _reference(result.x)
+    assert_allclose(covar(result.fjac, result.ipvt), reference, rtol=1e-3)
+
+    cov, info = covar1(result.fvec, result.fjac, result.ipvt)
+    assert_equal(info, 0)
+    scale = (result.fvec @ result.fvec) / (t.M - t.N)
+    assert_allclose(cov, scale * reference, rtol=1e-3)
+
+
+def test_covariance() -> None:
+    t = test_lmdif
+    cov = empty((t.N, t.N))
+    result = lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, udata=t.UDATA, covariance=cov)
+    assert_allclose(cov, covar1(result.fvec, result.fjac, result.ipvt)[0])
+
+    t = test_lmder
+    cov = empty((t.N, t.N))
+    result = lmder(t.trial_lmder_fcn.address, t.M, t.X0, udata=t.UDATA, covariance=cov)
+    assert_allclose(cov, covar1(result.fvec, result.fjac, result.ipvt)[0])
+
+    t = test_lmstr
+    cov = empty((t.N, t.N))
+    result = lmstr(t.trial_lmstr_fcn.address, t.M, t.X0, covariance=cov)
+    assert_allclose(cov, covar1(result.fvec, result.fjac, result.ipvt)[0])
+
+
+def test_covariance_njit() -> None:
+    @njit
+    def standard_errors(fcn, m, x0, udata):
+        n = x0.size
+        cov = empty((n, n))
+        lmdif(fcn, m, x0, udata=udata, covariance=cov)
+        return diag(cov) ** 0.5
+
+    t = test_lmdif
+    cov = empty((t.N, t.N))
+    lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, udata=t.UDATA, covariance=cov)
+    errors = standard_errors(t.trial_lmdif_fcn.address, t.M, t.X0, t.UDATA)
+    assert_allclose(errors, cov.diagonal() ** 0.5)
+
+
+def test_covariance_batch() -> None:
+    t = test_lmdif
+    k = 8
+    covs = empty((k, t.N, t.N))
+    x, fvec, _, info = lmdif_batch(
+        t.trial_lmdif_fcn.address,
+        t.M,
+        tile(t.X0, (k, 1)),
+        udata=tile(t.UDATA, (k, 1)),
+        covariance=covs,
+    )
+    cov = empty((t.N, t.N))
+    lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, udata=t.UDATA, covariance=cov)
+    for i in range(k):
+        t._check_results(x[i], fvec[i], info[i])
+        assert_allclose(covs[i], cov)
@@ -3,10 +3,10 @@
 from __future__ import annotations
 
 from numba import carray, cfunc, njit
-from numpy import array, empty, finfo, float64, full, int32, ones, sqrt
+from numpy import array, empty, finfo, float64, full, int32, ones, sqrt, tile
 from numpy.testing import assert_allclose, assert_equal
 
-from cminpack_numba import enorm, hybrd, hybrd1
+from cminpack_numba import enorm, hybrd, hybrd1, hybrd_batch
 from cminpack_numba.signatures import hybrd_sig
 from cminpack_numba.src import hybrd1_, hybrd_
 from cminpack_numba.utils import ptr_from_val, val_from_ptr
@@ -146,3 +146,43 @@ def test_udata_hybrd_() -> None:
     for i in (UDATA, UDATA.ctypes.data):
         x, fvec, info, nfev = driver(trial_hybrd_fcn_udata.address, i)
         _check_result(x, fvec, info, nfev)
+
+
+def test_hybrd_batch() -> None:
+    """Batched version of the minpack c-api hybrd test."""
+    x0 = tile(X0, (8, 1))
+    diag = tile(DIAG, (8, 1))
+    args = TOL, 2000, 1, 1, 0.0, diag, 2, 100.0, 0
+    x, fvec, nfev, info = hybrd_batch(trial_hybrd_fcn.address, x0, *args)
+    for i in range(8):
+        _check_result(x[i], fvec[i], info[i], nfev[i])
+
+
+def test_udata_hybrd_batch() -> None:
+    """Batched version of the minpack c-api hybrd test, with a udata row per system."""
+    x0 = tile(X0, (8, 1))
+    diag = tile(DIAG, (8, 1))
+    udata = tile(UDATA, (8, 1))
+    address = trial_hybrd_fcn_udata.address
+    args = TOL, 2000, 1, 1, 0.0, diag, 2, 100.0, 0
+    x, fvec, nfev, info = hybrd_batch(address, x0, *args, udata)
+    for i in range(8):
+        _check_result(x[i], fvec[i], info[i], nfev[i])
+
+
+def test_hybrd_zero_bandwidth() -> None:
+    """ml = 0 and mu = 0 are passed on rather than replaced with the dense default."""
+    address = trial_hybrd_fcn.address
+    dense = hybrd(address, X0, TOL)
+    for ml, mu in ((0, 1), (1, 0), (0, 0)):
+        x, fvec, *_, nfev, info = hybrd(address, X0, TOL, ml=ml, mu=mu)
+        reference = hybrd_batch(address, X0[None], TOL, ml=ml, mu=mu)
+        assert_equal((x, fvec, nfev, info), [i[0] for i in reference])
+        assert nfev != dense[-2]
+
+
+def test_hybrd_result() -> None:
+    """The result is a namedtuple, whose fjac, r and qtf can be left empty."""
+    result = hybrd(trial_hybrd_fcn.address, X0, TOL, full_output=False)
+    assert_equal((result.fjac.size, result.r.size, result.qtf.size), (0, 0, 0))
+    _check_result(result.x, result.fvec, result.info)
@@ -1,10 +1,10 @@
 """Python implementations of the tests from the minpack c-api test suite."""
 
 from numba import carray, cfunc, njit
-from numpy import array, empty, finfo, float64, full, int32, ones, sqrt
+from numpy import array, empty, finfo, float64, full, int32, ones, sqrt, tile
 from numpy.testing import assert_allclose, assert_equal
 
-from cminpack_numba import enorm, hybrj, hybrj1
+from cminpack_numba import enorm, hybrj, hybrj1, hybrj_batch
 from cminpack_numba.signatures import hybrj_sig
 from cminpack_numba.src import hybrj1_, hybrj_
 from cminpack_numba.utils import ptr_from_val, val_from_ptr
@@ -160,3 +160,25 @@ def test_udata_hybrj_() -> None:
     for i in (UDATA, UDATA.ctypes.data):
         x, fvec, nfvev, njev, info = driver(trial_hybrj_fcn.address, i)
         _check_result(x, fvec, info, nfvev, njev)
+
+
+def test_hybrj_batch() -> None:
+    """Batched version of the minpack c-api hybrj test."""
+    x0 = tile(X0, (8, 1))
+    diag = tile(DIAG, (8, 1))
+    args = TOL, 2000, diag, 2, 100.0, 0
+    x, fvec, nfev, njev, info = hybrj_batch(trial_hybrj_fcn.address, x0, *args)
+    for i in range(8):
+        _check_result(x[i], fvec[i], info[i], nfev[i], njev[i])
+
+
+def test_udata_hybrj_batch() -> None:
+    """Batched version of the minpack c-api hybrj test, with a udata row per system."""
+    x0 = tile(X0, (8, 1))
+    diag = tile(DIAG, (8, 1))
+    udata = tile(UDATA, (8, 1))
+    address = trial_hybrj_fcn_udata.address
+    args = TOL, 2000, diag, 2, 100.0, 0
+    x, fvec, nfev, njev, info = hybrj_batch(address, x0, *args, udata)
+    for i in range(8):
+        _check_result(x[i], fvec[i], info[i], nfev[i], njev[i])
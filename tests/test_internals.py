@@ -0,0 +1,202 @@
+"""Test the wrappers of the internal MINPACK subroutines."""
+
+import pytest
+from numba import njit
+from numpy import (
+    array,
+    asfortranarray,
+    concatenate,
+    diag,
+    eye,
+    fill_diagonal,
+    int32,
+    ones,
+    sign,
+    tril,
+    triu,
+    zeros,
+)
+from numpy.linalg import lstsq, norm, qr
+from numpy.random import default_rng
+from numpy.testing import assert_allclose, assert_equal
+
+from cminpack_numba import (
+    dogleg,
+    fdjac1,
+    fdjac2,
+    hybrd,
+    lmdif,
+    lmpar,
+    qform,
+    qrfac,
+    qrsolv,
+    r1mpyq,
+    r1updt,
+    rwupdt,
+)
+from cminpack_numba.src import lmpar_, qrfac_
+from cminpack_numba.src.cminpack_ import _has_symbol
+from cminpack_numba.utils import ptr_from_val
+
+from . import test_hybrd, test_lmdif
+from .test_pure import hybrd_fcn, lmdif_fcn
+
+# only fdjac1 and fdjac2 are exported by a Windows build not exporting all symbols
+exported = pytest.mark.skipif(
+    not _has_symbol("qrfac"),
+    reason="the cminpack library does not export the internal subroutines",
+)
+
+RNG = default_rng(0)
+A = RNG.standard_normal((6, 3))
+B = RNG.standard_normal(6)
+
+
+def _factorize(a, b):
+    """qrfac of a, with R and transpose(Q) * b."""
+    r, ipvt, rdiag, acnorm = qrfac(asfortranarray(a))
+    q, _r = qr(a[:, ipvt - 1])
+    qtb = (q * sign(diag(_r)) * sign(rdiag)).T @ b
+    r = asfortranarray(r[: a.shape[1]])
+    fill_diagonal(r, rdiag)
+    return r, ipvt, qtb, acnorm
+
+
+@exported
+def test_qrfac() -> None:
+    r, ipvt, qtb, acnorm = _factorize(A, B)
+    assert_equal(sorted(ipvt), [1, 2, 3])
+    assert_allclose(acnorm, norm(A, axis=0))
+    assert_allclose(abs(diag(r)), abs(diag(qr(A[:, ipvt - 1])[1])))
+
+
+@exported
+def test_qrfac_() -> None:
+    @njit
+    def driver(a):
+        m, n = a.shape
+        ipvt = zeros(n, dtype=int32)
+        rdiag = zeros(n)
+        acnorm = zeros(n)
+        wa = zeros(n)
+        return qrfac_(m, n, a, m, True, ipvt, n, rdiag, acnorm, wa)
+
+    a = asfortranarray(A)
+    _, ipvt, rdiag, _ = driver(a.copy(order="F"))
+    _, reference_ipvt, reference_rdiag, _ = qrfac(a.copy(order="F"))
+    assert_equal(ipvt, reference_ipvt)
+    assert_allclose(rdiag, reference_rdiag)
+
+
+@exported
+def test_qrfac_column_major() -> None:
+    with pytest.raises(ValueError, match="column-major"):
+        qrfac(A.copy())
+
+
+@exported
+def test_qform() -> None:
+    a = asfortranarray(RNG.standard_normal((5, 5)))
+    factorized, _, rdiag, _ = qrfac(a.copy(order="F"), False)
+    r = triu(factorized)
+    fill_diagonal(r, rdiag)
+    q = qform(factorized, 5)
+    assert_allclose(q @ r, a, atol=1e-12)
+
+
+@exported
+def test_qrsolv() -> None:
+    r, ipvt, qtb, _ = _factorize(A, B)
+    x, _ = qrsolv(r, ipvt, zeros(3), qtb)
+    assert_allclose(x, lstsq(A, B, rcond=None)[0])
+
+
+@exported
+def test_lmpar() -> None:
+    r, ipvt, qtb, _ = _factorize(A, B)
+    delta = 0.1
+    par, x, _ = lmpar(r, ipvt, ones(3), qtb, delta)
+    assert par > 0.0
+    assert_allclose(norm(x), delta, rtol=0.1)
+
+
+@exported
+def test_dogleg() -> None:
+    # R packed by rows
+    r = array([2.0, 1.0, 0.5, 3.0, 1.0, 4.0])
+    assert_allclose(dogleg(r, ones(3), ones(3), 10.0), [0.3125, 0.25, 0.25])
+    assert_allclose(norm(dogleg(r, ones(3), ones(3), 0.1)), 0.1)
+
+
+def test_fdjac2() -> None:
+    t = test_lmdif
+    result = lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, udata=t.UDATA)
+    x = result.x.copy()
+    fjac, info = fdjac2(t.trial_lmdif_fcn.address, x, result.fvec)
+    assert_equal(info, 0)
+    assert_equal(x, result.x)
+    assert fjac.flags.f_contiguous
+    assert_equal(fdjac2(lmdif_fcn, x, result.fvec, udata=t.UDATA)[0], fjac)
+    assert_allclose(fjac[:, 0], -1.0, rtol=1e-6)
+    assert_equal(qrfac(fjac)[1], result.ipvt)
+
+
+def test_fdjac1() -> None:
+    t = test_hybrd
+    result = hybrd(t.trial_hybrd_fcn.address, t.X0)
+    fjac, info = fdjac1(t.trial_hybrd_fcn.address, result.x.copy(), result.fvec)
+    assert_equal(info, 0)
+    banded, _ = fdjac1(hybrd_fcn, result.x.copy(), result.fvec, 1, 1)
+    assert_allclose(banded, fjac, atol=1e-6)
+    assert_equal(triu(banded, 2), 0.0)
+
+
+@exported
+def test_r1updt() -> None:
+    m = n = 4
+    s = tril(RNG.standard_normal((m, n))) + 4.0 * eye(m)
+    packed = concatenate([s[j:, j] for j in range(n)])
+    u = RNG.standard_normal(m)
+    v = RNG.standard_normal(n)
+    a = s.copy()
+    packed, v_, w, sing = r1updt(packed, u, v.copy())
+    assert not sing
+    updated = zeros((m, n))
+    k = 0
+    for j in range(n):
+        updated[j:, j] = packed[k : k + m - j]
+        k += m - j
+    # the updated S is (S + u * transpose(v)) * Q, with Q applied by r1mpyq
+    q = r1mpyq(asfortranarray(eye(n)), v_, w)
+    assert_allclose(updated, (a + u[:, None] * v) @ q, atol=1e-12)
+
+
+@exported
+def test_rwupdt() -> None:
+    r = asfortranarray(triu(RNG.standard_normal((3, 3))))
+    w = RNG.standard_normal(3)
+    updated, _, _, cos, sin = rwupdt(r.copy(order="F"), w, zeros(3), 1.0)
+    assert_allclose(cos**2 + sin**2, 1.0)
+    updated = triu(updated)
+    assert_allclose(updated.T @ updated, r.T @ r + w[:, None] * w, atol=1e-12)
+
+
+@exported
+def test_lmpar_() -> None:
+    @njit
+    def driver(r, ipvt, qtb, par):
+        n = r.shape[0]
+        x = zeros(n)
+        sdiag = zeros(n)
+        wa1 = zeros(n)
+        wa2 = zeros(n)
+        parptr = ptr_from_val(par)
+        return lmpar_(n, r, n, ipvt, ones(n), qtb, 0.1, parptr, x, sdiag, wa1, wa2)
+
+    r, ipvt, qtb, _ = _factorize(A, B)
+    par, x, _ = driver(r.copy(order="F"), ipvt, qtb, 1.0)
+    reference_par, reference_x, _ = lmpar(
+        r.copy(order="F"), ipvt, ones(3), qtb, 0.1, 1.0
+    )
+    assert_allclose(par, reference_par)
+    assert_allclose(x, reference_x)
@@ -1,10 +1,17 @@
 """Python implementation of the tests from the minpack c-api test suite."""
 
 from numba import carray, cfunc, njit
-from numpy import array, empty, finfo, float64, int32, ones, sqrt
-from numpy.testing import assert_allclose, assert_equal
-
-from cminpack_numba import chkder, enorm, lmder, lmder1
+from numpy import array, diff, empty, finfo, float64, int32, isinf, ones, sqrt, vstack
+from numpy.testing import assert_, assert_allclose, assert_array_equal, assert_equal
+
+from cminpack_numba import (
+    chkder,
+    enorm,
+    lmder,
+    lmder1,
+    lmder_multistart,
+    random_starts,
+)
 from cminpack_numba.signatures import lmder_sig
 from cminpack_numba.src import lmder1_, lmder_
 from cminpack_numba.utils import ptr_from_val
@@ -212,3 +219,34 @@ def test_udata_lmder_() -> None:
     for i in (UDATA, UDATA.ctypes.data):
         x, fvec, info = driver(trial_lmder_fcn.address, i)
         _check_results(x, fvec, info)
+
+
+def test_lmder_multistart() -> None:
+    starts = vstack((random_starts(0.01 * X0, 10.0 * X0, 15, seed=0), X0))
+    address = trial_lmder_fcn_udata.address
+    result = lmder_multistart(address, M, starts, k=4, udata=UDATA)
+    assert_equal(result.x.shape, (4, N))
+    assert_((diff(result.fnorm) >= 0.0).all())
+    assert_allclose(result.x[0], REFERENCE, atol=100 * TOL)
+    assert_allclose(result.fnorm[0], 0.9063596e-1, TOL)
+    # the same solutions as lmder from their starts
+    for i, start in enumerate(result.start):
+        expected = lmder(address, M, starts[start], udata=UDATA)
+        assert_array_equal(result.x[i], expected.x)
+        assert_equal(result.fnorm[i], enorm(expected.fvec))
+        assert_equal(
+            (result.nfev[i], result.njev[i], result.info[i]),
+            (expected.nfev, expected.njev, expected.info),
+        )
+
+
+def test_lmder_multistart_target() -> None:
+    # 4 starts per chunk, those after the first to reach the target are skipped
+    starts = random_starts(0.01 * X0, 10.0 * X0, 1024, seed=0)
+    address = trial_lmder_fcn_udata.address
+    result = lmder_multistart(address, M, starts, k=1024, target=0.1, udata=UDATA)
+    assert_(result.fnorm[0] <= 0.1)
+    # the starts skipped once the target was reached
+    skipped = isinf(result.fnorm)
+    assert_(skipped.any())
+    assert_equal(result.nfev[skipped], 0)
@@ -1,10 +1,12 @@
 """Python implementations of the tests from the minpack c-api test suite."""
 
+import pytest
 from numba import carray, cfunc, njit
-from numpy import array, empty, finfo, float64, int32, ones, sqrt
+from numba.core.errors import TypingError
+from numpy import array, empty, finfo, float64, int32, ones, sqrt, tile
 from numpy.testing import assert_allclose, assert_equal
 
-from cminpack_numba import enorm, lmdif, lmdif1
+from cminpack_numba import enorm, lmdif, lmdif1, lmdif_batch
 from cminpack_numba.signatures import lmdif_sig
 from cminpack_numba.src import lmdif1_, lmdif_
 from cminpack_numba.utils import ptr_from_val
@@ -161,3 +163,48 @@ def test_udata_lmdif_() -> None:
     for i in (UDATA, UDATA.ctypes.data):
         x, fvec, info = driver(trial_lmdif_fcn_udata.address, i)
         _check_results(x, fvec, info)
+
+
+def test_lmdif_batch() -> None:
+    """Batched version of the minpack c-api lmdif test."""
+    x0 = tile(X0, (8, 1))
+    x, fvec, nfev, info = lmdif_batch(trial_lmdif_fcn.address, M, x0, TOL, TOL)
+    assert_equal(x0, 1.0)
+    for i in range(8):
+        _check_results(x[i], fvec[i], info[i])
+    assert_equal(nfev, nfev[0])
+
+
+def test_udata_lmdif_batch() -> None:
+    """Batched version of the minpack c-api lmdif test, with a udata row per problem."""
+    x0 = tile(X0, (8, 1))
+    udata = tile(UDATA, (8, 1))
+    address = trial_lmdif_fcn_udata.address
+    x, fvec, _, info = lmdif_batch(address, M, x0, TOL, TOL, udata=udata)
+    for i in range(8):
+        _check_results(x[i], fvec[i], info[i])
+
+    # unlike lmdif, the batched drivers need a row of udata per problem
+    with pytest.raises(TypingError, match="row per problem"):
+        lmdif_batch(address, M, x0, udata=UDATA.ctypes.data)
+
+
+def test_lmdif_result() -> None:
+    """The result is a namedtuple, whose fjac and qtf can be left empty."""
+    result = lmdif(trial_lmdif_fcn.address, M, X0, TOL, TOL)
+    assert_equal(result.fjac.shape, (M, N))
+    short = lmdif(trial_lmdif_fcn.address, M, X0, TOL, TOL, full_output=False)
+    assert_equal((short.fjac.shape, short.qtf.shape), ((0, N), (0,)))
+    for i in ("x", "fvec", "ipvt", "nfev", "info"):
+        assert_equal(getattr(short, i), getattr(result, i))
+    _check_results(short.x, short.fvec, short.info)
+
+
+@njit
+def _lmdif_info(address):
+    return lmdif(address, M, X0, TOL, TOL, full_output=False).info
+
+
+def test_lmdif_result_njit() -> None:
+    """The fields of the result can be accessed in nopython mode."""
+    assert_equal(_lmdif_info(trial_lmdif_fcn.address), 1)
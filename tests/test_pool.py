@@ -0,0 +1,62 @@
+"""Test solving batches in worker processes with shared-memory arrays."""
+
+import pytest
+from numpy import arange, tile
+from numpy.testing import assert_array_equal, assert_equal
+from numpy.typing import NDArray
+
+from cminpack_numba import BatchPool, lmder, lmdif_batch
+
+from . import test_lmder, test_lmdif
+
+K = 16
+
+
+def _starts(x0: NDArray) -> NDArray:
+    return tile(x0, (K, 1)) * (1.0 + arange(K) / K)[:, None]
+
+
+def test_pool_lmdif() -> None:
+    t = test_lmdif
+    x0, udata = _starts(t.X0), tile(t.UDATA, (K, 1))
+    expected = lmdif_batch(t.trial_lmdif_fcn_udata.address, t.M, x0, udata=udata)
+    with BatchPool(t.trial_lmdif_fcn_udata, max_workers=2) as pool:
+        result = pool.solve(t.M, x0, udata)
+        assert_equal(len(result), len(expected))
+        for i, j in zip(result, expected):
+            assert_array_equal(i, j)
+        assert_equal(x0, _starts(t.X0))
+
+        # udata in the pool's shared memory is read in place, batch after batch
+        shared = pool.array(udata.shape)
+        shared[...] = udata
+        for _ in range(2):
+            result = pool.solve(t.M, x0, shared)
+            assert_equal(len(result), len(expected))
+            for i, j in zip(result, expected):
+                assert_array_equal(i, j)
+        del shared
+
+
+def test_pool_lmder() -> None:
+    t = test_lmder
+    x0 = _starts(t.X0)
+    reference = "tests.test_lmder:trial_lmder_fcn"
+    with BatchPool(reference, "lmder", max_workers=2) as pool:
+        x, fvec, nfev, info = pool.solve(t.M, x0, ftol=t.TOL, xtol=t.TOL)
+    for i in range(K):
+        result = lmder(t.trial_lmder_fcn.address, t.M, x0[i], t.TOL, t.TOL)
+        assert_array_equal(x[i], result.x)
+        assert_array_equal(fvec[i], result.fvec)
+        assert_equal((nfev[i], info[i]), (result.nfev, result.info))
+
+
+def test_pool_errors() -> None:
+    with pytest.raises(ValueError, match="kind"):
+        BatchPool("tests.test_lmdif:trial_lmdif_fcn", "hybrd")
+    t = test_lmdif
+    with (
+        BatchPool(t.trial_lmdif_fcn_udata, max_workers=1) as pool,
+        pytest.raises(ValueError, match="row per problem"),
+    ):
+        pool.solve(t.M, _starts(t.X0), t.UDATA[None])
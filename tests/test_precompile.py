@@ -0,0 +1,25 @@
+"""Test that precompile builds the specialisations used by common calls."""
+
+from numpy import tile
+from numpy.testing import assert_equal
+
+from cminpack_numba import enorm, hybrd, lmdif, lmdif_batch, precompile
+
+from . import test_hybrd, test_lmdif
+
+
+def test_precompile() -> None:
+    precompile(("float64",))
+    funcs = enorm, hybrd, lmdif, lmdif_batch
+    before = [len(i.signatures) for i in funcs]
+
+    t = test_lmdif
+    lmdif(t.trial_lmdif_fcn.address, t.M, t.X0)
+    lmdif(t.trial_lmdif_fcn_udata.address, t.M, t.X0, udata=t.UDATA)
+    lmdif(t.trial_lmdif_fcn_udata.address, t.M, t.X0, udata=t.UDATA.ctypes.data)
+    udata = tile(t.UDATA, (4, 1))
+    lmdif_batch(t.trial_lmdif_fcn_udata.address, t.M, tile(t.X0, (4, 1)), udata=udata)
+    hybrd(test_hybrd.trial_hybrd_fcn.address, test_hybrd.X0)
+    enorm(t.X0)
+
+    assert_equal([len(i.signatures) for i in funcs], before)
@@ -0,0 +1,92 @@
+"""Test profiling the calls to fcn of the high-level wrappers."""
+
+from numba import njit
+from numpy import empty, isnan
+from numpy.testing import assert_, assert_equal
+
+from cminpack_numba import hybrd, hybrj, lmder, lmdif, lmstr, profile
+
+from . import test_hybrd, test_hybrj, test_lmder, test_lmdif, test_lmstr
+from .test_pure import _assert_same, lmdif_fcn
+
+
+def _check_times(prof) -> None:
+    assert_((prof.time >= 0.0).all())
+    assert_(prof.total >= prof.time.sum())
+    assert_equal(prof.solver, prof.total - prof.time.sum())
+
+
+def test_profile_lmdif() -> None:
+    t = test_lmdif
+    prof = profile()
+    assert_equal(prof.calls, 0)
+    assert_equal(prof.total, 0.0)
+    args = t.trial_lmdif_fcn.address, t.M, t.X0
+    result = lmdif(*args, udata=t.UDATA, profile=prof)
+    _assert_same(result, lmdif(*args, udata=t.UDATA))
+    # nfev of lmdif includes its forward-difference jacobians, of n calls each
+    assert_equal(prof.calls[0], 0)
+    assert_equal(prof.calls[1:].sum(), result.nfev)
+    assert_equal(prof.calls[2] % t.N, 0)
+    _check_times(prof)
+
+    # the counts and times add up over the solves
+    calls, total = prof.calls.copy(), prof.total
+    lmdif(lmdif_fcn, t.M, t.X0, udata=t.UDATA, profile=prof)
+    assert_equal(prof.calls, 2 * calls)
+    assert_(prof.total > total)
+
+
+def test_profile_lmder_lmstr() -> None:
+    t = test_lmder
+    prof = profile()
+    result = lmder(t.trial_lmder_fcn.address, t.M, t.X0, udata=t.UDATA, profile=prof)
+    assert_equal(prof.calls, [0, result.nfev, result.njev])
+    _check_times(prof)
+
+    t = test_lmstr
+    prof = profile()
+    result = lmstr(t.trial_lmstr_fcn.address, t.M, t.X0, profile=prof)
+    # lmstr calls fcn once per row of the jacobian
+    assert_equal(prof.calls, [0, result.nfev, t.M * result.njev])
+    _check_times(prof)
+
+
+def test_profile_hybrd_hybrj() -> None:
+    t = test_hybrd
+    prof = profile()
+    result = hybrd(t.trial_hybrd_fcn.address, t.X0, profile=prof)
+    _assert_same(result, hybrd(t.trial_hybrd_fcn.address, t.X0))
+    assert_equal(prof.calls[1:].sum(), result.nfev)
+    _check_times(prof)
+
+    t = test_hybrj
+    prof = profile()
+    result = hybrj(t.trial_hybrj_fcn.address, t.X0, profile=prof)
+    assert_equal(prof.calls, [0, result.nfev, result.njev])
+    _check_times(prof)
+
+
+def test_profile_trace() -> None:
+    t = test_lmdif
+    prof = profile()
+    trace = empty((100, 3))
+    args = lmdif_fcn, t.M, t.X0
+    result = lmdif(*args, nprint=1, udata=t.UDATA, trace=trace, profile=prof)
+    assert_equal(prof.calls[0], (~isnan(trace[:, 0])).sum())
+    assert_equal(prof.calls[1:].sum(), result.nfev)
+
+
+def test_profile_njit() -> None:
+    @njit
+    def driver(fcn, m, x0, udata):
+        prof = profile()
+        for _ in range(3):
+            lmdif(fcn, m, x0, udata=udata, profile=prof)
+        return prof
+
+    t = test_lmdif
+    result = lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, udata=t.UDATA)
+    prof = driver(t.trial_lmdif_fcn.address, t.M, t.X0, t.UDATA)
+    assert_equal(prof.calls[1:].sum(), 3 * result.nfev)
+    _check_times(prof)
@@ -0,0 +1,340 @@
+"""Test the numba implementation of the solvers against the cminpack wrappers."""
+
+import pytest
+from numba import njit
+from numpy import (
+    arange,
+    array,
+    column_stack,
+    cos,
+    empty,
+    exp,
+    float32,
+    int32,
+    linspace,
+    load,
+    ones,
+    save,
+    sin,
+)
+from numpy.testing import assert_allclose, assert_equal
+
+from cminpack_numba import covar, hybrd, hybrj, lmder, lmdif, lmstr, workspace
+from cminpack_numba.pure import (
+    bandwidth,
+    color_columns,
+    enorm,
+    fdjac2_parallel,
+    lmstr_stream,
+)
+from cminpack_numba.pure import hybrd as pure_hybrd
+from cminpack_numba.pure import hybrj as pure_hybrj
+from cminpack_numba.pure import lmder as pure_lmder
+from cminpack_numba.pure import lmdif as pure_lmdif
+
+from . import test_hybrd, test_hybrj, test_lmder, test_lmdif, test_lmstr
+
+
+@njit
+def lmdif_fcn(udata, m, n, x, fvec, iflag):
+    if iflag == 0:
+        return 0
+    for i in range(m):
+        tmp1 = i + 1
+        tmp2 = 16 - i - 1
+        tmp3 = tmp2 if i >= 8 else tmp1
+        fvec[i] = udata[i] - (x[0] + tmp1 / (x[1] * tmp2 + x[2] * tmp3))
+    return 0
+
+
+@njit
+def lmder_fcn(udata, m, n, x, fvec, fjac, iflag):
+    if iflag == 1:
+        lmdif_fcn(udata, m, n, x, fvec, iflag)
+    elif iflag == 2:
+        for i in range(m):
+            tmp1 = i + 1
+            tmp2 = 16 - i - 1
+            tmp3 = tmp2 if i >= 8 else tmp1
+            tmp4 = (x[1] * tmp2 + x[2] * tmp3) ** 2
+            fjac[i, 0] = -1.0
+            fjac[i, 1] = tmp1 * tmp2 / tmp4
+            fjac[i, 2] = tmp1 * tmp3 / tmp4
+    return 0
+
+
+@njit
+def hybrd_fcn(udata, n, x, fvec, iflag):
+    if iflag == 0:
+        return 0
+    for k in range(n):
+        temp = (3.0 - 2.0 * x[k]) * x[k]
+        temp1 = x[k - 1] if k != 0 else 0.0
+        temp2 = x[k + 1] if k != n - 1 else 0.0
+        fvec[k] = temp - temp1 - 2.0 * temp2 + 1.0
+    return 0
+
+
+@njit
+def hybrj_fcn(udata, n, x, fvec, fjac, iflag):
+    if iflag == 1:
+        return hybrd_fcn(udata, n, x, fvec, iflag)
+    fjac[:] = 0.0
+    for k in range(n):
+        fjac[k, k] = 3.0 - 4.0 * x[k]
+        if k != 0:
+            fjac[k, k - 1] = -1.0
+        if k != n - 1:
+            fjac[k, k + 1] = -1.0
+    return 0
+
+
+@njit
+def lmder_fdjac_fcn(udata, m, n, x, fvec, fjac, iflag):
+    if iflag == 1:
+        return lmdif_fcn(udata, m, n, x, fvec, iflag)
+    wa = empty(m)
+    lmdif_fcn(udata, m, n, x, wa, 1)
+    return fdjac2_parallel(lmdif_fcn, udata, m, n, x, wa, fjac, 0.0)
+
+
+@njit
+def tridiagonal_fcn(udata, m, n, x, fvec, iflag):
+    return hybrd_fcn(udata, n, x, fvec, iflag)
+
+
+@njit
+def sweep_fcn(udata, n, x, fvec, iflag):
+    # the equations of hybrd_fcn perturbed by udata[0] * sin(x)
+    hybrd_fcn(udata, n, x, fvec, iflag)
+    fvec += udata[0] * sin(x)
+    return 0
+
+
+@njit
+def sweep_jac_fcn(udata, n, x, fvec, fjac, iflag):
+    if iflag == 1:
+        return sweep_fcn(udata, n, x, fvec, iflag)
+    hybrj_fcn(udata, n, x, fvec, fjac, iflag)
+    for k in range(n):
+        fjac[k, k] += udata[0] * cos(x[k])
+    return 0
+
+
+@njit
+def stream_fcn(udata, data, x, fvec, fjac, iflag):
+    # the rows of the problem of test_lmstr, whose indices are the data
+    for i in range(data.size):
+        if data[i] == 0.0:
+            fvec[i] = 10.0 * (x[1] - x[0] ** 2)
+            fjac[i, 0] = -20.0 * x[0]
+            fjac[i, 1] = 10.0
+        else:
+            fvec[i] = 1.0 - x[0]
+            fjac[i, 0] = -1.0
+            fjac[i, 1] = 0.0
+    return 0
+
+
+@njit
+def decay_fcn(udata, data, x, fvec, fjac, iflag):
+    # exponential decay fitted to the observations (t, y) in the rows of data
+    for i in range(data.shape[0]):
+        e = exp(-x[1] * data[i, 0])
+        fvec[i] = x[0] * e + x[2] - data[i, 1]
+        if iflag == 2:
+            fjac[i, 0] = e
+            fjac[i, 1] = -x[0] * data[i, 0] * e
+            fjac[i, 2] = 1.0
+    return 0
+
+
+@njit
+def decay_lmder_fcn(udata, m, n, x, fvec, fjac, iflag):
+    return decay_fcn(None, udata, x, fvec, fjac, iflag)
+
+
+@njit
+def stop_fcn(udata, n, x, fvec, iflag):
+    hybrd_fcn(udata, n, x, fvec, iflag)
+    return -udata
+
+
+def _assert_same(result, reference) -> None:
+    assert_equal(len(result), len(reference))
+    for i, j in zip(result, reference):
+        assert_allclose(i, j, rtol=1e-12, atol=1e-14)
+
+
+def test_pure_enorm() -> None:
+    x = test_lmdif.UDATA
+    assert_allclose(enorm(x), test_lmdif.enorm(x), rtol=1e-15)
+    assert_equal(enorm(x[:0]), 0.0)
+
+
+def test_pure_lmdif() -> None:
+    t = test_lmdif
+    x0 = t.X0
+    result = pure_lmdif(lmdif_fcn, t.M, x0, t.TOL, t.TOL, udata=t.UDATA)
+    t._check_results(result[0], result[1], result[-1])
+    _assert_same(result, lmdif(t.trial_lmdif_fcn.address, t.M, x0, t.TOL, t.TOL))
+    assert_equal(x0, 1.0)
+    short = pure_lmdif(lmdif_fcn, t.M, x0, udata=t.UDATA, full_output=False)
+    assert_equal((short.fjac.shape, short.qtf.shape), ((0, t.N), (0,)))
+
+
+def test_pure_lmdif_float32() -> None:
+    t = test_lmdif
+    x0, udata = t.X0.astype(float32), t.UDATA.astype(float32)
+    x, fvec, fjac, *_ = pure_lmdif(lmdif_fcn, t.M, x0, udata=udata)
+    assert_equal((x.dtype, fvec.dtype, fjac.dtype), (float32, float32, float32))
+    assert_allclose(x, t.REFERENCE, rtol=1e-4)
+
+
+def test_pure_lmder() -> None:
+    t = test_lmder
+    result = pure_lmder(lmder_fcn, t.M, t.X0, t.TOL, t.TOL, udata=t.UDATA)
+    t._check_results(result[0], result[1], result[-1])
+    _assert_same(result, lmder(t.trial_lmder_fcn.address, t.M, t.X0, t.TOL, t.TOL))
+
+
+def test_pure_hybrd() -> None:
+    t = test_hybrd
+    for ml in (None, 0, 1):
+        result = pure_hybrd(hybrd_fcn, t.X0, t.TOL, ml=ml, mu=ml)
+        t._check_result(result[0], result[1], result[-1])
+        reference = hybrd(t.trial_hybrd_fcn.address, t.X0, t.TOL, ml=ml, mu=ml)
+        _assert_same(result, reference)
+
+
+def test_pure_hybrj() -> None:
+    t = test_hybrj
+    result = pure_hybrj(hybrj_fcn, t.X0, t.TOL, 2000, t.DIAG, 2, 100.0, 0)
+    t._check_result(result[0], result[1], result[-1], *result[-3:-1])
+    args = t.TOL, 2000, t.DIAG, 2, 100.0, 0
+    _assert_same(result, hybrj(t.trial_hybrj_fcn.address, t.X0, *args))
+
+
+def test_pure_parallel_jacobian() -> None:
+    t = test_lmdif
+    reference = pure_lmdif(lmdif_fcn, t.M, t.X0, udata=t.UDATA)
+    result = pure_lmdif(lmdif_fcn, t.M, t.X0, udata=t.UDATA, parallel=True)
+    _assert_same(result, reference)
+    t = test_hybrd
+    for ml in (None, 1):
+        result = pure_hybrd(hybrd_fcn, t.X0, ml=ml, mu=ml, parallel=True)
+        _assert_same(result, pure_hybrd(hybrd_fcn, t.X0, ml=ml, mu=ml))
+
+
+def test_pure_parallel_jacobian_lmder() -> None:
+    t = test_lmdif
+    x, fvec, *_, info = lmder(lmder_fdjac_fcn, t.M, t.X0, t.TOL, t.TOL, udata=t.UDATA)
+    t._check_results(x, fvec, info)
+
+
+def _tridiagonal_pattern(n):
+    indptr = array([0, *range(2, 3 * n - 2, 3), 3 * n - 2], dtype=int32)
+    indices = array(
+        [i for j in range(n) for i in range(max(j - 1, 0), min(j + 2, n))],
+        dtype=int32,
+    )
+    return indptr, indices
+
+
+def test_pure_color_columns() -> None:
+    groupptr, groups = color_columns(*_tridiagonal_pattern(9), 9)
+    assert_equal(groupptr, [0, 3, 6, 9])
+    assert_equal(groups, [0, 3, 6, 1, 4, 7, 2, 5, 8])
+    groupptr, groups = color_columns(array([0, 1, 2, 3]), array([0, 0, 0]), 1)
+    assert_equal(groupptr, [0, 1, 2, 3])
+    assert_equal(groups, arange(3))
+
+
+def test_pure_bandwidth() -> None:
+    assert_equal(bandwidth(*_tridiagonal_pattern(9)), (1, 1))
+    assert_equal(bandwidth(array([0, 1, 3]), array([0, 0, 1])), (0, 1))
+    assert_equal(bandwidth(array([0, 2, 3]), array([0, 1, 1])), (1, 0))
+
+
+def test_pure_sparse_jacobian() -> None:
+    t = test_hybrd
+    reference = pure_lmdif(tridiagonal_fcn, t.N, t.X0)
+    sparsity = _tridiagonal_pattern(t.N)
+    result = pure_lmdif(tridiagonal_fcn, t.N, t.X0, sparsity=sparsity)
+    _assert_same(result[:-2], reference[:-2])
+    assert_equal(result[-1], reference[-1])
+    assert result[-2] < reference[-2]
+
+
+def test_pure_workspace() -> None:
+    t = test_lmdif
+    ws = workspace(t.M, t.N)
+    for _ in range(2):
+        args = lmdif_fcn, t.M, t.X0
+        x, fvec, *_, info = pure_lmdif(*args, udata=t.UDATA, workspace=ws)
+        t._check_results(x, fvec, info)
+        assert_equal(x.ctypes.data, ws.x.ctypes.data)
+
+
+def test_pure_warm_start() -> None:
+    n = 10
+    # evaluations of the forward-difference, or user supplied, jacobian
+    solvers = (pure_hybrd, sweep_fcn, "nfev"), (pure_hybrj, sweep_jac_fcn, "njev")
+    for solver, fcn, count in solvers:
+        cold = warm = 0
+        ws = workspace(n, n)
+        x = -ones(n)
+        for i, p in enumerate(linspace(0.0, 1.0, 11)):
+            udata = array([p])
+            reference = solver(fcn, x, udata=udata)
+            result = solver(fcn, x, udata=udata, workspace=ws, warm_start=i > 0)
+            assert_equal(result.info, 1)
+            assert_allclose(result.x, reference.x, atol=1e-8)
+            cold += getattr(reference, count)
+            warm += getattr(result, count)
+            x = result.x
+        # the previous factors replace the first jacobian of every solve but the first
+        assert warm < cold
+
+    with pytest.raises(ValueError, match="workspace"):
+        pure_hybrd(sweep_fcn, x, udata=udata, warm_start=True)
+
+
+def test_pure_lmstr_stream(tmp_path) -> None:
+    t = test_lmstr
+    reference = lmstr(t.trial_lmstr_fcn.address, t.M, t.X0, t.TOL, t.TOL)
+    for chunksize in (1, 2):
+        args = stream_fcn, arange(2.0), t.X0, t.TOL, t.TOL
+        result = lmstr_stream(*args, chunksize=chunksize)
+        assert_allclose(result.x, reference.x, rtol=1e-12)
+        assert_allclose(result.fjac, reference.fjac, rtol=1e-12, atol=1e-14)
+        assert_equal(result.ipvt, reference.ipvt)
+        assert_equal(result[-3:], reference[-3:])
+
+    # observations on disk, read through a memmap or a generator of chunks
+    m = 100_000
+    time = linspace(0.0, 5.0, m)
+    obs = column_stack((time, 2.5 * exp(-1.3 * time) + 0.5 + 0.01 * sin(1e3 * time)))
+    save(tmp_path / "obs.npy", obs)
+    data = load(tmp_path / "obs.npy", mmap_mode="r")
+    x0 = array([1.0, 1.0, 0.0])
+    result = lmstr_stream(decay_fcn, data, x0, chunksize=4096)
+    assert_equal(result.info, 1)
+
+    def chunks():
+        for i in range(0, m, 30_000):
+            yield data[i : i + 30_000]
+
+    _assert_same(lmstr_stream(decay_fcn, chunks, x0), result)
+
+    reference = pure_lmder(decay_lmder_fcn, m, x0, udata=obs)
+    assert_allclose(result.x, reference.x, rtol=1e-10)
+    assert_allclose(result.fnorm, enorm(reference.fvec), rtol=1e-10)
+    cov = covar(reference.fjac, reference.ipvt)
+    assert_allclose(covar(result.fjac, result.ipvt), cov, rtol=1e-8)
+
+
+def test_pure_user_termination() -> None:
+    t = test_hybrd
+    *_, nfev, info = pure_hybrd(stop_fcn, t.X0, udata=7)
+    assert_equal((nfev, info), (1, -7))
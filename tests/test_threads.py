@@ -0,0 +1,104 @@
+"""Test concurrent calls of the solvers from threads."""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+from time import perf_counter
+
+from numba import njit
+from numpy import arange, array, zeros
+from numpy.testing import assert_, assert_array_equal, assert_equal
+from numpy.typing import NDArray
+
+from cminpack_numba import hybrd, lmdif, pure, src, workspace
+from cminpack_numba.src.utils import _perf_counter
+
+from . import test_lmdif
+from .test_pure import lmdif_fcn
+
+SOLVERS = (
+    "hybrd",
+    "hybrd1",
+    "hybrd1_",
+    "hybrd_",
+    "hybrd_batch",
+    "hybrj",
+    "hybrj1",
+    "hybrj1_",
+    "hybrj_",
+    "hybrj_batch",
+    "lmder",
+    "lmder1",
+    "lmder1_",
+    "lmder_",
+    "lmder_bounded",
+    "lmder_multistart",
+    "lmdif",
+    "lmdif1",
+    "lmdif1_",
+    "lmdif_",
+    "lmdif_batch",
+    "lmdif_bounded",
+    "lmstr",
+    "lmstr1",
+    "lmstr1_",
+    "lmstr_",
+)
+
+
+@njit
+def wait_fcn(udata, n, x, fvec, iflag):
+    # the first call spins until the main thread sets udata[0], which it can only do
+    # while the solver has released the GIL
+    if udata[1] == 0.0:
+        udata[1] = 1.0
+        start = _perf_counter()
+        while udata[0] == 0.0 and _perf_counter() - start < 5.0:
+            pass
+        udata[2] = udata[0]
+    for i in range(n):
+        fvec[i] = x[i] - 1.0
+    return 0
+
+
+def test_solvers_release_gil() -> None:
+    for name in SOLVERS:
+        assert_(getattr(src, name).targetoptions.get("nogil"), name)
+    for name in ("hybrd", "hybrj", "lmder", "lmdif"):
+        assert_(getattr(pure, name).targetoptions.get("nogil"), name)
+
+
+def test_threads_lmdif() -> None:
+    t = test_lmdif
+    starts = [t.X0 * scale for scale in arange(1.0, 17.0)]
+
+    def solve(x0: NDArray) -> tuple[NDArray, int, int]:
+        ws = workspace(t.M, t.N)
+        result = lmdif(lmdif_fcn, t.M, x0, udata=t.UDATA, workspace=ws)
+        return result.x.copy(), result.nfev, result.info
+
+    serial = [solve(x0) for x0 in starts]
+    with ThreadPoolExecutor(4) as executor:
+        concurrent = list(executor.map(solve, starts))
+    assert_equal(len(concurrent), len(serial))
+    for (x, nfev, info), expected in zip(concurrent, serial):
+        assert_array_equal(x, expected[0])
+        assert_equal((nfev, info), expected[1:])
+
+
+def test_threads_gil_released() -> None:
+    udata = zeros(3)
+    x0 = zeros(2)
+    # compile outside of the thread, without waiting
+    hybrd(wait_fcn, x0, udata=array([0.0, 1.0, 0.0]))
+
+    thread = Thread(target=hybrd, args=(wait_fcn, x0), kwargs={"udata": udata})
+    thread.start()
+    # bounded, so that a solver failing before calling fcn fails the test
+    start = perf_counter()
+    while udata[1] == 0.0 and perf_counter() - start < 5.0:
+        pass
+    assert_equal(udata[1], 1.0)
+    udata[0] = 1.0
+    thread.join(5.0)
+    assert_(not thread.is_alive())
+    assert_equal(udata[2], 1.0)
@@ -0,0 +1,158 @@
+"""Test the iteration traces of the high-level wrappers."""
+
+import pytest
+from numba import njit
+from numpy import diff, empty, float32, isnan, zeros
+from numpy.testing import assert_allclose, assert_array_equal, assert_equal
+
+from cminpack_numba import enorm, hybrd, hybrj, lmder, lmdif, lmstr
+from cminpack_numba.pure import lmder as pure_lmder
+from cminpack_numba.pure import lmdif as pure_lmdif
+
+from . import test_hybrd, test_hybrj, test_lmder, test_lmdif, test_lmstr
+from .test_pure import _assert_same, hybrd_fcn, lmder_fcn, lmdif_fcn
+
+
+@njit
+def stop_at_print_fcn(udata, n, x, fvec, iflag):
+    if iflag == 0:
+        return -1
+    return hybrd_fcn(udata, n, x, fvec, iflag)
+
+
+def _recorded(trace):
+    """Number of rows of `trace` recorded by the solver."""
+    return int((~isnan(trace[:, 0])).sum())
+
+
+def _check_trace(trace, result) -> None:
+    k = _recorded(trace)
+    assert k > 1
+    assert isnan(trace[k:]).all()
+    assert_equal(trace[0, 1], 0.0)
+    assert (trace[1:k, 1] >= 0.0).all()
+    assert (diff(trace[:k, 2]) > 0).all()
+    assert_allclose(trace[k - 1, 0], enorm(result.fvec))
+
+
+def test_trace_lmdif() -> None:
+    t = test_lmdif
+    trace = empty((100, 3))
+    result = lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, udata=t.UDATA, trace=trace)
+    _assert_same(result, lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, udata=t.UDATA))
+    _check_trace(trace, result)
+    # lmdif counts the evaluations of its forward-difference jacobian in nfev
+    assert_equal(trace[_recorded(trace) - 1, 2], result.nfev)
+    fvec = empty(t.M)
+    lmdif_fcn.py_func(t.UDATA, t.M, t.N, t.X0, fvec, 1)
+    assert_allclose(trace[0, 0], enorm(fvec))
+
+    njit_trace = empty((100, 3))
+    lmdif(lmdif_fcn, t.M, t.X0, udata=t.UDATA, trace=njit_trace)
+    assert_array_equal(njit_trace, trace)
+
+
+def test_trace_lmder_lmstr() -> None:
+    t = test_lmder
+    trace = empty((100, 3))
+    result = lmder(t.trial_lmder_fcn.address, t.M, t.X0, udata=t.UDATA, trace=trace)
+    _assert_same(result, lmder(t.trial_lmder_fcn.address, t.M, t.X0, udata=t.UDATA))
+    _check_trace(trace, result)
+
+    t = test_lmstr
+    trace = empty((100, 3))
+    result = lmstr(t.trial_lmstr_fcn.address, t.M, t.X0, trace=trace)
+    _assert_same(result, lmstr(t.trial_lmstr_fcn.address, t.M, t.X0))
+    _check_trace(trace, result)
+
+
+def test_trace_hybrd_hybrj() -> None:
+    t = test_hybrd
+    trace = empty((100, 3))
+    result = hybrd(t.trial_hybrd_fcn.address, t.X0, trace=trace)
+    _assert_same(result, hybrd(t.trial_hybrd_fcn.address, t.X0))
+    _check_trace(trace, result)
+
+    njit_trace = empty((100, 3))
+    hybrd(hybrd_fcn, t.X0, udata=t.UDATA, trace=njit_trace)
+    assert_array_equal(njit_trace, trace)
+
+    t = test_hybrj
+    trace = empty((100, 3))
+    result = hybrj(t.trial_hybrj_fcn.address, t.X0, trace=trace)
+    _assert_same(result, hybrj(t.trial_hybrj_fcn.address, t.X0))
+    _check_trace(trace, result)
+
+
+def test_trace_nprint() -> None:
+    t = test_lmdif
+    trace = empty((100, 3))
+    lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, udata=t.UDATA, trace=trace)
+    k = _recorded(trace)
+
+    every_other = empty((100, 3))
+    lmdif(lmdif_fcn, t.M, t.X0, nprint=2, udata=t.UDATA, trace=every_other)
+    # the last row is recorded when the solver terminates
+    j = _recorded(every_other)
+    assert_equal(j, k // 2 + 1)
+    assert_array_equal(every_other[: j - 1, ::2], trace[: k - 1 : 2, ::2])
+    assert_array_equal(every_other[j - 1, ::2], trace[k - 1, ::2])
+
+    short = empty((2, 3))
+    lmdif(lmdif_fcn, t.M, t.X0, udata=t.UDATA, trace=short)
+    assert_array_equal(short, trace[:2])
+
+
+def test_trace_user_termination() -> None:
+    # iflag = 0 is passed on to fcn, which can stop the solver, if nprint > 0
+    t = test_hybrd
+    trace = empty((10, 3))
+    result = hybrd(stop_at_print_fcn, t.X0, nprint=1, trace=trace)
+    assert_equal(result.info, -1)
+    # the first iteration and the termination
+    assert_equal(_recorded(trace), 2)
+    assert_equal(hybrd(stop_at_print_fcn, t.X0, trace=trace).info, 1)
+
+
+def test_trace_njit() -> None:
+    @njit
+    def driver(fcn, m, x0, udata):
+        trace = zeros((100, 3), dtype=x0.dtype)
+        lmdif(fcn, m, x0, udata=udata, trace=trace)
+        return trace
+
+    t = test_lmdif
+    trace = empty((100, 3))
+    lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, udata=t.UDATA, trace=trace)
+    assert_array_equal(driver(t.trial_lmdif_fcn.address, t.M, t.X0, t.UDATA), trace)
+
+    x0, udata = t.X0.astype(float32), t.UDATA.astype(float32)
+    trace32 = driver(lmdif_fcn, t.M, x0, udata)
+    assert_equal(trace32.dtype, float32)
+    assert_allclose(trace32[:2], trace[:2], rtol=1e-3)
+
+
+def test_trace_pure_lambda() -> None:
+    t = test_lmdif
+    trace = empty((100, 3))
+    lmdif(lmdif_fcn, t.M, t.X0, udata=t.UDATA, trace=trace)
+    pure_trace = empty((100, 4))
+    pure_lmdif(lmdif_fcn, t.M, t.X0, udata=t.UDATA, trace=pure_trace)
+    assert_allclose(pure_trace[:, :3], trace, rtol=1e-12)
+
+    # a small initial step bound makes the first steps levenberg-marquardt steps
+    t = test_lmder
+    trace = empty((100, 3))
+    lmder(lmder_fcn, t.M, t.X0, factor=0.1, udata=t.UDATA, trace=trace)
+    pure_trace = empty((100, 4))
+    args = lmder_fcn, t.M, t.X0
+    result = pure_lmder(*args, factor=0.1, udata=t.UDATA, trace=pure_trace)
+    _assert_same(result, pure_lmder(*args, factor=0.1, udata=t.UDATA))
+    assert_allclose(pure_trace[:, :3], trace, rtol=1e-12)
+    k = _recorded(trace)
+    assert_equal(pure_trace[0, 3], 0.0)
+    assert (pure_trace[1:k, 3] >= 0.0).all()
+    assert (pure_trace[1:k, 3] > 0.0).any()
+
+    with pytest.raises(ValueError, match="4 columns"):
+        pure_lmder(*args, udata=t.UDATA, trace=trace)
@@ -0,0 +1,139 @@
+"""Test passing njit functions instead of cfunc addresses to the cminpack wrappers."""
+
+from numba import carray, njit, types
+from numpy import float32, float64, tile
+from numpy.testing import assert_allclose, assert_equal
+
+from cminpack_numba import (
+    hybrd,
+    hybrd1,
+    hybrd_batch,
+    hybrj,
+    hybrj1,
+    lmder,
+    lmder1,
+    lmder_multistart,
+    lmdif,
+    lmdif1,
+    lmdif_batch,
+    lmstr,
+    lmstr1,
+    random_starts,
+)
+from cminpack_numba.src._trampoline import trampoline
+
+from . import test_hybrd, test_hybrj, test_lmder, test_lmdif, test_lmstr
+from .test_pure import _assert_same, hybrd_fcn, hybrj_fcn, lmder_fcn, lmdif_fcn
+
+
+@njit
+def lmdif_fcn_pointer(udata, m, n, x, fvec, iflag):
+    return lmdif_fcn(carray(udata, (m,), float64), m, n, x, fvec, iflag)
+
+
+@njit
+def lmdif_fcn_2d(udata, m, n, x, fvec, iflag):
+    return lmdif_fcn(udata[1], m, n, x, fvec, iflag)
+
+
+@njit
+def lmstr_fcn(udata, m, n, x, fvec, fjrow, iflag):
+    if iflag == 1:
+        fvec[0] = 10.0 * (x[1] - x[0] ** 2)
+        fvec[1] = 1.0 - x[0]
+    elif iflag == 2:
+        fjrow[0] = -20.0 * x[0]
+        fjrow[1] = 10.0
+    else:
+        fjrow[0] = -1.0
+        fjrow[1] = 0.0
+    return 0
+
+
+def test_njit_lmdif() -> None:
+    t = test_lmdif
+    result = lmdif(lmdif_fcn, t.M, t.X0, t.TOL, t.TOL, udata=t.UDATA)
+    _assert_same(result, lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, t.TOL, t.TOL))
+    x, fvec, info = lmdif1(lmdif_fcn, t.M, t.X0, t.TOL, t.UDATA)
+    t._check_results(x, fvec, info)
+
+
+def test_njit_lmdif_udata() -> None:
+    t = test_lmdif
+    reference = lmdif(lmdif_fcn, t.M, t.X0, udata=t.UDATA)
+    pointer = t.UDATA.ctypes.data
+    _assert_same(lmdif(lmdif_fcn_pointer, t.M, t.X0, udata=pointer), reference)
+    udata = tile(t.UDATA, (2, 1))
+    _assert_same(lmdif(lmdif_fcn_2d, t.M, t.X0, udata=udata), reference)
+    _assert_same(lmdif(lmdif_fcn_2d, t.M, t.X0, udata=udata.T.copy().T), reference)
+
+
+def test_njit_lmdif_float32() -> None:
+    t = test_lmdif
+    x0, udata = t.X0.astype(float32), t.UDATA.astype(float32)
+    x, fvec, fjac, *_ = lmdif(lmdif_fcn, t.M, x0, udata=udata)
+    assert_equal((x.dtype, fvec.dtype, fjac.dtype), (float32, float32, float32))
+    assert_allclose(x, t.REFERENCE, rtol=1e-4)
+
+
+def test_njit_lmdif_batch() -> None:
+    t = test_lmdif
+    x0, udata = tile(t.X0, (8, 1)), tile(t.UDATA, (8, 1))
+    x, fvec, _, info = lmdif_batch(lmdif_fcn, t.M, x0, t.TOL, t.TOL, udata=udata)
+    for i in range(8):
+        t._check_results(x[i], fvec[i], info[i])
+
+
+def test_njit_lmder() -> None:
+    t = test_lmder
+    result = lmder(lmder_fcn, t.M, t.X0, t.TOL, t.TOL, udata=t.UDATA)
+    _assert_same(result, lmder(t.trial_lmder_fcn.address, t.M, t.X0, t.TOL, t.TOL))
+    x, fvec, *_, info = lmder1(lmder_fcn, t.M, t.X0, t.TOL, t.UDATA)
+    t._check_results(x, fvec, info)
+
+
+def test_njit_lmder_multistart() -> None:
+    t = test_lmder
+    starts = random_starts(0.01 * t.X0, 10.0 * t.X0, 64, seed=0)
+    args = t.M, starts, 4
+    result = lmder_multistart(lmder_fcn, *args, udata=t.UDATA)
+    address = t.trial_lmder_fcn_udata.address
+    _assert_same(result, lmder_multistart(address, *args, udata=t.UDATA))
+
+
+def test_njit_lmstr() -> None:
+    t = test_lmstr
+    args = t.M, t.X0, t.TOL, t.TOL, 0.0, 2000, t.DIAG, 1, 100.0, 0
+    result = lmstr(lmstr_fcn, *args)
+    _assert_same(result, lmstr(t.trial_lmstr_fcn.address, *args))
+    x, fvec, *_, info = lmstr1(lmstr_fcn, t.M, t.X0, t.TOL)
+    t._check_result(x, fvec, info)
+
+
+def test_njit_hybrd() -> None:
+    t = test_hybrd
+    for ml in (None, 1):
+        result = hybrd(hybrd_fcn, t.X0, t.TOL, ml=ml, mu=ml)
+        reference = hybrd(t.trial_hybrd_fcn.address, t.X0, t.TOL, ml=ml, mu=ml)
+        _assert_same(result, reference)
+    x, fvec, info = hybrd1(hybrd_fcn, t.X0, t.TOL)
+    t._check_result(x, fvec, info)
+    x, fvec, _, info = hybrd_batch(hybrd_fcn, tile(t.X0, (8, 1)), t.TOL)
+    for i in range(8):
+        t._check_result(x[i], fvec[i], info[i])
+
+
+def test_njit_hybrj() -> None:
+    t = test_hybrj
+    args = t.TOL, 2000, t.DIAG, 2, 100.0, 0
+    result = hybrj(hybrj_fcn, t.X0, *args)
+    _assert_same(result, hybrj(t.trial_hybrj_fcn.address, t.X0, *args))
+    x, fvec, *_, info = hybrj1(hybrj_fcn, t.X0, t.TOL)
+    t._check_result(x, fvec, info)
+
+
+def test_trampoline_cache() -> None:
+    fcn = types.Dispatcher(hybrd_fcn)
+    address = trampoline("hybrd", fcn, types.float64, types.none)
+    assert_equal(trampoline("hybrd", fcn, types.float64, types.none), address)
+    assert trampoline("hybrd", fcn, types.float32, types.none) != address
@@ -0,0 +1,95 @@
+"""Test the high-level wrappers with a preallocated workspace."""
+
+from numba import njit
+from numpy import float32, float64, int32
+from numpy.testing import assert_, assert_equal, assert_raises
+
+from cminpack_numba import hybrd, hybrj, lmder, lmdif, lmstr, workspace
+
+from . import test_hybrd, test_hybrj, test_lmder, test_lmdif, test_lmstr
+
+
+def test_workspace_shapes() -> None:
+    ws = workspace(5, 3, float32)
+    assert_equal(ws.x.shape, (3,))
+    assert_equal(ws.fvec.shape, (5,))
+    assert_equal(ws.fjac.shape, (5, 3))
+    assert_equal(ws.ipvt.dtype, int32)
+    assert_equal(ws.r.size, 0)
+    assert_equal(ws.wa.size, 14)
+    assert_equal(ws.fjac.dtype, float32)
+    assert_equal(workspace(3, 3).r.size, 6)
+
+
+def test_lmdif_workspace() -> None:
+    t = test_lmdif
+    ws = workspace(t.M, t.N)
+    for _ in range(2):
+        args = t.trial_lmdif_fcn.address, t.M, t.X0, t.TOL, t.TOL
+        x, fvec, fjac, *_, info = lmdif(*args, workspace=ws)
+        t._check_results(x, fvec, info)
+        assert_(x.ctypes.data == ws.x.ctypes.data)
+        assert_(fjac.ctypes.data == ws.fjac.ctypes.data)
+    assert_equal(t.X0, 1.0)
+
+
+def test_lmder_workspace() -> None:
+    t = test_lmder
+    ws = workspace(t.M, t.N)
+    for _ in range(2):
+        args = t.trial_lmder_fcn.address, t.M, t.X0, t.TOL, t.TOL
+        x, fvec, *_, info = lmder(*args, workspace=ws)
+        t._check_results(x, fvec, info)
+
+
+def test_lmstr_workspace() -> None:
+    t = test_lmstr
+    ws = workspace(t.M, t.N)
+    for _ in range(2):
+        args = t.trial_lmstr_fcn.address, t.M, t.X0, t.TOL, t.TOL
+        x, fvec, _, _, _, nfev, njev, info = lmstr(*args, workspace=ws)
+        t._check_result(x, fvec, info, nfev, njev)
+
+
+def test_hybrd_workspace() -> None:
+    t = test_hybrd
+    ws = workspace(t.N, t.N)
+    args = t.TOL, 2000, 1, 1, 0.0, t.DIAG, 2, 100.0, 0
+    for _ in range(2):
+        x, fvec, *_, nfev, info = hybrd(t.trial_hybrd_fcn.address, t.X0, *args, None, ws)
+        t._check_result(x, fvec, info, nfev)
+
+
+def test_hybrj_workspace() -> None:
+    t = test_hybrj
+    ws = workspace(t.N, t.N)
+    args = t.TOL, 2000, t.DIAG, 2, 100.0, 0
+    for _ in range(2):
+        x, fvec, *_, nfev, njev, info = hybrj(
+            t.trial_hybrj_fcn.address,
+            t.X0,
+            *args,
+            workspace=ws,
+        )
+        t._check_result(x, fvec, info, nfev, njev)
+
+
+@njit
+def _repeat_lmdif(address, m, x0, ws, k):
+    info = 0
+    for _ in range(k):
+        info += lmdif(address, m, x0, workspace=ws)[-1]
+    return info
+
+
+def test_workspace_njit_loop() -> None:
+    t = test_lmdif
+    ws = workspace(t.M, t.N, float64)
+    assert_equal(_repeat_lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, ws, 10), 10)
+
+
+def test_workspace_wrong_size() -> None:
+    t = test_lmdif
+    ws = workspace(t.M + 1, t.N)
+    with assert_raises(ValueError):
+        lmdif(t.trial_lmdif_fcn.address, t.M, t.X0, workspace=ws)